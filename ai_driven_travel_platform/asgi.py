@@ -3,14 +3,64 @@ ASGI config for ai_driven_travel_platform project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Streaming endpoints that proxy upstream responses chunk by chunk, and the
+upstream-bound endpoints in ASYNC_ROUTES (with ASGI_ASYNC_VIEWS on), are
+served by native async handlers ahead of Django, so a request waiting on
+Gemini, ORS or OpenWeatherMap holds no thread. Everything else, including
+other methods on those paths, goes to Django. Django's middleware never
+sees those requests; `async_views.guard` enforces ALLOWED_HOSTS and adds
+the CORS (corsheaders settings) and security headers for them, and CORS
+preflight OPTIONS requests still go to Django. Sessions, CSRF and
+SECURE_SSL_REDIRECT do not apply there: terminate TLS and redirect at the
+proxy. Run with e.g.
+
+    uvicorn ai_driven_travel_platform.asgi:application --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_driven_travel_platform.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up so app modules can load models and settings.
+from ai_driven_travel_platform.async_views import guard, match_route, route, serve  # noqa: E402
+from ai_services import async_views as ai_views  # noqa: E402
+from ai_services.streaming import chatbot_stream_app  # noqa: E402
+from travel.views import async_views as travel_views  # noqa: E402
+
+STREAMING_ROUTES = {
+    ('POST', '/ai-chatbot/stream/'): chatbot_stream_app,
+}
+
+ASYNC_ROUTES = [
+    route('GET', r'/map/directions/', travel_views.get_directions, 'get-directions'),
+    route('GET', r'/map/nearby/', travel_views.nearby_attractions, 'nearby-attractions'),
+    route('GET', r'/map/download/', travel_views.download_map, 'download-map'),
+    route('GET', r'/weather/(?P<location>[^/]+)/', travel_views.fetch_weather, 'fetch-weather'),
+    route('GET', r'/destinations/(?P<pk>[0-9]+)/context/', travel_views.trip_context, 'destination-context'),
+    route('POST', r'/ai-chatbot/', ai_views.ai_chatbot, 'ai-chatbot'),
+    route('POST', r'/generate-recommendations/', ai_views.generate_recommendations, 'generate-recommendations'),
+]
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http':
+        handler = STREAMING_ROUTES.get((scope['method'], scope['path']))
+        if handler is not None:
+            send = await guard(scope, send)
+            if send is not None:
+                await handler(scope, receive, send)
+            return
+        if settings.ASGI_ASYNC_VIEWS:
+            matched = match_route(ASYNC_ROUTES, scope['method'], scope['path'])
+            if matched is not None:
+                await serve(*matched, scope, receive, send)
+                return
+    await django_application(scope, receive, send)
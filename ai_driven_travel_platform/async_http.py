@@ -0,0 +1,28 @@
+import asyncio
+import weakref
+import httpx
+from django.conf import settings
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """
+    Return the shared httpx.AsyncClient for the running event loop.
+
+    One pooled client is kept per loop (one per uvicorn worker in practice),
+    so keep-alive connections to upstream APIs are reused across requests.
+    Callers pass per-request timeouts for their upstream.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ASYNC_HTTP_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(settings.ASYNC_HTTP_TIMEOUT),
+        )
+        _clients[loop] = client
+    return client
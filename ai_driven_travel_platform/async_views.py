@@ -0,0 +1,228 @@
+import re
+import json
+import time
+import logging
+from urllib.parse import parse_qsl
+from corsheaders.conf import conf as cors_conf
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.request import split_domain_port, validate_host
+from .metrics import apublish_snapshot, registry, request_stats
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRequest:
+    """The parts of an ASGI HTTP request that native async handlers use."""
+
+    def __init__(self, scope, body):
+        self.scope = scope
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query_params = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+        self.body = body
+
+    @property
+    def data(self):
+        """Decoded JSON body. Raises ValueError unless it is a JSON object."""
+        data = json.loads(self.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        return data
+
+
+class AsyncResponse:
+    """JSON response returned by a native async handler."""
+
+    def __init__(self, data, status=200, headers=None):
+        self.data = data
+        self.status = status
+        self.headers = headers or {}
+
+    async def send(self, send, receive):
+        await send_json(send, self.status, self.data, self.headers)
+
+
+def encode_headers(headers):
+    """ASGI header list for a dict of response headers."""
+    return [(name.lower().encode('latin-1'), str(value).encode('latin-1')) for name, value in headers.items()]
+
+
+def _scope_headers(scope):
+    return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+
+def request_host(scope):
+    """The host `HttpRequest.get_host` would check, honouring USE_X_FORWARDED_HOST."""
+    headers = _scope_headers(scope)
+    host = headers.get('x-forwarded-host') if settings.USE_X_FORWARDED_HOST else None
+    host = host or headers.get('host')
+    if not host and scope.get('server'):
+        server_name, server_port = scope['server']
+        host = f"{server_name}:{server_port}"
+    return host or ''
+
+
+def host_allowed(scope):
+    """Apply ALLOWED_HOSTS like Django does, including its DEBUG localhost defaults."""
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = ['.localhost', '127.0.0.1', '[::1]']
+    domain, _ = split_domain_port(request_host(scope))
+    return bool(domain) and validate_host(domain, allowed_hosts)
+
+
+def cors_headers(scope):
+    """CORS response headers corsheaders' CorsMiddleware would add for this request."""
+    if not re.match(cors_conf.CORS_URLS_REGEX, scope['path']):
+        return {}
+    headers = {'Vary': 'Origin'}
+    origin = _scope_headers(scope).get('origin')
+    if not origin:
+        return headers
+    allowed = (
+        cors_conf.CORS_ALLOW_ALL_ORIGINS
+        or origin in cors_conf.CORS_ALLOWED_ORIGINS
+        or any(re.match(pattern, origin) for pattern in cors_conf.CORS_ALLOWED_ORIGIN_REGEXES)
+    )
+    if not allowed:
+        return headers
+    if cors_conf.CORS_ALLOW_ALL_ORIGINS and not cors_conf.CORS_ALLOW_CREDENTIALS:
+        headers['Access-Control-Allow-Origin'] = '*'
+    else:
+        headers['Access-Control-Allow-Origin'] = origin
+    if cors_conf.CORS_ALLOW_CREDENTIALS:
+        headers['Access-Control-Allow-Credentials'] = 'true'
+    if cors_conf.CORS_EXPOSE_HEADERS:
+        headers['Access-Control-Expose-Headers'] = ', '.join(cors_conf.CORS_EXPOSE_HEADERS)
+    return headers
+
+
+def security_headers():
+    """Headers SecurityMiddleware and XFrameOptionsMiddleware add to every response."""
+    headers = {}
+    if settings.SECURE_CONTENT_TYPE_NOSNIFF:
+        headers['X-Content-Type-Options'] = 'nosniff'
+    if settings.SECURE_REFERRER_POLICY:
+        policy = settings.SECURE_REFERRER_POLICY
+        headers['Referrer-Policy'] = policy if isinstance(policy, str) else ','.join(policy)
+    headers['X-Frame-Options'] = settings.X_FRAME_OPTIONS.upper()
+    return headers
+
+
+async def guard(scope, send):
+    """
+    Apply the middleware checks native handlers would otherwise skip.
+
+    Native handlers run ahead of Django, so its middleware never sees them.
+    This rejects a Host outside ALLOWED_HOSTS with a 400, as `get_host()`
+    does for Django views, and returns a `send` that adds the CORS and
+    security headers the middleware stack would have set.
+
+    Returns:
+        The wrapped `send`, or None when the request was rejected.
+    """
+    if not host_allowed(scope):
+        logging.getLogger('django.security.DisallowedHost').warning(
+            f"Invalid HTTP_HOST header: {request_host(scope)!r}. You may need to add it to ALLOWED_HOSTS."
+        )
+        await send_json(send, 400, {'error': "Invalid host header"})
+        return None
+    extra = encode_headers({**security_headers(), **cors_headers(scope)})
+
+    async def send_with_headers(message):
+        if message['type'] == 'http.response.start':
+            message = {**message, 'headers': [*message.get('headers', []), *extra]}
+        await send(message)
+
+    return send_with_headers
+
+
+async def send_json(send, status_code, data, headers=None):
+    await send({
+        'type': 'http.response.start',
+        'status': status_code,
+        'headers': encode_headers({'Content-Type': 'application/json', **(headers or {})}),
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(data, cls=DjangoJSONEncoder).encode()})
+
+
+async def read_body(receive):
+    """Read the whole request body; None if the client disconnected first."""
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def wait_for_disconnect(receive):
+    """Return once the client disconnects. Call only after the body has been read."""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+def route(method, pattern, handler, name):
+    """
+    Route entry for `match_route`.
+
+    Args:
+        method (str): HTTP method.
+        pattern (str): Regex matched against the full path; named groups become handler kwargs.
+        handler: `async def handler(request, **kwargs)` returning an object
+            with `async send(send, receive)`, usually an AsyncResponse.
+        name (str): The Django URL name of the sync view, used as the metrics label.
+    """
+    return method, re.compile(pattern), handler, name
+
+
+def match_route(routes, method, path):
+    """Return (handler, name, kwargs) for the first matching route, or None."""
+    for route_method, pattern, handler, name in routes:
+        if route_method != method:
+            continue
+        match = pattern.fullmatch(path)
+        if match:
+            return handler, name, match.groupdict()
+    return None
+
+
+async def serve(handler, name, kwargs, scope, receive, send):
+    """
+    Run a native async handler for one ASGI request.
+
+    Latency and per-upstream time are recorded under the same view label as
+    `MetricsMiddleware` uses for the sync view, so both modes share series.
+    The host check, CORS and security headers come from `guard`. Unhandled
+    errors become a JSON 500 like the DRF views return.
+    """
+    send = await guard(scope, send)
+    if send is None:
+        return
+    body = await read_body(receive)
+    if body is None:
+        return
+    stats = {'db_count': 0, 'db_time': 0.0, 'upstream': {}}
+    token = request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        try:
+            response = await handler(AsyncRequest(scope, body), **kwargs)
+        except Exception as e:
+            logger.exception(f"Error in {name}: {e}")
+            response = AsyncResponse({"error": "Internal server error"}, status=500)
+        await response.send(send, receive)
+    finally:
+        request_stats.reset(token)
+    elapsed = time.perf_counter() - started
+
+    registry.observe('http_request_duration_seconds', {'view': name, 'method': scope['method']}, elapsed)
+    for upstream, upstream_time in stats['upstream'].items():
+        registry.inc('upstream_request_duration_seconds_by_view_total', {'view': name, 'upstream': upstream}, upstream_time)
+    await apublish_snapshot()
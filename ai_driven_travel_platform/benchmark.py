@@ -0,0 +1,256 @@
+import json
+import math
+import time
+import zlib
+import logging
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_USER_EMAIL = 'benchmark@example.com'
+BENCHMARK_PREFIX = 'Benchmark'
+CITIES = ['Addis Ababa', 'Gondar', 'Lalibela', 'Axum', 'Bahir Dar', 'Harar', 'Hawassa', 'Arba Minch']
+INTEREST_SETS = [
+    ['history', 'culture'], ['hiking', 'nature'], ['food', 'coffee'], ['festivals', 'music'], ['wildlife'],
+]
+
+# Scenario name -> request builder (called with the request number)
+SCENARIOS = {
+    'reviews': lambda n: ('get', '/reviews/', None),
+    'destinations': lambda n: ('get', '/destinations/', None),
+    'generate-recommendations': lambda n: (
+        'post', '/generate-recommendations/',
+        {'interests': INTEREST_SETS[n % len(INTEREST_SETS)], 'budget': 'mid-range'},
+    ),
+    'directions': lambda n: (
+        'get',
+        f"/map/directions/?start={CITIES[n % len(CITIES)]}&end={CITIES[(n * 3 + 1) % len(CITIES)]}&route_format=summary",
+        None,
+    ),
+    'weather': lambda n: ('get', f"/weather/{CITIES[n % len(CITIES)]}/", None),
+    'itineraries': lambda n: ('get', '/itineraries/', None),
+}
+
+
+def _fake_coordinates(text):
+    """Deterministic [lon, lat] inside Ethiopia for a place name."""
+    seed = zlib.crc32(text.strip().lower().encode('utf-8'))
+    return [33.0 + (seed % 10000) / 10000 * 14.0, 3.5 + (seed // 10000 % 10000) / 10000 * 11.0]
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """
+    Answers Gemini, OpenRouteService and OpenWeatherMap requests with canned
+    payloads shaped like the real APIs, after `server.latency` seconds.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.endswith('/geocode/search'):
+            text = query.get('text', '')
+            self._send_json({'features': [{
+                'geometry': {'type': 'Point', 'coordinates': _fake_coordinates(text)},
+                'properties': {'label': text},
+            }]})
+        elif url.path.endswith('/data/2.5/weather'):
+            place = query.get('q', '')
+            seed = zlib.crc32(place.encode('utf-8'))
+            self._send_json({
+                'name': place,
+                'main': {'temp': 10 + seed % 20, 'humidity': 30 + seed % 50},
+                'weather': [{'description': 'clear sky'}],
+                'wind': {'speed': seed % 10},
+                'sys': {'country': 'ET'},
+            })
+        else:
+            self._send_json({'error': f'No stub for GET {url.path}'}, status=404)
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        path = urlparse(self.path).path
+        payload = self._read_body()
+        if path.endswith(':generateContent'):
+            self._send_json({'candidates': [{'content': {'parts': [{'text': self.server.generated_text}]}}]})
+        elif path.endswith(':streamGenerateContent'):
+            chunks = [self.server.generated_text[i:i + 80] for i in range(0, len(self.server.generated_text), 80)]
+            body = ''.join(
+                f"data: {json.dumps({'candidates': [{'content': {'parts': [{'text': chunk}]}}]})}\r\n\r\n" for chunk in chunks
+            ).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif '/v2/directions/' in path:
+            (start_lon, start_lat), (end_lon, end_lat) = payload['coordinates'][:2]
+            distance = math.hypot(end_lon - start_lon, end_lat - start_lat) * 111000
+            line = [[start_lon + (end_lon - start_lon) * i / 50, start_lat + (end_lat - start_lat) * i / 50] for i in range(51)]
+            self._send_json({'type': 'FeatureCollection', 'features': [{
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': line},
+                'properties': {
+                    'segments': [{'distance': distance, 'duration': distance / 15}],
+                    'summary': {'distance': distance, 'duration': distance / 15},
+                },
+            }]})
+        else:
+            self._send_json({'error': f'No stub for POST {path}'}, status=404)
+
+
+def start_stub_server(port, latency=0.0):
+    """
+    Serve stub upstream APIs on localhost:`port` from a background thread.
+
+    Args:
+        port (int): Port the benchmark settings point every upstream at.
+        latency (float): Seconds each stubbed call takes.
+
+    Returns:
+        ThreadingHTTPServer: Call `shutdown()` when done.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubUpstreamHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.generated_text = 'Visit Lalibela for its rock-hewn churches. ' * 40
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def seed_data(count):
+    """
+    Create a benchmark user plus `count` destinations with reviews and itineraries.
+
+    Rows are named with BENCHMARK_PREFIX, so seeding twice adds nothing.
+
+    Returns:
+        User: The benchmark user, authenticated on every request.
+    """
+    from django.contrib.auth import get_user_model
+    from travel.models.destination import Destination
+    from travel.models.itinerary import Itinerary
+    from travel.models.review import Review
+
+    user, _ = get_user_model().objects.get_or_create(
+        email=BENCHMARK_USER_EMAIL, defaults={'username': 'benchmark'},
+    )
+    existing = Destination.objects.filter(name__startswith=BENCHMARK_PREFIX).count()
+    for i in range(existing, count):
+        destination = Destination.objects.create(
+            name=f"{BENCHMARK_PREFIX} destination {i}",
+            description='Benchmark destination ' * 20,
+            location=CITIES[i % len(CITIES)],
+            region='Amhara',
+            category='cultural',
+            price_range='$$',
+            best_time_to_visit='October to March',
+            safety_level='high',
+        )
+        Review.objects.create(
+            user=user, destination=destination, rating=1 + i % 5,
+            title='Benchmark review', content='Benchmark review ' * 10,
+        )
+        if i < 20:
+            Itinerary.objects.create(
+                user=user, title=f"{BENCHMARK_PREFIX} itinerary {i}",
+                start_date='2026-01-01', end_date='2026-01-05',
+                trip_type='solo', number_of_travelers=1, budget=1000,
+            )
+    return user
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(name, total_requests, concurrency, user=None, warmup=0):
+    """
+    Drive one endpoint with `concurrency` client threads through the full
+    Django stack (middleware, DRF, ORM), counting queries per request.
+
+    Returns:
+        dict: Latency percentiles (ms), throughput, error and status counts,
+            error rate (responses >= 400) and queries per request.
+    """
+    from rest_framework.test import APIClient
+
+    build_request = SCENARIOS[name]
+    local = threading.local()
+
+    def send(number):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = APIClient(raise_request_exception=False)
+            if user is not None:
+                client.force_authenticate(user)
+        method, path, body = build_request(number)
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = getattr(client, method)(path, body, format='json') if body else getattr(client, method)(path)
+        elapsed = time.perf_counter() - started
+        close_old_connections()
+        return elapsed, response.status_code, queries[0]
+
+    for number in range(warmup):
+        send(number)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(warmup, warmup + total_requests)))
+    wall_time = time.perf_counter() - started
+
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in results)
+    statuses, query_counts = {}, [queries for _, _, queries in results]
+    for _, status_code, _ in results:
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+    errors = sum(count for code, count in statuses.items() if int(code) >= 400)
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'error_rate': round(errors / total_requests, 4),
+        'status_codes': statuses,
+        'throughput_rps': round(total_requests / wall_time, 2) if wall_time else None,
+        'latency_ms': {
+            'p50': round(_percentile(latencies, 0.50), 2),
+            'p95': round(_percentile(latencies, 0.95), 2),
+            'p99': round(_percentile(latencies, 0.99), 2),
+            'mean': round(statistics.fmean(latencies), 2),
+            'max': round(latencies[-1], 2),
+        },
+        'queries_per_request': {
+            'mean': round(statistics.fmean(query_counts), 2),
+            'max': max(query_counts),
+        },
+    }
@@ -0,0 +1,294 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY_PREFIX = 'cache-stats'
+GENERATION_KEY_PREFIX = 'cache-generation'
+
+
+def make_cache_key(namespace, *parts):
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        namespace (str): Key prefix, e.g. "llm:recommendations".
+        *parts: JSON-serializable values identifying the cached content.
+
+    Returns:
+        str: "<namespace>:<sha256 of the canonical JSON of parts>".
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def record_cache_event(namespace, event):
+    """Increment the hit/miss counter for a cache namespace."""
+    key = f"{STATS_KEY_PREFIX}:{namespace}:{event}"
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not record cache {event} for {namespace}: {e}")
+
+
+async def arecord_cache_event(namespace, event):
+    """`record_cache_event` for async callers, run on a worker thread."""
+    await sync_to_async(record_cache_event, thread_sensitive=False)(namespace, event)
+
+
+def get_cache_stats(namespace):
+    """
+    Return hit/miss counters for a cache namespace.
+
+    Returns:
+        dict: hits, misses, stale (expired values served while the upstream
+            was unavailable or being refreshed) and hit_rate (None until
+            the first lookup).
+    """
+    hits = cache.get(f"{STATS_KEY_PREFIX}:{namespace}:hit") or 0
+    misses = cache.get(f"{STATS_KEY_PREFIX}:{namespace}:miss") or 0
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'stale': cache.get(f"{STATS_KEY_PREFIX}:{namespace}:stale") or 0,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def get_generation(name):
+    """
+    Current generation number of a cached data set.
+
+    Cache keys that embed the generation become unreachable as soon as
+    bump_generation() is called, so stale entries are never served.
+    """
+    try:
+        return cache.get(f"{GENERATION_KEY_PREFIX}:{name}") or 0
+    except Exception as e:
+        logger.warning(f"Could not read cache generation for {name}: {e}")
+        return None
+
+
+def bump_generation(*names):
+    """Invalidate every cache entry keyed on the given generations."""
+    for name in names:
+        key = f"{GENERATION_KEY_PREFIX}:{name}"
+        try:
+            cache.add(key, 0, None)
+            cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Could not bump cache generation for {name}: {e}")
+
+
+def set_cached_value(key, value, timeout, stale_ttl=None):
+    """Store a value in the entry format read by get_or_set_single_flight()."""
+    if stale_ttl:
+        cache.set(key, {'value': value, 'fresh_until': time.time() + timeout}, timeout + stale_ttl)
+    else:
+        cache.set(key, {'value': value}, timeout)
+
+
+def _try_cache(operation, *args, fallback=None):
+    """Run a cache operation, returning `fallback` when the cache is unavailable."""
+    try:
+        return operation(*args)
+    except Exception as e:
+        logger.warning(f"Cache unavailable for {operation.__name__}: {e}")
+        return fallback
+
+
+async def _atry_cache(operation, *args, fallback=None):
+    """`_try_cache` on a worker thread, for async callers."""
+    return await sync_to_async(_try_cache, thread_sensitive=False)(operation, *args, fallback=fallback)
+
+
+def get_or_set_single_flight(key, producer, timeout, stats_namespace=None, lock_timeout=60, wait_timeout=30, poll_interval=0.1,
+                             stale_ttl=None, stale_on=(Exception,)):
+    """
+    Return the cached value for `key`, computing it at most once concurrently.
+
+    The first caller to miss takes a short-lived lock and runs `producer`;
+    concurrent callers for the same key poll the cache until the value
+    appears instead of stampeding the upstream. If the lock holder dies or
+    `wait_timeout` elapses, waiters fall back to computing the value
+    themselves. Exceptions from `producer` propagate and nothing is cached.
+    If the cache itself is unavailable, `producer` is simply called.
+
+    With `stale_ttl`, entries are kept that much longer than `timeout` as
+    the last known good value: once expired, one caller refreshes it while
+    the others get the stale value immediately, and if the refresh raises
+    one of `stale_on` (e.g. CircuitOpen while the upstream is down) the
+    stale value is returned instead of the error.
+
+    Args:
+        key (str): Cache key.
+        producer (callable): Zero-argument function computing the value.
+        timeout (int): TTL in seconds for the cached value.
+        stats_namespace (str, optional): Namespace for hit/miss counters.
+        lock_timeout (int): TTL of the single-flight lock in seconds.
+        wait_timeout (float): Maximum time to wait for another producer.
+        poll_interval (float): Delay between cache polls while waiting.
+        stale_ttl (int, optional): Seconds to keep serving an expired value.
+        stale_on (tuple): Producer exceptions that fall back to a stale value.
+
+    Returns:
+        The cached or freshly produced value.
+    """
+    entry = _try_cache(cache.get, key)
+    if entry is not None and entry.get('fresh_until', float('inf')) > time.time():
+        if stats_namespace:
+            record_cache_event(stats_namespace, 'hit')
+        return entry['value']
+    stale = entry
+
+    def serve_stale(reason):
+        logger.info(f"Serving stale value for {key}: {reason}")
+        if stats_namespace:
+            record_cache_event(stats_namespace, 'stale')
+        return stale['value']
+
+    def produce():
+        try:
+            value = producer()
+        except stale_on as e:
+            if stale is None:
+                raise
+            return serve_stale(e)
+        _try_cache(set_cached_value, key, value, timeout, stale_ttl)
+        return value
+
+    if stats_namespace:
+        record_cache_event(stats_namespace, 'miss')
+
+    lock_key = f"{key}:lock"
+    if not _try_cache(cache.add, lock_key, 1, lock_timeout, fallback=True):  # No cache, no lock to wait on
+        if stale is not None:
+            return serve_stale("refresh in progress")
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            entry = _try_cache(cache.get, key)
+            if entry is not None:
+                return entry['value']
+            if _try_cache(cache.get, lock_key) is None:
+                break
+        logger.info(f"Single-flight wait expired for {key}; computing value directly")
+        return produce()
+
+    try:
+        return produce()
+    finally:
+        _try_cache(cache.delete, lock_key)
+
+
+async def aget_or_set_single_flight(key, producer, timeout, stats_namespace=None, lock_timeout=60, wait_timeout=30,
+                                    poll_interval=0.1, stale_ttl=None, stale_on=(Exception,)):
+    """
+    `get_or_set_single_flight` for async handlers; `producer` is a zero-argument coroutine function.
+
+    Waiting for another producer happens on the event loop; cache reads and
+    writes run on a worker thread so a slow Redis never stalls the loop.
+    """
+    entry = await _atry_cache(cache.get, key)
+    if entry is not None and entry.get('fresh_until', float('inf')) > time.time():
+        if stats_namespace:
+            await arecord_cache_event(stats_namespace, 'hit')
+        return entry['value']
+    stale = entry
+
+    async def serve_stale(reason):
+        logger.info(f"Serving stale value for {key}: {reason}")
+        if stats_namespace:
+            await arecord_cache_event(stats_namespace, 'stale')
+        return stale['value']
+
+    async def produce():
+        try:
+            value = await producer()
+        except stale_on as e:
+            if stale is None:
+                raise
+            return await serve_stale(e)
+        await _atry_cache(set_cached_value, key, value, timeout, stale_ttl)
+        return value
+
+    if stats_namespace:
+        await arecord_cache_event(stats_namespace, 'miss')
+
+    lock_key = f"{key}:lock"
+    if not await _atry_cache(cache.add, lock_key, 1, lock_timeout, fallback=True):
+        if stale is not None:
+            return await serve_stale("refresh in progress")
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval)
+            entry = await _atry_cache(cache.get, key)
+            if entry is not None:
+                return entry['value']
+            if await _atry_cache(cache.get, lock_key) is None:
+                break
+        logger.info(f"Single-flight wait expired for {key}; computing value directly")
+        return await produce()
+
+    try:
+        return await produce()
+    finally:
+        await _atry_cache(cache.delete, lock_key)
+
+
+class LRUCache:
+    """
+    Small thread-safe in-process LRU with an optional per-entry TTL.
+
+    Used as a first tier in front of Redis for hot, tiny values. The TTL bounds
+    how long a worker can keep serving a value invalidated elsewhere.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, self._MISSING)
+            if item is self._MISSING:
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,252 @@
+import time
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream that is failing or saturated."""
+
+    def __init__(self, name, retry_after, reason="circuit open"):
+        super().__init__(f"{name} unavailable ({reason}); retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker and bulkhead for one upstream API.
+
+    Failures are counted in a sliding window of `window` seconds; once
+    `failure_threshold` is reached the circuit opens and calls fail fast
+    with CircuitOpen for `reset_timeout` seconds. The circuit then goes
+    half-open: one probe call is let through, closing the circuit on
+    success and reopening it on failure.
+
+    Opening is also published to the shared cache, so every worker stops
+    calling the upstream, not just the one that saw the failures. With
+    `max_concurrency`, calls beyond that many in flight fail fast too,
+    so a slow upstream cannot tie up every worker thread.
+
+    Args:
+        name (str): Upstream name, e.g. "ors".
+        failure_threshold (int): Failures within the window that open the circuit.
+        window (float): Failure counting window in seconds.
+        reset_timeout (float): Seconds to stay open before probing.
+        max_concurrency (int, optional): In-flight call limit per process.
+    """
+
+    def __init__(self, name, failure_threshold=5, window=30, reset_timeout=30, max_concurrency=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.shared_key = f"circuit:{name}:open-until"
+        self._lock = threading.Lock()
+        self._failures = []
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def _shared_open_until(self):
+        try:
+            return cache.get(self.shared_key)
+        except Exception:
+            return None
+
+    def _reject(self, retry_after, reason="circuit open"):
+        registry.inc('upstream_circuit_rejections_total', {'upstream': self.name})
+        return CircuitOpen(self.name, retry_after, reason)
+
+    def _before_call_local(self, claim_probe):
+        """Raise CircuitOpen if this process's state rejects the call. Returns True for a half-open probe."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self.reset_timeout - (now - self._opened_at)
+                if remaining > 0 or self._probing:
+                    raise self._reject(max(remaining, 1.0))
+                if claim_probe:
+                    self._probing = True
+                return True
+        return False
+
+    def _check_shared(self, open_until):
+        if open_until is not None and open_until > time.time():
+            raise self._reject(open_until - time.time())
+
+    def _before_call(self, claim_probe=True):
+        """Let the call through or raise CircuitOpen. Returns True for a half-open probe."""
+        if self._before_call_local(claim_probe):
+            return True
+        self._check_shared(self._shared_open_until())
+        return False
+
+    async def _abefore_call(self, claim_probe=True):
+        """`_before_call` for async callers; the shared state is read on a worker thread."""
+        if self._before_call_local(claim_probe):
+            return True
+        self._check_shared(await sync_to_async(self._shared_open_until, thread_sensitive=False)())
+        return False
+
+    def check(self):
+        """Raise CircuitOpen if a call would be rejected, without making one (e.g. before waiting for quota)."""
+        self._before_call(claim_probe=False)
+
+    async def acheck(self):
+        """`check` for async callers."""
+        await self._abefore_call(claim_probe=False)
+
+    def _close(self, probe):
+        """Close the circuit locally. Returns True when the shared open marker should be cleared."""
+        with self._lock:
+            was_open = self._state == OPEN
+            self._state = CLOSED
+            self._failures.clear()
+            self._probing = False
+        if was_open or probe:
+            logger.info(f"Circuit for {self.name} closed")
+            return True
+        return False
+
+    def _clear_shared(self):
+        try:
+            cache.delete(self.shared_key)
+        except Exception:
+            pass
+
+    def _count_failure(self, probe):
+        """Record a failure locally. Returns True when it opened the circuit."""
+        now = time.monotonic()
+        with self._lock:
+            self._failures = [at for at in self._failures if now - at < self.window]
+            self._failures.append(now)
+            self._probing = False
+            if not probe and (self._state == OPEN or len(self._failures) < self.failure_threshold):
+                return False
+            self._state = OPEN
+            self._opened_at = now
+            failures = len(self._failures)
+        logger.warning(f"Circuit for {self.name} opened after {failures} failures in {self.window}s")
+        registry.inc('upstream_circuit_opened_total', {'upstream': self.name})
+        return True
+
+    def _publish_open(self):
+        try:
+            cache.set(self.shared_key, time.time() + self.reset_timeout, int(self.reset_timeout) + 1)
+        except Exception:
+            pass
+
+    def record_success(self, probe=False):
+        if self._close(probe):
+            self._clear_shared()
+
+    def record_failure(self, probe=False):
+        if self._count_failure(probe):
+            self._publish_open()
+
+    async def arecord_success(self, probe=False):
+        if self._close(probe):
+            await sync_to_async(self._clear_shared, thread_sensitive=False)()
+
+    async def arecord_failure(self, probe=False):
+        if self._count_failure(probe):
+            await sync_to_async(self._publish_open, thread_sensitive=False)()
+
+    def _release_probe(self, probe):
+        if probe:
+            with self._lock:
+                self._probing = False
+
+    @contextmanager
+    def guard(self, is_failure=None, limit_concurrency=True):
+        """
+        Run the enclosed upstream call under the breaker.
+
+        Args:
+            is_failure (callable, optional): Given an exception raised by the
+                call, return True if it means the upstream is unhealthy
+                (timeouts, 5xx). Default: every exception counts.
+            limit_concurrency (bool): Apply the `max_concurrency` bulkhead.
+
+        Raises:
+            CircuitOpen: If the circuit is open or the bulkhead is full.
+        """
+        probe = self._before_call()
+        slots = self._slots if limit_concurrency else None
+        if slots is not None and not slots.acquire(blocking=False):
+            self._release_probe(probe)
+            raise self._reject(1.0, reason="too many concurrent calls")
+        try:
+            yield
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(probe)
+            else:
+                self.record_success(probe)
+            raise
+        except BaseException:
+            # Cancelled or closed mid-call: no verdict, but free the probe slot
+            self._release_probe(probe)
+            raise
+        else:
+            self.record_success(probe)
+        finally:
+            if slots is not None:
+                slots.release()
+
+    @asynccontextmanager
+    async def aguard(self, is_failure=None):
+        """
+        `guard` for async callers: shared-state reads and writes run on a
+        worker thread. There is no bulkhead, a waiting coroutine holds no thread.
+        """
+        probe = await self._abefore_call()
+        try:
+            yield
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                await self.arecord_failure(probe)
+            else:
+                await self.arecord_success(probe)
+            raise
+        except BaseException:
+            self._release_probe(probe)
+            raise
+        else:
+            await self.arecord_success(probe)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Process-wide breaker for an upstream, configured from `settings.CIRCUIT_BREAKERS`."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                options = dict(settings.CIRCUIT_BREAKER_DEFAULTS, **settings.CIRCUIT_BREAKERS.get(name, {}))
+                breaker = _breakers[name] = CircuitBreaker(name, **options)
+    return breaker
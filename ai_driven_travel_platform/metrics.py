@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import socket
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+WORKERS_KEY = 'metrics:workers'
+WORKER_KEY_PREFIX = 'metrics:worker'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help); histograms use LATENCY_BUCKETS
+METRICS = {
+    'http_request_duration_seconds': ('histogram', "Time spent handling a request, per view."),
+    'db_queries_total': ('counter', "Database queries executed, per view."),
+    'db_query_duration_seconds_total': ('counter', "Time spent in database queries, per view."),
+    'upstream_request_duration_seconds': ('histogram', "Outbound HTTP call time, per upstream API."),
+    'upstream_request_duration_seconds_by_view_total': ('counter', "Outbound HTTP call time, per view and upstream API."),
+    'upstream_circuit_opened_total': ('counter', "Times the circuit breaker opened, per upstream API."),
+    'upstream_circuit_rejections_total': ('counter', "Calls failed fast by an open circuit or full bulkhead, per upstream API."),
+}
+
+# Per-request accumulator; None outside a request (Celery tasks, shell)
+request_stats = ContextVar('request_stats', default=None)
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms for one worker process.
+
+    Series are keyed by metric name and a sorted tuple of label pairs.
+    Histograms keep cumulative-ready bucket counts plus sum and count.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(LATENCY_BUCKETS, value)
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        """JSON-serializable copy of every series."""
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(series)] for (name, labels), series in self.histograms.items()],
+            }
+
+
+registry = MetricsRegistry()
+
+
+def merge_snapshots(snapshots):
+    """Sum series across worker snapshots."""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, series in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.setdefault(key, [0] * len(series))
+            histograms[key] = [a + b for a, b in zip(merged, series)]
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render_prometheus(counters, histograms):
+    """Render merged series in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type == 'counter':
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+        else:
+            for (series_name, labels), series in sorted(histograms.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), series[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {series[-1]}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+_last_publish = {'at': 0.0}
+
+
+def publish_snapshot(force=False):
+    """
+    Share this worker's series with the other workers, at most every
+    `METRICS_PUBLISH_INTERVAL` seconds.
+
+    Each worker stores its snapshot under its own key (expiring with the
+    worker), so /metrics can be served by any worker and still cover all.
+    """
+    if _publish_due(force):
+        _write_snapshot()
+
+
+async def apublish_snapshot():
+    """`publish_snapshot` for async handlers; the Redis write runs on a worker thread."""
+    if _publish_due(False):
+        await sync_to_async(_write_snapshot, thread_sensitive=False)()
+
+
+def _publish_due(force):
+    now = time.monotonic()
+    if not force and now - _last_publish['at'] < settings.METRICS_PUBLISH_INTERVAL:
+        return False
+    _last_publish['at'] = now
+    return True
+
+
+def _write_snapshot():
+    try:
+        from django_redis import get_redis_connection
+        redis = get_redis_connection('default')
+        worker = worker_id()
+        pipe = redis.pipeline()
+        pipe.set(f"{WORKER_KEY_PREFIX}:{worker}", json.dumps(registry.snapshot()), ex=settings.METRICS_WORKER_TTL)
+        pipe.sadd(WORKERS_KEY, worker)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Could not publish metrics snapshot: {e}")
+
+
+def collect_snapshots():
+    """Snapshots of every live worker, or just this one without a shared Redis."""
+    publish_snapshot(force=True)
+    try:
+        from django_redis import get_redis_connection
+        redis = get_redis_connection('default')
+        workers = sorted(member.decode() if isinstance(member, bytes) else member for member in redis.smembers(WORKERS_KEY))
+        payloads = redis.mget([f"{WORKER_KEY_PREFIX}:{worker}" for worker in workers]) if workers else []
+    except Exception as e:
+        logger.debug(f"Shared metrics unavailable, reporting this worker only: {e}")
+        return [registry.snapshot()]
+    snapshots, expired = [], []
+    for worker, payload in zip(workers, payloads):
+        if payload is None:
+            expired.append(worker)
+        else:
+            snapshots.append(json.loads(payload))
+    if expired:
+        redis.srem(WORKERS_KEY, *expired)
+    return snapshots
+
+
+@contextmanager
+def track_upstream(upstream):
+    """
+    Time an outbound HTTP call to `upstream` ("gemini", "ors", "openweathermap", "flightstats").
+
+    The duration is recorded in the upstream histogram and, inside a request,
+    added to that request's per-upstream total.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe('upstream_request_duration_seconds', {'upstream': upstream}, elapsed)
+        stats = request_stats.get()
+        if stats is not None:
+            stats['upstream'][upstream] = stats['upstream'].get(upstream, 0.0) + elapsed
@@ -0,0 +1,120 @@
+import os
+import re
+import time
+import random
+import logging
+import cProfile
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from .metrics import publish_snapshot, registry, request_stats
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+
+def view_label(request):
+    """Bounded-cardinality label for the view that served a request."""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else 'unmatched'
+
+
+def is_staff_request(request):
+    """
+    True if the request comes from a staff user, by session or JWT.
+
+    DRF only authenticates inside views, so outside them (in middleware, or
+    in plain Django views) the bearer token is checked here.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    if not request.META.get('HTTP_AUTHORIZATION'):
+        return False
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_staff
+
+
+class MetricsMiddleware:
+    """
+    Record per-view latency, database and upstream time for every request.
+
+    Database queries are timed with a connection execute wrapper; outbound
+    calls are timed by `metrics.track_upstream` at the client call sites. A
+    `Server-Timing` header breaks the request down for staff users.
+
+    Staff can also ask for a cProfile of a request with `X-Profile: 1`;
+    `PROFILE_SAMPLE_RATE` of such requests are profiled and the stats are
+    written to `PROFILE_DIR`, named in the `X-Profile-File` header. The
+    caller is authenticated before the profiler starts, so other clients
+    cannot run requests under it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = {'db_count': 0, 'db_time': 0.0, 'upstream': {}}
+        token = request_stats.set(stats)
+        profiler = None
+        if (request.META.get(PROFILE_HEADER) == '1' and random.random() < settings.PROFILE_SAMPLE_RATE
+                and is_staff_request(request)):
+            profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._time_query):
+                if profiler is not None:
+                    response = profiler.runcall(self.get_response, request)
+                else:
+                    response = self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        elapsed = time.perf_counter() - started
+
+        view = view_label(request)
+        registry.observe('http_request_duration_seconds', {'view': view, 'method': request.method}, elapsed)
+        registry.inc('db_queries_total', {'view': view}, stats['db_count'])
+        registry.inc('db_query_duration_seconds_total', {'view': view}, stats['db_time'])
+        for upstream, upstream_time in stats['upstream'].items():
+            registry.inc('upstream_request_duration_seconds_by_view_total', {'view': view, 'upstream': upstream}, upstream_time)
+        publish_snapshot()
+
+        # DRF authenticates inside the view and sets the user on the Django request
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = self._server_timing(elapsed, stats)
+            if profiler is not None:
+                response['X-Profile-File'] = self._dump_profile(profiler, view)
+        return response
+
+    @staticmethod
+    def _time_query(execute, sql, params, many, context):
+        stats = request_stats.get()
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if stats is not None:
+                stats['db_count'] += 1
+                stats['db_time'] += time.perf_counter() - started
+
+    @staticmethod
+    def _server_timing(elapsed, stats):
+        entries = [f'db;desc="{stats["db_count"]} queries";dur={stats["db_time"] * 1000:.1f}']
+        entries += [f"{upstream};dur={seconds * 1000:.1f}" for upstream, seconds in stats['upstream'].items()]
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+        return ', '.join(entries)
+
+    @staticmethod
+    def _dump_profile(profiler, view):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        filename = f"{timezone.now():%Y%m%dT%H%M%S%f}-{re.sub(r'[^A-Za-z0-9_-]+', '_', view)}.prof"
+        profiler.dump_stats(os.path.join(settings.PROFILE_DIR, filename))
+        logger.info(f"Saved request profile {filename}")
+        return filename
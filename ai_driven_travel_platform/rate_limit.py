@@ -0,0 +1,119 @@
+import time
+import asyncio
+import logging
+import threading
+from asgiref.sync import sync_to_async
+
+logger = logging.getLogger(__name__)
+
+# Atomic token bucket: refills at `rate` tokens/second up to `capacity`, using Redis server time.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2 + 1)
+return tostring(wait)
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a shared quota stays saturated for longer than the caller will wait."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Rate limit for {name} exceeded; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every worker through Redis.
+
+    The bucket state lives in one Redis hash updated by a Lua script, so all
+    processes draw from the same quota. If the Redis connection is not
+    available (e.g. a non-Redis cache backend), a per-process bucket is used.
+
+    Args:
+        name (str): Bucket name, used in the Redis key.
+        rate_per_minute (float): Sustained quota.
+        burst (int, optional): Bucket capacity. Default: one minute of quota.
+    """
+
+    def __init__(self, name, rate_per_minute, burst=None):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute))
+        self.key = f"rate-limit:{name}"
+        self._script = None
+        self._local_tokens = float(self.capacity)
+        self._local_ts = time.monotonic()
+        self._local_lock = threading.Lock()
+
+    def _redis_script(self):
+        if self._script is None:
+            from django_redis import get_redis_connection
+            self._script = get_redis_connection('default').register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def _take_local(self, tokens):
+        with self._local_lock:
+            now = time.monotonic()
+            self._local_tokens = min(self.capacity, self._local_tokens + (now - self._local_ts) * self.rate)
+            self._local_ts = now
+            if self._local_tokens >= tokens:
+                self._local_tokens -= tokens
+                return 0.0
+            return (tokens - self._local_tokens) / self.rate
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available.
+
+        Returns:
+            float: 0 when the tokens were taken, otherwise the seconds to wait.
+        """
+        try:
+            return float(self._redis_script()(keys=[self.key], args=[self.rate, self.capacity, tokens]))
+        except Exception as e:
+            logger.debug(f"Shared rate limiter unavailable for {self.name}, using local bucket: {e}")
+            return self._take_local(tokens)
+
+    def acquire(self, tokens=1, timeout=0):
+        """
+        Block until tokens are available or `timeout` seconds pass.
+
+        Raises:
+            RateLimitExceeded: If the quota stays saturated past the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(self.name, wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1, timeout=0):
+        """`acquire` for async handlers: waits on the event loop instead of sleeping the thread."""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = await sync_to_async(self.try_acquire, thread_sensitive=False)(tokens)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(self.name, wait)
+            await asyncio.sleep(wait)
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ai_driven_travel_platform.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -221,6 +223,8 @@ AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME', 'us-east-1')
 AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = None
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+AWS_QUERYSTRING_AUTH = True  # storage.url() returns pre-signed URLs
+AWS_QUERYSTRING_EXPIRE = int(os.getenv('AWS_QUERYSTRING_EXPIRE', str(60 * 60)))
 
 # Celery settings
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
@@ -228,6 +232,33 @@ CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:63
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+CELERY_TASK_SOFT_TIME_LIMIT = CELERY_TASK_TIME_LIMIT - 60  # Leaves tasks time to record a failure
+CELERY_BEAT_SCHEDULE = {
+    'geocode-catalog': {
+        'task': 'travel.tasks.geocode_catalog',
+        'schedule': crontab(hour=1, minute=30),
+    },
+    'precompute-distance-matrix': {
+        'task': 'travel.tasks.precompute_distance_matrix',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'refresh-weather-cache': {
+        'task': 'travel.tasks.refresh_weather_cache',
+        'schedule': crontab(minute='*/10'),
+    },
+    'flush-buffered-counters': {
+        'task': 'travel.tasks.flush_buffered_counters',
+        'schedule': 60.0,
+    },
+    'reconcile-review-aggregates': {
+        'task': 'travel.tasks.reconcile_review_aggregates',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'weekly-recommendation-digest': {
+        'task': 'ai_services.tasks.start_recommendation_batch',
+        'schedule': crontab(day_of_week='mon', hour=4, minute=0),
+    },
+}
 
 # Cache settings
 CACHES = {
@@ -243,7 +274,145 @@ CACHES = {
 # Google AI settings
 
 ORS_API_KEY = os.getenv('ORS_API_KEY')
+
+# OpenRouteService client (see travel/utils/ors_client.py). Quotas are requests per minute,
+# shared by all workers through Redis; keep them in line with the ORS plan.
+ORS_BASE_URL = os.getenv('ORS_BASE_URL', 'https://api.openrouteservice.org')
+ORS_TIMEOUT = int(os.getenv('ORS_TIMEOUT', '20'))
+ORS_RETRY_TIMEOUT = int(os.getenv('ORS_RETRY_TIMEOUT', '30'))
+ORS_RATE_LIMIT_WAIT = float(os.getenv('ORS_RATE_LIMIT_WAIT', '5'))
+ORS_RATE_LIMITS = {
+    'default': int(os.getenv('ORS_RATE_LIMIT_DEFAULT', '40')),
+    'geocode': int(os.getenv('ORS_RATE_LIMIT_GEOCODE', '100')),
+    'directions': int(os.getenv('ORS_RATE_LIMIT_DIRECTIONS', '40')),
+    'isochrones': int(os.getenv('ORS_RATE_LIMIT_ISOCHRONES', '20')),
+    'matrix': int(os.getenv('ORS_RATE_LIMIT_MATRIX', '40')),
+    'pois': int(os.getenv('ORS_RATE_LIMIT_POIS', '60')),
+}
+
+# Geocoding cache (see travel/utils/geocoding.py)
+GEOCODE_CACHE_TTL = int(os.getenv('GEOCODE_CACHE_TTL', str(30 * 24 * 60 * 60)))
+GEOCODE_NEGATIVE_TTL = int(os.getenv('GEOCODE_NEGATIVE_TTL', str(10 * 60)))
+GEOCODE_LRU_SIZE = int(os.getenv('GEOCODE_LRU_SIZE', '2048'))
+GEOCODE_LRU_TTL = int(os.getenv('GEOCODE_LRU_TTL', str(5 * 60)))
+
+# Route cache and precomputed destination distance matrix (see travel/utils/routing.py, distance_matrix.py)
+ROUTE_CACHE_TTL = int(os.getenv('ROUTE_CACHE_TTL', str(7 * 24 * 60 * 60)))
+ROUTE_STALE_TTL = int(os.getenv('ROUTE_STALE_TTL', str(7 * 24 * 60 * 60)))  # Served while ORS is down
+ROUTE_GRID_PRECISION = int(os.getenv('ROUTE_GRID_PRECISION', '3'))  # Decimal places, ~100 m
+ROUTE_LRU_SIZE = int(os.getenv('ROUTE_LRU_SIZE', '256'))
+ROUTE_LRU_TTL = int(os.getenv('ROUTE_LRU_TTL', str(60 * 60)))
+DISTANCE_MATRIX_DIR = os.getenv('DISTANCE_MATRIX_DIR', os.path.join(BASE_DIR, 'var', 'matrices'))
+DISTANCE_MATRIX_BLOCK_SIZE = int(os.getenv('DISTANCE_MATRIX_BLOCK_SIZE', '50'))
+
+# Weather cache (see travel/utils/weather_utils.py); refreshed every 10 minutes by Celery beat
+WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
+WEATHER_API_URL = os.getenv('WEATHER_API_URL', 'http://api.openweathermap.org/data/2.5/weather')
+WEATHER_CACHE_TTL_MIN = int(os.getenv('WEATHER_CACHE_TTL_MIN', str(12 * 60)))
+WEATHER_CACHE_TTL_MAX = int(os.getenv('WEATHER_CACHE_TTL_MAX', str(15 * 60)))
+WEATHER_CONNECT_TIMEOUT = float(os.getenv('WEATHER_CONNECT_TIMEOUT', '3'))
+WEATHER_READ_TIMEOUT = float(os.getenv('WEATHER_READ_TIMEOUT', '5'))
+WEATHER_STALE_TTL = int(os.getenv('WEATHER_STALE_TTL', str(3 * 60 * 60)))  # Served while OpenWeatherMap is down
+
+# Catalog spatial index (see travel/utils/spatial_index.py)
+SPATIAL_GRID_DEGREES = float(os.getenv('SPATIAL_GRID_DEGREES', '0.1'))  # ~11 km cells
+NEARBY_MIN_LOCAL_RESULTS = int(os.getenv('NEARBY_MIN_LOCAL_RESULTS', '5'))  # Below this, also ask ORS
+
+# HTTP caching of catalog reads (see travel/views/mixins.py)
+CATALOG_CACHE_MAX_AGE = int(os.getenv('CATALOG_CACHE_MAX_AGE', '60'))
+CATALOG_CDN_MAX_AGE = int(os.getenv('CATALOG_CDN_MAX_AGE', '300'))
+CATALOG_STALE_WHILE_REVALIDATE = int(os.getenv('CATALOG_STALE_WHILE_REVALIDATE', '600'))
+CATALOG_RESPONSE_CACHE_TTL = int(os.getenv('CATALOG_RESPONSE_CACHE_TTL', str(15 * 60)))  # Server-side list cache
+
+# Search index (see travel/search/); workers replay changes from a shared log in the cache
+SEARCH_CHANGE_LOG_TTL = int(os.getenv('SEARCH_CHANGE_LOG_TTL', str(24 * 60 * 60)))
+SEARCH_MAX_REPLAY = int(os.getenv('SEARCH_MAX_REPLAY', '1000'))  # Rebuild instead when further behind
+SEARCH_FILTER_LIMIT = int(os.getenv('SEARCH_FILTER_LIMIT', '500'))  # Max matches for ?search= on list endpoints
+
+# Request metrics and profiling (see ai_driven_travel_platform/metrics.py, middleware.py)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Bearer token for /metrics scrapers; unset, it is staff-only
+METRICS_PUBLISH_INTERVAL = float(os.getenv('METRICS_PUBLISH_INTERVAL', '5'))  # Seconds between worker snapshots
+METRICS_WORKER_TTL = int(os.getenv('METRICS_WORKER_TTL', '300'))  # Snapshots of stopped workers expire
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.1'))  # Share of staff X-Profile requests profiled
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'var', 'profiles'))
+
+# Circuit breakers around upstream APIs (see ai_driven_travel_platform/circuit_breaker.py). A breaker
+# opens after failure_threshold failures within window seconds and fails fast for reset_timeout
+# seconds before letting one probe through; max_concurrency caps in-flight calls per worker process.
+CIRCUIT_BREAKER_DEFAULTS = {
+    'failure_threshold': int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5')),
+    'window': float(os.getenv('CIRCUIT_BREAKER_WINDOW', '30')),
+    'reset_timeout': float(os.getenv('CIRCUIT_BREAKER_RESET_TIMEOUT', '30')),
+}
+CIRCUIT_BREAKERS = {
+    'gemini': {},  # Already capped by GEMINI_MAX_CONCURRENCY
+    'ors': {'max_concurrency': int(os.getenv('ORS_MAX_CONCURRENCY', '8'))},
+    'openweathermap': {'max_concurrency': int(os.getenv('WEATHER_MAX_CONCURRENCY', '8'))},
+    'flightstats': {'max_concurrency': int(os.getenv('FLIGHTSTATS_MAX_CONCURRENCY', '4'))},
+}
+FLIGHTSTATS_TIMEOUT = float(os.getenv('FLIGHTSTATS_TIMEOUT', '10'))
+
+# Trip context aggregate (see travel/utils/trip_context.py). Parts are fetched in parallel and each
+# is left out of the response once its timeout, in seconds from the start of the fan-out, passes.
+TRIP_CONTEXT_TIMEOUTS = {
+    'weather': float(os.getenv('TRIP_CONTEXT_WEATHER_TIMEOUT', '2')),
+    'nearby': float(os.getenv('TRIP_CONTEXT_NEARBY_TIMEOUT', '3')),
+    'reviews': float(os.getenv('TRIP_CONTEXT_REVIEWS_TIMEOUT', '2')),
+    'guides': float(os.getenv('TRIP_CONTEXT_GUIDES_TIMEOUT', '2')),
+}
+TRIP_CONTEXT_MAX_WORKERS = int(os.getenv('TRIP_CONTEXT_MAX_WORKERS', '16'))  # Per process; each thread may hold a DB connection
+# Separate pool for weather/nearby, so a slow upstream cannot starve the database parts; parts beyond it are skipped
+TRIP_CONTEXT_UPSTREAM_MAX_WORKERS = int(os.getenv('TRIP_CONTEXT_UPSTREAM_MAX_WORKERS', '8'))
+TRIP_CONTEXT_CACHE_TTL = int(os.getenv('TRIP_CONTEXT_CACHE_TTL', str(5 * 60)))  # Destination, reviews and guides parts
+TRIP_CONTEXT_NEARBY_CACHE_TTL = int(os.getenv('TRIP_CONTEXT_NEARBY_CACHE_TTL', str(60 * 60)))
+TRIP_CONTEXT_NEARBY_RADIUS = int(os.getenv('TRIP_CONTEXT_NEARBY_RADIUS', '2000'))  # Meters
+TRIP_CONTEXT_NEARBY_LIMIT = int(os.getenv('TRIP_CONTEXT_NEARBY_LIMIT', '10'))
+TRIP_CONTEXT_REVIEWS_LIMIT = int(os.getenv('TRIP_CONTEXT_REVIEWS_LIMIT', '5'))
+TRIP_CONTEXT_GUIDES_LIMIT = int(os.getenv('TRIP_CONTEXT_GUIDES_LIMIT', '5'))
+
+# Offline map bundles are rebuilt once older than this (see travel/tasks.py)
+OFFLINE_BUNDLE_MAX_AGE = int(os.getenv('OFFLINE_BUNDLE_MAX_AGE', str(7 * 24 * 60 * 60)))
+# A rebuild not finished within this many seconds (lost or failed task) is queued again
+OFFLINE_BUNDLE_REBUILD_TIMEOUT = int(os.getenv('OFFLINE_BUNDLE_REBUILD_TIMEOUT', str(60 * 60)))
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+# Gemini client settings (shared pooled session, see ai_services/utils/gemini_client.py)
+GEMINI_API_BASE = os.getenv('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+GEMINI_CONNECT_TIMEOUT = float(os.getenv('GEMINI_CONNECT_TIMEOUT', '5'))
+GEMINI_READ_TIMEOUT = float(os.getenv('GEMINI_READ_TIMEOUT', '60'))
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', '3'))
+GEMINI_RETRY_BUDGET = float(os.getenv('GEMINI_RETRY_BUDGET', '90'))  # Seconds across all attempts
+GEMINI_BACKOFF_BASE = float(os.getenv('GEMINI_BACKOFF_BASE', '0.5'))
+GEMINI_BACKOFF_MAX = float(os.getenv('GEMINI_BACKOFF_MAX', '8'))
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))  # In-flight calls per worker process
+GEMINI_QUEUE_TIMEOUT = float(os.getenv('GEMINI_QUEUE_TIMEOUT', '10'))
+GEMINI_POOL_SIZE = int(os.getenv('GEMINI_POOL_SIZE', '10'))
+
+# Batch recommendation digests (see ai_services/utils/batch_recommendations.py). The rate limit is
+# Gemini calls per minute shared by all batch workers; interactive requests are not counted.
+GEMINI_BATCH_RATE_LIMIT = int(os.getenv('GEMINI_BATCH_RATE_LIMIT', '300'))
+GEMINI_BATCH_RATE_LIMIT_WAIT = float(os.getenv('GEMINI_BATCH_RATE_LIMIT_WAIT', '120'))
+RECOMMENDATION_BATCH_GROUPS_PER_TASK = int(os.getenv('RECOMMENDATION_BATCH_GROUPS_PER_TASK', '50'))
+RECOMMENDATION_BATCH_INSERT_SIZE = int(os.getenv('RECOMMENDATION_BATCH_INSERT_SIZE', '1000'))
+RECOMMENDATION_BATCH_TTL = int(os.getenv('RECOMMENDATION_BATCH_TTL', str(14 * 24 * 60 * 60)))  # Progress kept for resuming
+
+# Native async views for upstream-bound endpoints under ASGI (see ai_driven_travel_platform/asgi.py)
+ASGI_ASYNC_VIEWS = os.getenv('ASGI_ASYNC_VIEWS', 'true').lower() in ('1', 'true', 'yes')
+
+# Shared async HTTP client pools (see ai_driven_travel_platform/async_http.py)
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '200'))
+ASYNC_HTTP_MAX_KEEPALIVE = int(os.getenv('ASYNC_HTTP_MAX_KEEPALIVE', '50'))
+ASYNC_HTTP_TIMEOUT = float(os.getenv('ASYNC_HTTP_TIMEOUT', '30'))
+
+# LLM response cache TTLs in seconds, per logical endpoint (see ai_services/utils/llm_cache.py)
+LLM_CACHE_DEFAULT_TTL = int(os.getenv('LLM_CACHE_DEFAULT_TTL', str(60 * 60)))
+LLM_CACHE_TTLS = {
+    'recommendations': int(os.getenv('LLM_CACHE_TTL_RECOMMENDATIONS', str(6 * 60 * 60))),
+    'ai_recommendation': int(os.getenv('LLM_CACHE_TTL_AI_RECOMMENDATION', str(6 * 60 * 60))),
+    'travel_assistant': int(os.getenv('LLM_CACHE_TTL_TRAVEL_ASSISTANT', str(60 * 60))),
+}
+LLM_CACHE_STALE_TTL = int(os.getenv('LLM_CACHE_STALE_TTL', str(24 * 60 * 60)))  # Served while Gemini is down
 # Frontend URL
 FRONTEND_URL = 'http://localhost:3000'  # Replace with your actual frontend URL
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Settings for `manage.py benchmark`.
+
+Everything external is replaced by a local stand-in: a dedicated local
+MongoDB database, a per-process cache (or a local Redis), an in-memory
+Celery broker and a stub HTTP server, started by the command, playing
+Gemini, OpenRouteService and OpenWeatherMap.
+
+    DJANGO_SETTINGS_MODULE=ai_driven_travel_platform.settings_benchmark \\
+        python manage.py benchmark --seed 200 --output before.json
+"""
+import os
+from .settings import *  # noqa: F401,F403
+
+BENCHMARK_STUB_PORT = int(os.getenv('BENCHMARK_STUB_PORT', '8765'))
+BENCHMARK_STUB_URL = f"http://127.0.0.1:{BENCHMARK_STUB_PORT}"
+
+DEBUG = False  # DEBUG keeps every executed query in memory
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'djongo',
+        'NAME': os.getenv('BENCHMARK_DB_NAME', 'ai_travel_benchmark'),
+        'ENFORCE_SCHEMA': False,
+        'CLIENT': {
+            'host': os.getenv('BENCHMARK_MONGO_URL', 'mongodb://localhost:27017'),
+        }
+    }
+}
+
+if os.getenv('BENCHMARK_REDIS_URL'):
+    CACHES['default']['LOCATION'] = os.getenv('BENCHMARK_REDIS_URL')  # noqa: F405
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+GEMINI_API_KEY = 'benchmark'
+GEMINI_API_BASE = f"{BENCHMARK_STUB_URL}/v1beta"
+ORS_API_KEY = 'benchmark'
+ORS_BASE_URL = BENCHMARK_STUB_URL
+WEATHER_API_KEY = 'benchmark'
+WEATHER_API_URL = f"{BENCHMARK_STUB_URL}/data/2.5/weather"
+
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+METRICS_PUBLISH_INTERVAL = 60.0
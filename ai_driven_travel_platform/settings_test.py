@@ -0,0 +1,29 @@
+"""
+Settings for the test suite.
+
+The regression tests only need the ORM and the request stack, so the
+MongoDB database, Redis and Celery broker are replaced by in-process
+stand-ins and no upstream API is reachable.
+
+    DJANGO_SETTINGS_MODULE=ai_driven_travel_platform.settings_test python manage.py test
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+SECRET_KEY = 'test'
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+CELERY_TASK_ALWAYS_EAGER = False
+DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+GEMINI_API_KEY = 'test'
+ORS_API_KEY = 'test'
+WEATHER_API_KEY = 'test'
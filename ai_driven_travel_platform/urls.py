@@ -12,8 +12,13 @@ from travel.views.user_feedback_view import UserFeedbackViewSet
 from travel.views.travel_history_view import TravelHistoryViewSet
 from travel.views.itinerary_view import itinerary_list, itinerary_detail, share_itinerary
 from travel.views.profile_view import user_profile
-from travel.views.map_view import get_directions, download_map, nearby_attractions
-from ai_services.views import TravelPlanViewSet, AIRecommendationViewSet, TravelAssistantViewSet, UserPreferenceViewSet, generate_recommendations, fetch_weather, ai_chatbot
+from travel.views.search_view import search
+from travel.views.trip_context_view import trip_context
+from travel.views.cache_stats_view import cache_stats
+from travel.views.metrics_view import metrics
+from travel.views.catalog_io_view import import_catalog_view, export_catalog_view
+from travel.views.map_view import get_directions, download_map, download_map_status, nearby_attractions, destination_distance
+from ai_services.views import TravelPlanViewSet, AIRecommendationViewSet, TravelAssistantViewSet, UserPreferenceViewSet, generate_recommendations, recommendation_batches, recommendation_batch_status, fetch_weather, ai_chatbot, ai_chatbot_stream
 from users.views import UserRegistrationView, UserLoginView, UserLogoutView, PasswordResetView, ForgotPasswordView, VerifyResetCodeView, PasswordResetConfirmView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
@@ -34,6 +39,7 @@ router.register('user-preferences', UserPreferenceViewSet, basename='user-prefer
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('destinations/<int:pk>/context/', trip_context, name='destination-context'),
     path('', include(router.urls)),
     path('profile/', user_profile, name='user-profile'),
     path('itineraries/', itinerary_list, name='itinerary-list'),
@@ -49,8 +55,18 @@ urlpatterns = [
     path('auth/reset-password-confirm/', PasswordResetConfirmView.as_view(), name='reset-password-confirm'),
     path('map/directions/', get_directions, name='get-directions'),
     path('map/download/', download_map, name='download-map'),
+    path('map/download/<int:job_id>/', download_map_status, name='download-map-status'),
     path('map/nearby/', nearby_attractions, name='nearby-attractions'),
+    path('map/distance/', destination_distance, name='destination-distance'),
+    path('search/', search, name='search'),
+    path('cache/stats/', cache_stats, name='cache-stats'),
+    path('metrics', metrics, name='metrics'),
+    path('catalog/<str:kind>/import/', import_catalog_view, name='catalog-import'),
+    path('catalog/<str:kind>/export/', export_catalog_view, name='catalog-export'),
     path('weather/<str:location>/', fetch_weather, name='fetch-weather'),
     path('generate-recommendations/', generate_recommendations, name='generate-recommendations'),
+    path('recommendation-batches/', recommendation_batches, name='recommendation-batches'),
+    path('recommendation-batches/<str:batch_id>/', recommendation_batch_status, name='recommendation-batch-status'),
     path('ai-chatbot/', ai_chatbot, name='ai-chatbot'),
+    path('ai-chatbot/stream/', ai_chatbot_stream, name='ai-chatbot-stream'),
 ]
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Native async handlers for the Gemini-bound AI endpoints.
+
+Served under ASGI ahead of Django (see ai_driven_travel_platform/asgi.py)
+with the same paths and responses as the DRF views in views.py.
+"""
+import logging
+from ai_driven_travel_platform.async_views import AsyncResponse
+from .streaming import ChatbotStreamResponse
+from .utils.ai_utils import aget_gemini_recommendations, build_chatbot_prompt
+from .utils.gemini_client import get_gemini_client, GeminiError
+
+logger = logging.getLogger(__name__)
+
+
+def wants_event_stream(request):
+    """Streaming is requested with `?stream=true` or `Accept: text/event-stream`."""
+    if request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'text/event-stream' in request.headers.get('accept', '')
+
+
+async def ai_chatbot(request):
+    """Async `views.ai_chatbot`: JSON by default, Server-Sent Events when streaming is requested."""
+    try:
+        user_message = request.data.get('message', '')
+    except ValueError:
+        return AsyncResponse({'error': "Request body must be a JSON object"}, status=400)
+    logger.info(f"Received message from user: {user_message}")
+
+    if wants_event_stream(request):
+        return ChatbotStreamResponse(user_message)
+
+    try:
+        ai_response = await get_gemini_client().agenerate_content(build_chatbot_prompt(user_message))
+    except GeminiError as e:
+        logger.error(f"Error fetching AI response: {e}")
+        return AsyncResponse({'error': "Failed to fetch AI response"}, status=e.status_code or 502)
+    return AsyncResponse({'response': ai_response})
+
+
+async def generate_recommendations(request):
+    """Async `views.generate_recommendations`."""
+    try:
+        user_preferences = request.data
+    except ValueError:
+        user_preferences = None
+    if not isinstance(user_preferences, dict) or 'interests' not in user_preferences:
+        logger.error("Invalid input: 'interests' field is required")
+        return AsyncResponse({"error": "Invalid input: 'interests' field is required"}, status=400)
+
+    recommendations = await aget_gemini_recommendations(user_preferences)
+    if recommendations:
+        return AsyncResponse(recommendations)
+    logger.error("Failed to generate recommendations")
+    return AsyncResponse({"error": "Failed to generate recommendations"}, status=400)
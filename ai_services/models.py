@@ -4,12 +4,25 @@ from travel.models.destination import Destination  # Import the Destination mode
 from django.conf import settings
 
 class TravelPlan(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     destination = models.ForeignKey(Destination, on_delete=models.CASCADE)
     start_date = models.DateField()
     end_date = models.DateField()
     preferences = models.JSONField()  # Stores user preferences for the trip
-    generated_plan = models.JSONField()  # Stores the AI-generated travel plan
+    generated_plan = models.JSONField(default=dict)  # Stores the AI-generated travel plan
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    error_message = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
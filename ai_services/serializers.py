@@ -11,7 +11,7 @@ class TravelPlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = TravelPlan
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at', 'user')
+        read_only_fields = ('created_at', 'updated_at', 'user', 'status', 'error_message', 'generated_plan')
 
 class TravelPlanCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,148 @@
+import json
+import asyncio
+import logging
+import requests
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from ai_driven_travel_platform.async_views import encode_headers, read_body, send_json, wait_for_disconnect
+from .utils.ai_utils import build_chatbot_prompt
+from .utils.gemini_client import get_gemini_client, GeminiError
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',  # Stop nginx from buffering the stream
+}
+
+
+def sse_event(data, event=None):
+    """Format one Server-Sent Event carrying a JSON payload."""
+    message = f"data: {json.dumps(data)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF negotiate `Accept: text/event-stream`; plain responses become a single event."""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else None
+        return sse_event(data, event=event).encode(self.charset)
+
+
+def iter_chatbot_events(chunks):
+    """
+    Wrap Gemini text chunks as SSE `data` events followed by `done` or `error`.
+
+    Closing this generator (the client went away) closes `chunks`, freeing
+    the upstream connection and its concurrency slot.
+    """
+    try:
+        try:
+            for text in chunks:
+                yield sse_event({'text': text})
+        except (GeminiError, requests.RequestException) as e:
+            logger.error(f"AI chatbot stream interrupted: {e}")
+            yield sse_event({'error': "AI response interrupted"}, event='error')
+            return
+        yield sse_event({}, event='done')
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def chatbot_stream_response(user_message):
+    """
+    Open a Gemini stream for a chat message and return it as an SSE response.
+
+    Raises:
+        GeminiError: If the stream cannot be opened.
+    """
+    chunks = get_gemini_client().stream_generate_content(build_chatbot_prompt(user_message))
+    response = StreamingHttpResponse(iter_chatbot_events(chunks), content_type='text/event-stream')
+    for header, value in SSE_HEADERS.items():
+        response[header] = value
+    return response
+
+
+class ChatbotStreamResponse:
+    """
+    Relays a Gemini stream for a chat message as SSE from a native ASGI handler.
+
+    The stream is opened before the response starts, so a rejected request
+    still gets a JSON error status instead of an empty event stream. If the
+    client disconnects, the relay stops and the upstream stream is closed.
+    """
+
+    def __init__(self, user_message):
+        self.user_message = user_message
+
+    async def send(self, send, receive):
+        chunks = get_gemini_client().astream_generate_content(build_chatbot_prompt(self.user_message))
+        relay = asyncio.ensure_future(self.relay(chunks, send))
+        disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+        try:
+            await asyncio.wait({relay, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if relay.done():
+                relay.result()
+            else:
+                logger.info("AI chatbot client disconnected; closing the Gemini stream")
+        finally:
+            disconnect.cancel()
+            relay.cancel()
+            await asyncio.gather(relay, return_exceptions=True)  # The generator must be idle before aclose()
+            await chunks.aclose()
+
+    async def relay(self, chunks, send):
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except GeminiError as e:
+            logger.error(f"Error fetching AI response: {e}")
+            await send_json(send, e.status_code or 502, {'error': "Failed to fetch AI response"})
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': encode_headers({'Content-Type': 'text/event-stream', **SSE_HEADERS}),
+        })
+        if first is not None:
+            await send({'type': 'http.response.body', 'body': sse_event({'text': first}).encode(), 'more_body': True})
+            try:
+                async for text in chunks:
+                    await send({'type': 'http.response.body', 'body': sse_event({'text': text}).encode(), 'more_body': True})
+            except GeminiError as e:
+                logger.error(f"AI chatbot stream interrupted: {e}")
+                await send({
+                    'type': 'http.response.body',
+                    'body': sse_event({'error': "AI response interrupted"}, event='error').encode(),
+                })
+                return
+        await send({'type': 'http.response.body', 'body': sse_event({}, event='done').encode()})
+
+
+async def chatbot_stream_app(scope, receive, send):
+    """
+    Native ASGI handler for POST /ai-chatbot/stream/.
+
+    Mounted ahead of Django in `ai_driven_travel_platform/asgi.py` so the
+    Gemini stream is proxied chunk by chunk on the event loop without holding
+    a thread per connection. Expects a JSON body with a `message` field.
+    """
+    body = await read_body(receive)
+    if body is None:
+        return
+    try:
+        user_message = json.loads(body or b'{}').get('message', '')
+    except (ValueError, AttributeError):
+        await send_json(send, 400, {'error': "Request body must be a JSON object"})
+        return
+    await ChatbotStreamResponse(user_message).send(send, receive)
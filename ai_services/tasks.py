@@ -0,0 +1,117 @@
+import logging
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from .models import TravelPlan
+from .utils.ai_utils import build_travel_plan_prompt
+from .utils.batch_recommendations import (
+    default_batch_id, finish_if_complete, process_groups, record_failures, start_batch
+)
+from .utils.gemini_client import get_gemini_client, GeminiError, RETRYABLE_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+
+def _mark_plan(plan, status, **fields):
+    plan.status = status
+    for name, value in fields.items():
+        setattr(plan, name, value)
+    plan.save(update_fields=['status', 'updated_at', *fields])
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_travel_plan(self, plan_id):
+    """
+    Generate the itinerary for a pending TravelPlan and store it on the row.
+
+    Transient Gemini failures (timeouts, 429/5xx) are retried by Celery; the
+    plan is marked failed once retries run out or the soft time limit from
+    `CELERY_TASK_SOFT_TIME_LIMIT` is hit.
+
+    Args:
+        plan_id (int): Primary key of the TravelPlan to fill in.
+    """
+    try:
+        plan = TravelPlan.objects.select_related('destination').get(pk=plan_id)
+    except TravelPlan.DoesNotExist:
+        logger.warning(f"Travel plan {plan_id} no longer exists; skipping generation")
+        return
+
+    if plan.status == TravelPlan.STATUS_COMPLETED:
+        return
+
+    _mark_plan(plan, TravelPlan.STATUS_PROCESSING)
+    prompt = build_travel_plan_prompt(plan.destination, plan.start_date, plan.end_date, plan.preferences)
+
+    try:
+        generated_text = get_gemini_client().generate_content(prompt)
+    except GeminiError as e:
+        retryable = e.status_code is None or e.status_code in RETRYABLE_STATUS_CODES
+        if retryable and self.request.retries < self.max_retries:
+            logger.warning(f"Retrying travel plan {plan_id} after Gemini error: {e}")
+            _mark_plan(plan, TravelPlan.STATUS_PENDING)
+            raise self.retry(exc=e, countdown=self.default_retry_delay * (2 ** self.request.retries))
+        logger.error(f"Error generating travel plan {plan_id}: {e}")
+        _mark_plan(plan, TravelPlan.STATUS_FAILED, error_message=str(e))
+        return
+    except SoftTimeLimitExceeded:
+        logger.error(f"Travel plan {plan_id} generation exceeded the task time limit")
+        _mark_plan(plan, TravelPlan.STATUS_FAILED, error_message="Generation timed out")
+        return
+
+    _mark_plan(
+        plan,
+        TravelPlan.STATUS_COMPLETED,
+        generated_plan={'itinerary': generated_text, 'preferences': plan.preferences},
+        error_message='',
+    )
+    logger.info(f"Travel plan {plan_id} generated")
+
+
+@shared_task
+def start_recommendation_batch(batch_id=None):
+    """
+    Generate digest recommendations for every user with a UserPreference.
+
+    Users are grouped by normalized preference set and the groups are split
+    into `RECOMMENDATION_BATCH_GROUPS_PER_TASK` slices processed in parallel
+    by `generate_recommendation_groups`. Running the task again with the same
+    batch id (the ISO week by default) resumes an interrupted batch.
+
+    Args:
+        batch_id (str, optional): Batch name. Default: the current ISO week.
+
+    Returns:
+        str: The batch id, for polling progress.
+    """
+    batch_id = batch_id or default_batch_id()
+    pending = list(start_batch(batch_id).items())
+    size = settings.RECOMMENDATION_BATCH_GROUPS_PER_TASK
+    for start in range(0, len(pending), size):
+        generate_recommendation_groups.delay(batch_id, dict(pending[start:start + size]))
+    return batch_id
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def generate_recommendation_groups(self, batch_id, groups):
+    """
+    Generate and fan out recommendations for a slice of preference groups.
+
+    Failed groups (Gemini errors, the rate limit or an error writing their
+    rows) are retried with backoff, then counted as failed so the batch
+    still finishes. Groups already written are skipped, so retries never
+    duplicate work.
+
+    Args:
+        batch_id (str): Batch the groups belong to.
+        groups (dict): Group key -> {'interests', 'budget', 'user_ids'}.
+    """
+    failures = process_groups(batch_id, groups)
+    if failures and self.request.retries < self.max_retries:
+        logger.warning(f"Recommendation batch {batch_id}: retrying {len(failures)} failed groups")
+        raise self.retry(
+            args=(batch_id, {group_key: groups[group_key] for group_key in failures}),
+            countdown=self.default_retry_delay * (2 ** self.request.retries),
+        )
+    record_failures(batch_id, failures)
+    finish_if_complete(batch_id)
@@ -1,34 +1,35 @@
-import os
 import logging
-import requests
-from django.conf import settings
-from dotenv import load_dotenv
-
-load_dotenv()
+from .gemini_client import GeminiError
+from .llm_cache import acached_generate_content, cached_generate_content
 
 logger = logging.getLogger(__name__)
 
-# Load Gemini API key from environment or settings
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or settings.GEMINI_API_KEY
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
-
-def get_gemini_recommendations(user_preferences):
+def normalize_preferences(user_preferences):
     """
-    Generate travel recommendations for Ethiopia using Google's Gemini REST API.
-    
+    Reduce stored or submitted preferences to a canonical (interests, budget) pair.
+
+    Equivalent preference sets (different order, case or duplicates) normalize
+    to the same value, and so to the same prompt and cache entry.
+
     Args:
-        user_preferences (dict): Dictionary containing 'interests' and 'budget'.
-    
+        user_preferences (dict or list): {'interests': [...], 'budget': ...}, or a bare list of interests.
+
     Returns:
-        dict: Recommendations or None if generation fails.
+        tuple: (sorted tuple of interests, budget string)
     """
-    try:
-        interests = user_preferences.get('interests', [])
-        budget = user_preferences.get('budget', 'mid-range')
-        
-        logger.info(f"Generating recommendations for preferences: {user_preferences}")
-        
-        prompt = f"""Generate personalized travel recommendations for Ethiopia, the cradle of humanity, for a user with:
+    if isinstance(user_preferences, dict):
+        raw_interests = user_preferences.get('interests') or []
+        budget = user_preferences.get('budget')
+    else:
+        raw_interests, budget = user_preferences or [], None
+    if isinstance(raw_interests, str):
+        raw_interests = [raw_interests]
+    interests = tuple(sorted({str(interest).strip().lower() for interest in raw_interests} - {''}))
+    return interests, str(budget or 'mid-range').strip().lower()
+
+def build_recommendations_prompt(interests, budget):
+    """Build the Gemini prompt for Ethiopia recommendations from normalized preferences."""
+    return f"""Generate personalized travel recommendations for Ethiopia, the cradle of humanity, for a user with:
         - Interests: {', '.join(interests)}
         - Budget: {budget}
         
@@ -40,48 +41,87 @@ def get_gemini_recommendations(user_preferences):
         5. Recommend activities such as tours, dining options, and local experiences that match the user's preferences.
         
         Make the response engaging, vivid, and practical, capturing Ethiopia's soul—its ancient churches, diverse ethnic groups, and rugged beauty."""
+
+def get_gemini_recommendations(user_preferences):
+    """
+    Generate travel recommendations for Ethiopia using Google's Gemini REST API.
+    
+    Args:
+        user_preferences (dict): Dictionary containing 'interests' and 'budget'.
+    
+    Returns:
+        dict: Recommendations or None if generation fails.
+    """
+    try:
+        interests, budget = normalize_preferences(user_preferences)
         
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
+        logger.info(f"Generating recommendations for preferences: {user_preferences}")
         
-        headers = {
-            "Content-Type": "application/json"
+        recommendations_text = cached_generate_content(build_recommendations_prompt(interests, budget), 'recommendations')
+        recommendations = {
+            'recommendations': recommendations_text,
+            'based_on': {
+                'interests': list(interests),
+                'budget': budget
+            }
         }
-        
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        logger.info(f"Request to Gemini API: {response.request.body}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            logger.info(f"Response from Gemini API: {response_data}")
-            
-            # Correct parsing: Extract text from 'candidates' -> 'content' -> 'parts'
-            candidates = response_data.get('candidates', [])
-            if not candidates:
-                logger.error("No candidates in API response")
-                return None
-            recommendations_text = candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '').strip()
-            
-            if not recommendations_text:
-                logger.error("No text found in API response")
-                return None
-                
-            recommendations = {
-                'recommendations': recommendations_text,
-                'based_on': {
-                    'interests': interests,
-                    'budget': budget
-                }
+        logger.info(f"Generated recommendations: {recommendations}")
+        return recommendations
+
+    except GeminiError as e:
+        logger.error(f"Error fetching recommendations: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error generating recommendations: {str(e)}")
+        return None
+
+async def aget_gemini_recommendations(user_preferences):
+    """`get_gemini_recommendations` for async handlers; shares its cache entries."""
+    try:
+        interests, budget = normalize_preferences(user_preferences)
+        logger.info(f"Generating recommendations for preferences: {user_preferences}")
+        recommendations_text = await acached_generate_content(build_recommendations_prompt(interests, budget), 'recommendations')
+        return {
+            'recommendations': recommendations_text,
+            'based_on': {
+                'interests': list(interests),
+                'budget': budget
             }
-            logger.info(f"Generated recommendations: {recommendations}")
-            return recommendations
-        else:
-            logger.error(f"Error fetching recommendations: {response.status_code} - {response.text}")
-            return None
-    
+        }
+    except GeminiError as e:
+        logger.error(f"Error fetching recommendations: {e}")
+        return None
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+def build_travel_plan_prompt(destination, start_date, end_date, preferences):
+    """
+    Build the Gemini prompt for a multi-day travel plan.
+
+    Args:
+        destination (Destination): The destination being planned.
+        start_date (date): First day of the trip.
+        end_date (date): Last day of the trip.
+        preferences (dict): Trip preferences merged with the user's stored interests.
+
+    Returns:
+        str: Prompt text.
+    """
+    return f"""Create a detailed travel plan for {destination.name} with the following preferences:
+        - Duration: {start_date} to {end_date}
+        - Preferences: {preferences}
+        - Cultural considerations: {destination.cultural_notes}
+        - Safety information: {destination.safety_notes}
+        
+        Please include:
+        1. Daily itinerary
+        2. Recommended activities
+        3. Cultural experiences
+        4. Safety tips
+        5. Local customs to be aware of"""
+
+
+def build_chatbot_prompt(user_message):
+    """Build the Gemini prompt for a single chatbot turn."""
+    return f"""User: {user_message}\nAI:"""
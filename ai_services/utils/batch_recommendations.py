@@ -0,0 +1,219 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ai_driven_travel_platform.caching import make_cache_key
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded, TokenBucket
+from .ai_utils import build_recommendations_prompt, normalize_preferences
+from .gemini_client import GeminiError
+from .llm_cache import cached_generate_content
+
+logger = logging.getLogger(__name__)
+
+BATCH_KEY_PREFIX = 'recommendation-batch'
+BATCH_RECOMMENDATION_TYPE = 'destination'
+PROGRESS_COUNTERS = ('groups_done', 'groups_failed', 'users_done')
+
+_bucket = None
+
+
+def gemini_rate_limiter():
+    """Token bucket shared by every worker generating batch recommendations."""
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket('gemini:batch', settings.GEMINI_BATCH_RATE_LIMIT)
+    return _bucket
+
+
+def default_batch_id():
+    """Weekly digest batches are named by ISO week, so re-running within a week resumes."""
+    return timezone.now().strftime('%G-W%V')
+
+
+def _key(batch_id, *parts):
+    return ':'.join((BATCH_KEY_PREFIX, batch_id, *parts))
+
+
+def group_users_by_preferences():
+    """
+    Group every user with a UserPreference by normalized preference set.
+
+    Only each user's most recently updated preference row counts.
+
+    Returns:
+        dict: Group key -> {'interests', 'budget', 'user_ids'}.
+    """
+    from ai_services.models import UserPreference
+
+    groups, seen = {}, set()
+    rows = UserPreference.objects.order_by('-updated_at').values_list('user_id', 'interests')
+    for user_id, preferences in rows.iterator(chunk_size=2000):
+        if user_id in seen:
+            continue
+        seen.add(user_id)
+        interests, budget = normalize_preferences(preferences)
+        group_key = make_cache_key('prefs', interests, budget).rsplit(':', 1)[-1]
+        group = groups.setdefault(group_key, {'interests': list(interests), 'budget': budget, 'user_ids': []})
+        group['user_ids'].append(user_id)
+    return groups
+
+
+def start_batch(batch_id):
+    """
+    Record (or resume) a batch and return the groups that still need generating.
+
+    Progress counters survive between runs of the same batch id, and groups
+    already written are skipped, so re-running an interrupted batch only does
+    the remaining work.
+
+    Returns:
+        dict: Group key -> group, for unfinished groups only.
+    """
+    groups = group_users_by_preferences()
+    done = cache.get_many([_key(batch_id, 'group', group_key) for group_key in groups])
+    pending = {
+        group_key: group for group_key, group in groups.items()
+        if _key(batch_id, 'group', group_key) not in done
+    }
+
+    ttl = settings.RECOMMENDATION_BATCH_TTL
+    state = cache.get(_key(batch_id)) or {'batch_id': batch_id, 'started_at': timezone.now().isoformat()}
+    state.update(
+        status='running' if pending else 'completed',
+        total_groups=len(groups),
+        total_users=sum(len(group['user_ids']) for group in groups.values()),
+    )
+    if done:
+        state['resumed_at'] = timezone.now().isoformat()
+    cache.set(_key(batch_id), state, ttl)
+    for counter in PROGRESS_COUNTERS:
+        cache.add(_key(batch_id, counter), 0, ttl)
+    # Failures are retried on resume, so they are counted afresh
+    cache.set(_key(batch_id, 'groups_failed'), 0, ttl)
+    logger.info(
+        f"Recommendation batch {batch_id}: {len(groups)} preference groups for {state['total_users']} users, "
+        f"{len(pending)} pending"
+    )
+    return pending
+
+
+def get_batch_progress(batch_id):
+    """
+    Progress of a recommendation batch.
+
+    Returns:
+        dict or None: Batch state with done/failed counters, or None if unknown.
+    """
+    state = cache.get(_key(batch_id))
+    if state is None:
+        return None
+    counters = cache.get_many([_key(batch_id, counter) for counter in PROGRESS_COUNTERS])
+    for counter in PROGRESS_COUNTERS:
+        state[counter] = counters.get(_key(batch_id, counter), 0)
+    return state
+
+
+def _generate(group):
+    gemini_rate_limiter().acquire(timeout=settings.GEMINI_BATCH_RATE_LIMIT_WAIT)
+    prompt = build_recommendations_prompt(group['interests'], group['budget'])
+    return cached_generate_content(prompt, 'recommendations')
+
+
+def _fan_out(batch_id, started_at, group, text):
+    """Write one AIRecommendation per user in the group, skipping users already served by this batch."""
+    from ai_services.models import AIRecommendation
+
+    already_served = set(
+        AIRecommendation.objects.filter(
+            user_id__in=group['user_ids'],
+            recommendation_type=BATCH_RECOMMENDATION_TYPE,
+            created_at__gte=started_at,
+        ).values_list('user_id', flat=True)
+    )
+    recommendations = {
+        'recommendations': text,
+        'based_on': {'interests': group['interests'], 'budget': group['budget']},
+        'batch': batch_id,
+    }
+    rows = [
+        AIRecommendation(user_id=user_id, recommendation_type=BATCH_RECOMMENDATION_TYPE, recommendations=recommendations)
+        for user_id in group['user_ids'] if user_id not in already_served
+    ]
+    with transaction.atomic():
+        AIRecommendation.objects.bulk_create(rows, batch_size=settings.RECOMMENDATION_BATCH_INSERT_SIZE)
+    return len(rows)
+
+
+def process_groups(batch_id, groups):
+    """
+    Generate and store recommendations for a slice of preference groups.
+
+    One Gemini call is made per group, concurrently on a thread pool and
+    under the shared Gemini batch rate limit; the result is fanned out to
+    every user in the group with bulk_create. An error in one group, from
+    Gemini or from writing its rows, fails that group and the rest go on.
+
+    Args:
+        batch_id (str): Batch the groups belong to.
+        groups (dict): Group key -> group, as returned by start_batch().
+
+    Returns:
+        dict: Group key -> error, for groups that could not be generated or stored.
+    """
+    state = cache.get(_key(batch_id)) or {}
+    started_at = parse_datetime(state['started_at']) if state.get('started_at') else timezone.now()
+    ttl = settings.RECOMMENDATION_BATCH_TTL
+    done = cache.get_many([_key(batch_id, 'group', group_key) for group_key in groups])
+    groups = {
+        group_key: group for group_key, group in groups.items()
+        if _key(batch_id, 'group', group_key) not in done
+    }
+
+    failures = {}
+    with ThreadPoolExecutor(max_workers=settings.GEMINI_MAX_CONCURRENCY) as executor:
+        futures = {group_key: executor.submit(_generate, group) for group_key, group in groups.items()}
+        for group_key, future in futures.items():
+            try:
+                written = _fan_out(batch_id, started_at, groups[group_key], future.result())
+            except (GeminiError, RateLimitExceeded) as e:
+                failures[group_key] = e
+                continue
+            except Exception as e:
+                # Fail only this group: an aborted task would leave the batch "running" for good
+                logger.exception(f"Recommendation batch {batch_id}: group {group_key} raised {e!r}")
+                failures[group_key] = e
+                continue
+            cache.set(_key(batch_id, 'group', group_key), True, ttl)
+            cache.incr(_key(batch_id, 'groups_done'))
+            if written:
+                cache.incr(_key(batch_id, 'users_done'), written)
+    return failures
+
+
+def record_failures(batch_id, failures):
+    """Count groups that exhausted their retries; they are retried when the batch is resumed."""
+    for group_key, error in failures.items():
+        logger.error(f"Recommendation batch {batch_id}: group {group_key} failed: {error}")
+    if failures:
+        cache.incr(_key(batch_id, 'groups_failed'), len(failures))
+
+
+def finish_if_complete(batch_id):
+    """Mark the batch completed (or partially failed) once every group is accounted for."""
+    progress = get_batch_progress(batch_id)
+    if progress is None or progress['status'] != 'running':
+        return progress
+    if progress['groups_done'] + progress['groups_failed'] >= progress['total_groups']:
+        progress['status'] = 'completed' if not progress['groups_failed'] else 'partial'
+        progress['finished_at'] = timezone.now().isoformat()
+        cache.set(_key(batch_id), {
+            key: value for key, value in progress.items() if key not in PROGRESS_COUNTERS
+        }, settings.RECOMMENDATION_BATCH_TTL)
+        logger.info(
+            f"Recommendation batch {batch_id} {progress['status']}: {progress['users_done']} recommendations, "
+            f"{progress['groups_failed']} failed groups"
+        )
+    return progress
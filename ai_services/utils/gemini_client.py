@@ -0,0 +1,458 @@
+import os
+import json
+import asyncio
+import random
+import threading
+import time
+import logging
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from ai_driven_travel_platform.async_http import get_async_client
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen, get_breaker
+from ai_driven_travel_platform.metrics import track_upstream
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    """Raised when the Gemini API cannot produce a response."""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def is_gemini_failure(error):
+    """True for errors that mean Gemini is unhealthy (timeouts, 429/5xx), not a bad request."""
+    return isinstance(error, GeminiError) and error.status_code in RETRYABLE_STATUS_CODES
+
+
+def candidate_text(response_data):
+    """Return the raw text of the first candidate in a Gemini response or stream chunk."""
+    candidates = response_data.get('candidates') or [{}]
+    parts = candidates[0].get('content', {}).get('parts') or [{}]
+    return parts[0].get('text', '')
+
+
+def extract_text(response_data):
+    """
+    Extract the generated text from a Gemini `generateContent` response.
+
+    Args:
+        response_data (dict): Decoded JSON body returned by Gemini.
+
+    Returns:
+        str: The text of the first candidate, or an empty string.
+    """
+    return candidate_text(response_data).strip()
+
+
+def iter_sse_text(lines):
+    """
+    Yield text chunks from the lines of a `streamGenerateContent?alt=sse` body.
+
+    Args:
+        lines (iterable): Decoded lines of the SSE stream.
+
+    Yields:
+        str: Non-empty text fragments in generation order.
+    """
+    for line in lines:
+        if not line or not line.startswith('data:'):
+            continue
+        try:
+            chunk = json.loads(line[len('data:'):].strip())
+        except ValueError:
+            logger.warning(f"Skipping malformed Gemini stream line: {line[:200]}")
+            continue
+        text = candidate_text(chunk)
+        if text:
+            yield text
+
+
+class GeminiStream:
+    """
+    Iterator over the text chunks of an open Gemini stream.
+
+    Holds the HTTP response and a concurrency slot until it is exhausted or
+    closed; unlike a generator, closing it before the first chunk still
+    releases both.
+    """
+
+    def __init__(self, response, release):
+        self._response = response
+        self._chunks = iter_sse_text(response.iter_lines(decode_unicode=True))
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._release is not None:
+            release, self._release = self._release, None
+            try:
+                self._response.close()
+            finally:
+                release()
+
+
+class GeminiClient:
+    """
+    Thin client for the Gemini REST API shared by every AI code path.
+
+    Each worker process owns one keep-alive `requests.Session`, so repeated
+    calls reuse pooled TLS connections. Calls are bounded by connect/read
+    timeouts, retried with jittered exponential backoff on 429/5xx within a
+    total retry budget, and gated by a per-process concurrency limit. Every
+    attempt goes through the "gemini" circuit breaker; while it is open,
+    calls fail at once with a 503 GeminiError.
+    """
+
+    def __init__(self, api_key=None, model=None, api_base=None):
+        self.api_key = api_key or settings.GEMINI_API_KEY
+        self.model = model or settings.GEMINI_MODEL
+        self.api_base = (api_base or settings.GEMINI_API_BASE).rstrip('/')
+        self.timeout = (settings.GEMINI_CONNECT_TIMEOUT, settings.GEMINI_READ_TIMEOUT)
+        self.max_retries = settings.GEMINI_MAX_RETRIES
+        self.retry_budget = settings.GEMINI_RETRY_BUDGET
+        self.backoff_base = settings.GEMINI_BACKOFF_BASE
+        self.backoff_max = settings.GEMINI_BACKOFF_MAX
+        self.queue_timeout = settings.GEMINI_QUEUE_TIMEOUT
+        self._semaphore = threading.BoundedSemaphore(settings.GEMINI_MAX_CONCURRENCY)
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+        self._async_semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self):
+        """Return the pooled session, recreating it after a fork."""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=settings.GEMINI_POOL_SIZE,
+                        pool_maxsize=settings.GEMINI_POOL_SIZE,
+                    )
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({
+                        'Content-Type': 'application/json',
+                        'x-goog-api-key': self.api_key or '',
+                    })
+                    self._session = session
+                    self._session_pid = pid
+        return self._session
+
+    def endpoint(self, method, model=None):
+        return f"{self.api_base}/models/{model or self.model}:{method}"
+
+    def build_payload(self, prompt, generation_config=None):
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        return payload
+
+    def generate_content(self, prompt, generation_config=None, model=None):
+        """
+        Generate text for a single prompt.
+
+        Args:
+            prompt (str): Prompt text sent as the only user part.
+            generation_config (dict, optional): Gemini `generationConfig` options.
+            model (str, optional): Model override. Default: `settings.GEMINI_MODEL`.
+
+        Returns:
+            str: Generated text.
+
+        Raises:
+            GeminiError: If the call fails after retries or returns no text.
+        """
+        response = self.post(
+            self.endpoint('generateContent', model),
+            self.build_payload(prompt, generation_config),
+        )
+        text = extract_text(response.json())
+        if not text:
+            raise GeminiError("No text found in Gemini response")
+        return text
+
+    def stream_generate_content(self, prompt, generation_config=None, model=None):
+        """
+        Start a streaming generation and return an iterator over text chunks.
+
+        The request is made eagerly so connection and HTTP errors surface
+        before the caller commits to a streaming response. The concurrency
+        slot is held until the returned GeminiStream is exhausted or closed.
+
+        Raises:
+            GeminiError: If the stream cannot be opened.
+        """
+        self._acquire_slot()
+        try:
+            response = self._post_with_retries(
+                f"{self.endpoint('streamGenerateContent', model)}?alt=sse",
+                self.build_payload(prompt, generation_config),
+                stream=True,
+            )
+        except BaseException:
+            self._semaphore.release()
+            raise
+        response.encoding = 'utf-8'
+        return GeminiStream(response, self._semaphore.release)
+
+    async def astream_generate_content(self, prompt, generation_config=None, model=None):
+        """
+        Async counterpart of `stream_generate_content` for ASGI handlers.
+
+        Uses the event loop's shared httpx client and a per-loop concurrency
+        limit. The stream is opened with the sync client's retry policy before
+        the first chunk is yielded, so a GeminiError is raised on the first
+        iteration if Gemini rejects it. Closing the generator (`aclose()`)
+        closes the upstream response.
+
+        Yields:
+            str: Text fragments in generation order.
+        """
+        try:
+            await get_breaker('gemini').acheck()
+        except CircuitOpen as e:
+            raise GeminiError(f"Gemini unavailable: {e}", status_code=503) from e
+        semaphore = self._async_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise GeminiError("Too many concurrent Gemini requests", status_code=503)
+        try:
+            url = f"{self.endpoint('streamGenerateContent', model)}?alt=sse"
+            payload = self.build_payload(prompt, generation_config)
+            response = await self._awith_retries(lambda: self._aopen_stream(url, payload))
+            try:
+                async for line in response.aiter_lines():
+                    for text in iter_sse_text((line,)):
+                        yield text
+            except httpx.HTTPError as e:
+                raise GeminiError(f"Gemini stream interrupted: {e}", status_code=504)
+            finally:
+                await response.aclose()
+        finally:
+            semaphore.release()
+
+    async def agenerate_content(self, prompt, generation_config=None, model=None):
+        """
+        Async counterpart of `generate_content` on the event loop's shared httpx client.
+
+        Same per-loop concurrency limit as `astream_generate_content` and the
+        same retry policy and circuit breaker as the sync client.
+
+        Raises:
+            GeminiError: If the call fails after retries or returns no text.
+        """
+        try:
+            await get_breaker('gemini').acheck()
+        except CircuitOpen as e:
+            raise GeminiError(f"Gemini unavailable: {e}", status_code=503) from e
+        semaphore = self._async_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise GeminiError("Too many concurrent Gemini requests", status_code=503)
+        try:
+            data = await self._apost_with_retries(
+                self.endpoint('generateContent', model),
+                self.build_payload(prompt, generation_config),
+            )
+        finally:
+            semaphore.release()
+        text = extract_text(data)
+        if not text:
+            raise GeminiError("No text found in Gemini response")
+        return text
+
+    async def _apost_with_retries(self, url, payload):
+        return await self._awith_retries(lambda: self._aattempt(url, payload))
+
+    async def _awith_retries(self, attempt_call):
+        """Await `attempt_call()` under the circuit breaker, retrying like `_post_with_retries`."""
+        deadline = time.monotonic() + self.retry_budget
+        attempt = 0
+        while True:
+            try:
+                async with get_breaker('gemini').aguard(is_gemini_failure):
+                    return await attempt_call()
+            except CircuitOpen as e:
+                raise GeminiError(f"Gemini unavailable: {e}", status_code=503) from e
+            except GeminiError as e:
+                error = e
+
+            delay = self._retry_delay(error, attempt, deadline)
+            if delay is None:
+                raise error
+            attempt += 1
+            logger.warning(f"{error}; retrying in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def _aattempt(self, url, payload):
+        """One async POST; returns the decoded JSON body or raises GeminiError."""
+        try:
+            with track_upstream('gemini'):
+                response = await get_async_client().post(
+                    url, json=payload,
+                    headers={'x-goog-api-key': self.api_key or ''},
+                    timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                )
+        except httpx.HTTPError as e:
+            raise GeminiError(f"Gemini request failed: {e}", status_code=504)
+        if response.status_code >= 400:
+            raise GeminiError(
+                f"Gemini API error: {response.status_code} - {response.text[:500]}",
+                status_code=response.status_code,
+                retry_after=response.headers.get('Retry-After'),
+            )
+        return response.json()
+
+    async def _aopen_stream(self, url, payload):
+        """One streaming POST; returns the open httpx response or raises GeminiError."""
+        client = get_async_client()
+        request = client.build_request(
+            'POST', url, json=payload,
+            headers={'x-goog-api-key': self.api_key or ''},
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+        )
+        try:
+            with track_upstream('gemini'):
+                response = await client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            raise GeminiError(f"Gemini request failed: {e}", status_code=504)
+        if response.status_code < 400:
+            return response
+        try:
+            body = (await response.aread()).decode('utf-8', 'replace')
+        except httpx.HTTPError:
+            body = ''
+        finally:
+            await response.aclose()
+        raise GeminiError(
+            f"Gemini API error: {response.status_code} - {body[:500]}",
+            status_code=response.status_code,
+            retry_after=response.headers.get('Retry-After'),
+        )
+
+    def _async_semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    def post(self, url, payload, stream=False):
+        """
+        POST to Gemini under the concurrency limit with bounded retries.
+
+        Returns:
+            requests.Response: A successful (2xx) response.
+
+        Raises:
+            GeminiError: On a non-retryable error, once retries are exhausted,
+                or at once (503) while the circuit is open.
+        """
+        self._acquire_slot()
+        try:
+            return self._post_with_retries(url, payload, stream)
+        finally:
+            self._semaphore.release()
+
+    def _acquire_slot(self):
+        """Take a concurrency slot, failing fast while the circuit is open or the queue times out."""
+        try:
+            get_breaker('gemini').check()  # Fail fast instead of queueing for a slot
+        except CircuitOpen as e:
+            raise GeminiError(f"Gemini unavailable: {e}", status_code=503) from e
+        if not self._semaphore.acquire(timeout=self.queue_timeout):
+            raise GeminiError("Too many concurrent Gemini requests", status_code=503)
+
+    def _post_with_retries(self, url, payload, stream):
+        deadline = time.monotonic() + self.retry_budget
+        attempt = 0
+        while True:
+            try:
+                with get_breaker('gemini').guard(is_gemini_failure):
+                    response = self._attempt(url, payload, stream)
+            except CircuitOpen as e:
+                raise GeminiError(f"Gemini unavailable: {e}", status_code=503) from e
+            except GeminiError as e:
+                error = e
+            else:
+                return response
+
+            delay = self._retry_delay(error, attempt, deadline)
+            if delay is None:
+                raise error
+            attempt += 1
+            logger.warning(f"{error}; retrying in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _attempt(self, url, payload, stream):
+        """One POST; raises GeminiError (with any Retry-After) unless the response is 2xx."""
+        try:
+            with track_upstream('gemini'):
+                response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise GeminiError(f"Gemini request failed: {e}", status_code=504)
+        if response.status_code < 400:
+            return response
+        error = GeminiError(
+            f"Gemini API error: {response.status_code} - {response.text[:500]}",
+            status_code=response.status_code,
+            retry_after=response.headers.get('Retry-After'),
+        )
+        response.close()
+        raise error
+
+    def _retry_delay(self, error, attempt, deadline):
+        """Seconds to wait before retrying after `error`, or None when it should be raised."""
+        if error.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+            return None
+        delay = self._backoff(attempt, error.retry_after)
+        if time.monotonic() + delay > deadline:
+            return None
+        return delay
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring a numeric Retry-After."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client():
+    """Return the process-wide GeminiClient instance."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient()
+    return _client
@@ -0,0 +1,76 @@
+import re
+import logging
+from django.conf import settings
+from ai_driven_travel_platform.caching import make_cache_key, aget_or_set_single_flight, get_or_set_single_flight, get_cache_stats
+from .gemini_client import get_gemini_client
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so indentation changes do not split cache entries."""
+    return _WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+def llm_cache_key(prompt, model, generation_config=None):
+    """Cache key for a prompt, model name and generation parameters."""
+    return make_cache_key('llm', normalize_prompt(prompt), model, generation_config or {})
+
+
+def cached_generate_content(prompt, endpoint, generation_config=None, model=None):
+    """
+    Generate text through the shared Gemini client, served from cache when possible.
+
+    Identical prompts (after whitespace normalization) for the same model and
+    generation parameters share one cached response. Concurrent misses for
+    the same key are coalesced into a single Gemini call, and an expired
+    response is served for up to `LLM_CACHE_STALE_TTL` if Gemini fails.
+
+    Args:
+        prompt (str): Prompt text.
+        endpoint (str): Logical endpoint name used to pick the TTL from
+            `settings.LLM_CACHE_TTLS` and to scope hit/miss counters.
+        generation_config (dict, optional): Gemini `generationConfig` options.
+        model (str, optional): Model override.
+
+    Returns:
+        str: Generated text.
+
+    Raises:
+        GeminiError: If the response is not cached and generation fails.
+    """
+    client = get_gemini_client()
+    model = model or client.model
+    ttl = settings.LLM_CACHE_TTLS.get(endpoint, settings.LLM_CACHE_DEFAULT_TTL)
+    return get_or_set_single_flight(
+        llm_cache_key(prompt, model, generation_config),
+        lambda: client.generate_content(prompt, generation_config=generation_config, model=model),
+        ttl,
+        stats_namespace=f"llm:{endpoint}",
+        lock_timeout=int(settings.GEMINI_READ_TIMEOUT) + 5,
+        wait_timeout=settings.GEMINI_READ_TIMEOUT,
+        stale_ttl=settings.LLM_CACHE_STALE_TTL,
+    )
+
+
+async def acached_generate_content(prompt, endpoint, generation_config=None, model=None):
+    """`cached_generate_content` for async handlers; shares its cache entries."""
+    client = get_gemini_client()
+    model = model or client.model
+    ttl = settings.LLM_CACHE_TTLS.get(endpoint, settings.LLM_CACHE_DEFAULT_TTL)
+    return await aget_or_set_single_flight(
+        llm_cache_key(prompt, model, generation_config),
+        lambda: client.agenerate_content(prompt, generation_config=generation_config, model=model),
+        ttl,
+        stats_namespace=f"llm:{endpoint}",
+        lock_timeout=int(settings.GEMINI_READ_TIMEOUT) + 5,
+        wait_timeout=settings.GEMINI_READ_TIMEOUT,
+        stale_ttl=settings.LLM_CACHE_STALE_TTL,
+    )
+
+
+def get_llm_cache_stats():
+    """Return hit/miss counters for every configured LLM cache endpoint."""
+    return {endpoint: get_cache_stats(f"llm:{endpoint}") for endpoint in settings.LLM_CACHE_TTLS}
@@ -1,35 +1,31 @@
 import os
 import requests
 import logging
+from django.conf import settings
+from ai_driven_travel_platform.circuit_breaker import get_breaker
+from ai_driven_travel_platform.metrics import track_upstream
+from travel.utils.weather_utils import get_weather_info
 
 logger = logging.getLogger(__name__)
 
-WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 AIRPORT_API_KEY = os.getenv('AIRPORT_API_KEY')
 
 def get_weather_updates(location):
     """
     Get real-time weather updates for a location.
     
+    Uses the shared, cached weather service in travel.utils.weather_utils.
+    
     Args:
         location (str): The location for which to get weather updates.
     
     Returns:
         dict: Weather updates.
+
+    Raises:
+        WeatherUnavailable: If the weather service is down and nothing is cached.
     """
-    try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={WEATHER_API_KEY}&units=metric"
-        response = requests.get(url)
-        if response.status_code == 200:
-            weather_data = response.json()
-            logger.info(f"Weather data for {location}: {weather_data}")
-            return weather_data
-        else:
-            logger.error(f"Error fetching weather data: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        logger.error(f"Error fetching weather data: {str(e)}")
-        return None
+    return get_weather_info(location)
 
 def get_airport_schedule(airport_code):
     """
@@ -47,7 +43,10 @@ def get_airport_schedule(airport_code):
             "appId": os.getenv('FLIGHTSTATS_APP_ID'),
             "appKey": AIRPORT_API_KEY
         }
-        response = requests.get(url, headers=headers)
+        with get_breaker('flightstats').guard(), track_upstream('flightstats'):
+            response = requests.get(url, headers=headers, timeout=settings.FLIGHTSTATS_TIMEOUT)
+            if response.status_code >= 500:
+                response.raise_for_status()
         if response.status_code == 200:
             schedule_data = response.json()
             logger.info(f"Airport schedule data for {airport_code}: {schedule_data}")
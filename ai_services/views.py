@@ -1,9 +1,10 @@
-import os
-import requests
+import json
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
-from django.conf import settings
+from rest_framework.settings import api_settings
+from django.db import transaction
+from django.urls import reverse
 from .models import TravelPlan, AIRecommendation, TravelAssistant, UserPreference
 from ai_services.serializers import (
     TravelPlanSerializer, TravelPlanCreateSerializer,
@@ -11,8 +12,13 @@ from ai_services.serializers import (
     TravelAssistantSerializer, TravelAssistantCreateSerializer,
     UserPreferenceSerializer
 )
-from travel.utils.weather_utils import get_weather_info
-from .utils.ai_utils import get_gemini_recommendations
+from travel.utils.weather_utils import WeatherUnavailable, essential_weather, weather_unavailable_response
+from .utils.ai_utils import get_gemini_recommendations, build_chatbot_prompt
+from .utils.gemini_client import get_gemini_client, GeminiError
+from .utils.llm_cache import cached_generate_content
+from .tasks import generate_travel_plan, start_recommendation_batch
+from .utils.batch_recommendations import default_batch_id, get_batch_progress
+from .streaming import EventStreamRenderer, chatbot_stream_response
 from .utils.real_time_updates import get_weather_updates, get_airport_schedule
 import logging
 
@@ -24,10 +30,6 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
-# Load Gemini API configuration
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or settings.GEMINI_API_KEY
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
-
 class TravelPlanViewSet(viewsets.ModelViewSet):
     serializer_class = TravelPlanSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -40,39 +42,36 @@ class TravelPlanViewSet(viewsets.ModelViewSet):
             return TravelPlanCreateSerializer
         return self.serializer_class
 
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        data = TravelPlanSerializer(serializer.instance, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
     def perform_create(self, serializer):
         preferences = serializer.validated_data['preferences']
-        destination = serializer.validated_data['destination']
         
         user_preferences = UserPreference.objects.filter(user=self.request.user).first()
         if user_preferences:
             preferences.update(user_preferences.interests)
         
-        prompt = f"""Create a detailed travel plan for {destination.name} with the following preferences:
-        - Duration: {serializer.validated_data['start_date']} to {serializer.validated_data['end_date']}
-        - Preferences: {preferences}
-        - Cultural considerations: {destination.cultural_notes}
-        - Safety information: {destination.safety_notes}
-        
-        Please include:
-        1. Daily itinerary
-        2. Recommended activities
-        3. Cultural experiences
-        4. Safety tips
-        5. Local customs to be aware of"""
-        
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            generated_text = response_data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-            generated_plan = {'itinerary': generated_text, 'preferences': preferences}
-            serializer.save(user=self.request.user, generated_plan=generated_plan)
-        else:
-            logger.error(f"Error generating travel plan: {response.status_code} - {response.text}")
-            raise Exception("Failed to generate travel plan")
+        plan = serializer.save(user=self.request.user, preferences=preferences, status=TravelPlan.STATUS_PENDING)
+        transaction.on_commit(lambda: generate_travel_plan.delay(plan.id))
+
+    @action(detail=True, methods=['get'], url_path='status')
+    def plan_status(self, request, pk=None):
+        plan = self.get_object()
+        data = {
+            'id': plan.id,
+            'status': plan.status,
+            'updated_at': plan.updated_at,
+        }
+        if plan.status == TravelPlan.STATUS_COMPLETED:
+            data['generated_plan'] = plan.generated_plan
+        elif plan.status == TravelPlan.STATUS_FAILED:
+            data['error'] = plan.error_message
+        return Response(data)
 
 class AIRecommendationViewSet(viewsets.ModelViewSet):
     serializer_class = AIRecommendationSerializer
@@ -92,7 +91,7 @@ class AIRecommendationViewSet(viewsets.ModelViewSet):
         user_preferences = UserPreference.objects.filter(user=self.request.user).first()
         preferences = user_preferences.interests if user_preferences else {}
         
-        prompt = f"""Based on the user's preferences: {preferences}
+        prompt = f"""Based on the user's preferences: {json.dumps(preferences, sort_keys=True)}
         Provide personalized {recommendation_type} recommendations for Ethiopia.
         Include:
         1. Top recommendations
@@ -100,18 +99,13 @@ class AIRecommendationViewSet(viewsets.ModelViewSet):
         3. Cultural context
         4. Safety considerations"""
         
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            recommendations_text = response_data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-            recommendations = {'type': recommendation_type, 'recommendations': recommendations_text}
-            serializer.save(user=self.request.user, recommendations=recommendations)
-        else:
-            logger.error(f"Error generating recommendations: {response.status_code} - {response.text}")
-            raise Exception("Failed to generate recommendations")
+        try:
+            recommendations_text = cached_generate_content(prompt, 'ai_recommendation')
+        except GeminiError as e:
+            logger.error(f"Error generating recommendations: {e}")
+            raise Exception("Failed to generate recommendations") from e
+        recommendations = {'type': recommendation_type, 'recommendations': recommendations_text}
+        serializer.save(user=self.request.user, recommendations=recommendations)
 
 class TravelAssistantViewSet(viewsets.ModelViewSet):
     serializer_class = TravelAssistantSerializer
@@ -135,17 +129,12 @@ class TravelAssistantViewSet(viewsets.ModelViewSet):
         3. Safety considerations
         4. Practical tips"""
         
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            response_text = response_data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-            serializer.save(user=self.request.user, response=response_text)
-        else:
-            logger.error(f"Error generating assistant response: {response.status_code} - {response.text}")
-            raise Exception("Failed to generate assistant response")
+        try:
+            response_text = cached_generate_content(prompt, 'travel_assistant')
+        except GeminiError as e:
+            logger.error(f"Error generating assistant response: {e}")
+            raise Exception("Failed to generate assistant response") from e
+        serializer.save(user=self.request.user, response=response_text)
 
 class UserPreferenceViewSet(viewsets.ModelViewSet):
     serializer_class = UserPreferenceSerializer
@@ -195,19 +184,50 @@ def generate_recommendations(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def recommendation_batches(request):
+    """
+    Start or resume a batch of recommendation digests for all users (admin only).
+
+    Request Body:
+        - batch_id (str, optional): Batch to start or resume. Default: the current ISO week.
+
+    Returns:
+        - batch_id (str): Batch name.
+        - status_url (str): URL to poll for progress.
+    """
+    batch_id = str(request.data.get('batch_id') or default_batch_id())
+    start_recommendation_batch.delay(batch_id)
+    return Response({
+        "batch_id": batch_id,
+        "status_url": reverse('recommendation-batch-status', args=[batch_id]),
+    }, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def recommendation_batch_status(request, batch_id):
+    """
+    Progress of a recommendation batch (admin only).
+
+    Returns:
+        - status (str): "running", "completed" or "partial" (some groups failed; resume to retry them).
+        - total_groups (int), total_users (int): Distinct preference sets and users in the batch.
+        - groups_done (int), groups_failed (int), users_done (int): Progress counters.
+    """
+    progress = get_batch_progress(batch_id)
+    if progress is None:
+        return Response({"error": "Unknown batch"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(progress, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 def fetch_weather(request, location):
-    weather_data = get_weather_updates(location)
+    try:
+        weather_data = get_weather_updates(location)
+    except WeatherUnavailable as e:
+        return weather_unavailable_response(e)
     if weather_data:
-        essential_data = {
-            "location": weather_data.get("name"),
-            "temperature": weather_data["main"].get("temp"),
-            "description": weather_data["weather"][0].get("description"),
-            "humidity": weather_data["main"].get("humidity"),
-            "wind_speed": weather_data["wind"].get("speed"),
-            "country": weather_data["sys"].get("country"),
-        }
-        return Response(essential_data, status=status.HTTP_200_OK)
+        return Response(essential_weather(weather_data), status=status.HTTP_200_OK)
     else:
         return Response({"error": "Failed to fetch weather data"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -219,28 +239,58 @@ def fetch_airport_schedule(request, airport_code):
     else:
         return Response({"error": "Failed to fetch airport schedule data"}, status=status.HTTP_400_BAD_REQUEST)
 
+def wants_event_stream(request):
+    """Streaming is requested with `?stream=true` or `Accept: text/event-stream`."""
+    if request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'text/event-stream' in request.META.get('HTTP_ACCEPT', '')
+
 @api_view(['POST'])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [EventStreamRenderer])
 def ai_chatbot(request):
+    """
+    Chat with the AI travel assistant.
+
+    Returns `{"response": ...}` as JSON by default. When streaming is requested
+    (see `wants_event_stream`) the Gemini output is relayed as Server-Sent
+    Events: `data: {"text": ...}` chunks followed by an `event: done` message.
+    """
     try:
         user_message = request.data.get('message', '')
         logger.info(f"Received message from user: {user_message}")
+
+        if wants_event_stream(request):
+            try:
+                return chatbot_stream_response(user_message)
+            except GeminiError as e:
+                logger.error(f"Error opening AI response stream: {e}")
+                return Response({'error': "Failed to fetch AI response"}, status=e.status_code or status.HTTP_502_BAD_GATEWAY)
         
-        prompt = f"""User: {user_message}\nAI:"""
-        
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        logger.info(f"Request to Gemini API: {response.request.body}")
+        prompt = build_chatbot_prompt(user_message)
         
-        if response.status_code == 200:
-            response_data = response.json()
-            logger.info(f"Full response from Gemini API: {response_data}")
-            ai_response = response_data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '').strip()
-            logger.info(f"AI response: {ai_response}")
-            return Response({'response': ai_response}, status=status.HTTP_200_OK)
-        else:
-            logger.error(f"Error fetching AI response: {response.status_code} - {response.text}")
-            return Response({'error': "Failed to fetch AI response"}, status=response.status_code)
+        try:
+            ai_response = get_gemini_client().generate_content(prompt)
+        except GeminiError as e:
+            logger.error(f"Error fetching AI response: {e}")
+            return Response({'error': "Failed to fetch AI response"}, status=e.status_code or status.HTTP_502_BAD_GATEWAY)
+        logger.info(f"AI response: {ai_response}")
+        return Response({'response': ai_response}, status=status.HTTP_200_OK)
     except Exception as e:
         logger.error(f"Error in AI chatbot: {str(e)}")
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [EventStreamRenderer])
+def ai_chatbot_stream(request):
+    """
+    Always-streaming variant of `ai_chatbot` for WSGI deployments.
+
+    Under ASGI this path is served by `ai_services.streaming.chatbot_stream_app`
+    before the request reaches Django.
+    """
+    user_message = request.data.get('message', '')
+    try:
+        return chatbot_stream_response(user_message)
+    except GeminiError as e:
+        logger.error(f"Error opening AI response stream: {e}")
+        return Response({'error': "Failed to fetch AI response"}, status=e.status_code or status.HTTP_502_BAD_GATEWAY)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TravelConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'travel'
+
+    def ready(self):
+        # Keep denormalized review aggregates in sync
+        from travel import signals  # noqa: F401
@@ -0,0 +1,81 @@
+import json
+import subprocess
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from ai_driven_travel_platform.benchmark import SCENARIOS, run_scenario, seed_data, start_stub_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API hot paths against stub upstreams and report latency percentiles, "
+        "throughput and queries per request as JSON. Run with "
+        "DJANGO_SETTINGS_MODULE=ai_driven_travel_platform.settings_benchmark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help="Repeatable. Default: all.")
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per scenario.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent client threads.")
+        parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per scenario (fill caches).")
+        parser.add_argument('--upstream-latency-ms', type=float, default=50.0, help="Delay of every stubbed upstream call.")
+        parser.add_argument('--seed', type=int, default=0, help="Ensure this many benchmark destinations exist.")
+        parser.add_argument('--migrate', action='store_true', help="Apply migrations to the benchmark database first.")
+        parser.add_argument('--output', help="Also write the JSON report to this file.")
+        parser.add_argument(
+            '--max-error-rate', type=float, default=0.1,
+            help="Fail when more than this fraction of a scenario's responses are >= 400 (its latencies are not meaningful).",
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(settings, 'BENCHMARK_STUB_PORT'):
+            raise CommandError(
+                "Refusing to run against the regular settings; "
+                "use DJANGO_SETTINGS_MODULE=ai_driven_travel_platform.settings_benchmark."
+            )
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        if options['migrate']:
+            call_command('migrate', verbosity=0)
+        user = seed_data(options['seed'])
+        server = start_stub_server(settings.BENCHMARK_STUB_PORT, options['upstream_latency_ms'] / 1000)
+        try:
+            results = {}
+            for name in options['scenario'] or SCENARIOS:
+                self.stderr.write(f"Running {name}...")
+                results[name] = run_scenario(
+                    name, options['requests'], options['concurrency'], user=user, warmup=options['warmup'],
+                )
+        finally:
+            server.shutdown()
+
+        report = {
+            'revision': self._git_revision(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'upstream_latency_ms': options['upstream_latency_ms'],
+            'scenarios': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+        failing = {
+            name: result['status_codes'] for name, result in results.items()
+            if result['error_rate'] > options['max_error_rate']
+        }
+        if failing:
+            details = '; '.join(f"{name}: {codes}" for name, codes in failing.items())
+            raise CommandError(f"Error rate above --max-error-rate, so these latencies measure failures: {details}")
+
+    @staticmethod
+    def _git_revision():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
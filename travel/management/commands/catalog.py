@@ -0,0 +1,54 @@
+import sys
+import json
+from django.core.management.base import BaseCommand, CommandError
+from travel.utils.catalog_io import CATALOG_KINDS, FORMATS, export_catalog, import_catalog, iter_records
+
+
+class Command(BaseCommand):
+    help = "Bulk import or export the destination and business catalog as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('import', 'export'))
+        parser.add_argument('kind', choices=CATALOG_KINDS)
+        parser.add_argument('path', nargs='?', help="File to import, or to export to (default: stdin/stdout).")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension, else ndjson.")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Rows validated and written per batch.")
+        parser.add_argument('--dry-run', action='store_true', help="With import, validate and match rows without writing.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path and path.lower().endswith('.csv') else 'ndjson')
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        if options['action'] == 'export':
+            output = open(path, 'w', newline='', encoding='utf-8') if path else sys.stdout
+            try:
+                output.writelines(export_catalog(options['kind'], fmt, chunk_size=options['chunk_size']))
+            finally:
+                if path:
+                    output.close()
+            if path:
+                self.stdout.write(self.style.SUCCESS(f"Exported {options['kind']} to {path}."))
+            return
+
+        try:
+            stream = open(path, newline='', encoding='utf-8') if path else sys.stdin
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+        try:
+            summary = import_catalog(
+                options['kind'], iter_records(stream, fmt),
+                chunk_size=options['chunk_size'], dry_run=options['dry_run'],
+            )
+        finally:
+            if path:
+                stream.close()
+
+        for error in summary['errors']:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {json.dumps(error['errors'])}"))
+        prefix = "Dry run: would have" if options['dry_run'] else "Imported:"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} created {summary['created']}, updated {summary['updated']}, "
+            f"skipped {summary['invalid']} invalid row(s)."
+        ))
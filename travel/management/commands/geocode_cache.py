@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from travel.utils.ors_client import build_ors_client
+from travel.utils.geocoding import warm_geocode_cache, invalidate_geocode
+
+
+class Command(BaseCommand):
+    help = "Warm or invalidate the geocoding cache and local gazetteer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warm', action='store_true', help="Seed the gazetteer and cache from destinations and businesses.")
+        parser.add_argument('--offline', action='store_true', help="With --warm, do not call OpenRouteService for unknown places.")
+        parser.add_argument('--invalidate', nargs='+', metavar='PLACE', help="Drop cached coordinates for these place names.")
+        parser.add_argument('--clear', action='store_true', help="Drop every cached geocode.")
+        parser.add_argument('--delete-gazetteer', action='store_true', help="With --invalidate/--clear, also delete seeded gazetteer entries.")
+
+    def handle(self, *args, **options):
+        if not (options['warm'] or options['invalidate'] or options['clear']):
+            raise CommandError("Specify --warm, --invalidate PLACE [PLACE ...] or --clear.")
+
+        if options['clear']:
+            invalidate_geocode(delete_gazetteer=options['delete_gazetteer'])
+            self.stdout.write(self.style.SUCCESS("Cleared the geocoding cache."))
+        elif options['invalidate']:
+            count = invalidate_geocode(options['invalidate'], delete_gazetteer=options['delete_gazetteer'])
+            self.stdout.write(self.style.SUCCESS(f"Invalidated {count} place name(s)."))
+
+        if options['warm']:
+            client = None if options['offline'] else build_ors_client(rate_limit_wait=60)
+            stats = warm_geocode_cache(client)
+            self.stdout.write(self.style.SUCCESS(
+                f"Cached {stats['cached']} place name(s), seeded {stats['seeded']} gazetteer entr(ies)."
+            ))
+            for location in stats['unresolved']:
+                self.stdout.write(self.style.WARNING(f"Could not resolve: {location}"))
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.23 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GazetteerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('display_name', models.CharField(max_length=200)),
+                ('longitude', models.FloatField()),
+                ('latitude', models.FloatField()),
+                ('source', models.CharField(choices=[('builtin', 'Built-in'), ('destination', 'Destination'), ('business', 'Business'), ('geocoder', 'Geocoder'), ('manual', 'Manual')], default='geocoder', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'gazetteer entries',
+                'ordering': ['name'],
+            },
+        ),
+    ]
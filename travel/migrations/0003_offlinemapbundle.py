@@ -0,0 +1,34 @@
+# Generated by Django 3.2.23 on 2026-10-17 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0002_gazetteerentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfflineMapBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_hash', models.CharField(max_length=64, unique=True)),
+                ('location', models.CharField(max_length=200)),
+                ('area_km', models.FloatField()),
+                ('center', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file', models.FileField(blank=True, upload_to='offline_bundles/')),
+                ('content_hash', models.CharField(blank=True, max_length=64)),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 3.2.23 on 2026-10-17 11:05
+
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_aggregates(apps, schema_editor):
+    """Fill the new running totals from existing reviews and likes (historical models only)."""
+    Review = apps.get_model('travel', 'Review')
+    ReviewLike = apps.get_model('travel', 'ReviewLike')
+    for model_name, field in (('Destination', 'destination'), ('Business', 'business')):
+        model = apps.get_model('travel', model_name)
+        model.objects.update(rating_sum=0, review_count=0, average_rating=0)
+        totals = (
+            Review.objects.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(total=Sum('rating'), count=Count('id'))
+            .order_by()
+        )
+        for row in totals.iterator():
+            total, count = row['total'], row['count']
+            average = (Decimal(total) / Decimal(count)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            model.objects.filter(pk=row[field]).update(rating_sum=total, review_count=count, average_rating=average)
+    likes = ReviewLike.objects.values('review').annotate(count=Count('id')).order_by()
+    for row in likes.iterator():
+        Review.objects.filter(pk=row['review']).update(likes_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0003_offlinemapbundle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destination',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='business',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='travel.business'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travel', '0005_catalog_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offlinemapbundle',
+            name='rebuild_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
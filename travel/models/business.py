@@ -34,6 +34,8 @@ class Business(models.Model):
     address = models.TextField()
     location = models.CharField(max_length=200)
     region = models.CharField(max_length=100)
+    longitude = models.FloatField(null=True, blank=True)  # Filled by travel.tasks.geocode_catalog
+    latitude = models.FloatField(null=True, blank=True)
     contact_number = models.CharField(max_length=20)
     whatsapp = models.CharField(max_length=20, blank=True)
     email = models.EmailField()
@@ -62,6 +64,7 @@ class Business(models.Model):
         default=0
     )
     review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)  # Running sum of review ratings, kept by travel/signals.py
 
     # Metadata
     is_featured = models.BooleanField(default=False)
@@ -83,14 +86,25 @@ class Business(models.Model):
         return f"{self.name} ({self.get_business_type_display()})"
 
     def update_rating(self):
-        """Update average rating when new reviews are added"""
+        """
+        Recompute rating aggregates from all reviews.
+
+        Review signals keep the aggregates current incrementally; this full
+        recount is only for repairing drift.
+        """
         from travel.models.review import Review
-        reviews = Review.objects.filter(business=self)
-        if reviews.exists():
-            avg = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.average_rating = round(avg, 2)
-            self.review_count = reviews.count()
-            self.save()
+        from travel.utils.ratings import average_of
+        totals = Review.objects.filter(business=self).aggregate(
+            total=models.Sum('rating'), count=models.Count('id')
+        )
+        self.rating_sum = totals['total'] or 0
+        self.review_count = totals['count']
+        self.average_rating = average_of(self.rating_sum, self.review_count)
+        type(self).objects.filter(pk=self.pk).update(
+            rating_sum=self.rating_sum,
+            review_count=self.review_count,
+            average_rating=self.average_rating,
+        )
 
     def get_reviews(self):
         """Get all reviews for this business"""
@@ -19,6 +19,8 @@ class Destination(models.Model):
     description = models.TextField()
     location = models.CharField(max_length=200)
     region = models.CharField(max_length=100)
+    longitude = models.FloatField(null=True, blank=True)  # Filled by travel.tasks.geocode_catalog
+    latitude = models.FloatField(null=True, blank=True)
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     images = models.JSONField(default=list)  # Store multiple image URLs
     price_range = models.CharField(max_length=50)
@@ -58,6 +60,7 @@ class Destination(models.Model):
         default=0
     )
     review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)  # Running sum of review ratings, kept by travel/signals.py
 
     # Metadata
     is_featured = models.BooleanField(default=False)
@@ -78,11 +81,22 @@ class Destination(models.Model):
         return self.name
 
     def update_rating(self):
-        """Update average rating when new reviews are added"""
+        """
+        Recompute rating aggregates from all reviews.
+
+        Review signals keep the aggregates current incrementally; this full
+        recount is only for repairing drift.
+        """
         from travel.models.review import Review
-        reviews = Review.objects.filter(destination=self)
-        if reviews.exists():
-            avg = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.average_rating = round(avg, 2)
-            self.review_count = reviews.count()
-            self.save() 
\ No newline at end of file
+        from travel.utils.ratings import average_of
+        totals = Review.objects.filter(destination=self).aggregate(
+            total=models.Sum('rating'), count=models.Count('id')
+        )
+        self.rating_sum = totals['total'] or 0
+        self.review_count = totals['count']
+        self.average_rating = average_of(self.rating_sum, self.review_count)
+        type(self).objects.filter(pk=self.pk).update(
+            rating_sum=self.rating_sum,
+            review_count=self.review_count,
+            average_rating=self.average_rating,
+        ) 
\ No newline at end of file
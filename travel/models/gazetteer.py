@@ -0,0 +1,30 @@
+from django.db import models
+
+class GazetteerEntry(models.Model):
+    """Known place name resolved to coordinates, used before calling the geocoding API."""
+    SOURCE_CHOICES = [
+        ('builtin', 'Built-in'),
+        ('destination', 'Destination'),
+        ('business', 'Business'),
+        ('geocoder', 'Geocoder'),
+        ('manual', 'Manual'),
+    ]
+
+    name = models.CharField(max_length=200, unique=True)  # Normalized place name
+    display_name = models.CharField(max_length=200)
+    longitude = models.FloatField()
+    latitude = models.FloatField()
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='geocoder')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = "gazetteer entries"
+
+    def __str__(self):
+        return f"{self.display_name} ({self.longitude}, {self.latitude})"
+
+    @property
+    def coordinates(self):
+        return [self.longitude, self.latitude]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from travel.utils.counters import get_counts, increment_counter
 
 User = get_user_model()
 
@@ -97,19 +98,16 @@ class News(models.Model):
         return f"{self.title} ({self.get_news_type_display()})"
 
     def increment_views(self):
-        """Increment the view count"""
-        self.views_count += 1
-        self.save()
+        """Increment the view count (buffered in Redis, see travel/utils/counters.py)"""
+        increment_counter(self, 'views_count')
 
     def increment_shares(self):
         """Increment the shares count"""
-        self.shares_count += 1
-        self.save()
+        increment_counter(self, 'shares_count')
 
     def increment_comments(self):
         """Increment the comments count"""
-        self.comments_count += 1
-        self.save()
+        increment_counter(self, 'comments_count')
 
     def is_valid(self):
         """Check if the news is currently valid"""
@@ -137,11 +135,12 @@ class News(models.Model):
         }
 
     def get_engagement_stats(self):
-        """Get engagement statistics"""
+        """Get engagement statistics, including hits not yet flushed to the database"""
+        counts = get_counts(self)
         return {
-            'views': self.views_count,
-            'shares': self.shares_count,
-            'comments': self.comments_count,
+            'views': counts['views_count'],
+            'shares': counts['shares_count'],
+            'comments': counts['comments_count'],
         }
 
     def get_notification_data(self):
@@ -0,0 +1,44 @@
+from django.db import models
+
+class OfflineMapBundle(models.Model):
+    """A downloadable offline package for a location and radius, built by a Celery task."""
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    request_hash = models.CharField(max_length=64, unique=True)  # Hash of the normalized location and area
+    location = models.CharField(max_length=200)
+    area_km = models.FloatField()
+    center = models.JSONField(default=list)  # [longitude, latitude]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file = models.FileField(upload_to='offline_bundles/', blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)  # sha256 of the package bytes
+    size_bytes = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    rebuild_queued_at = models.DateTimeField(null=True, blank=True)  # Rebuild of a ready bundle in flight
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Offline bundle for {self.location} ({self.area_km} km) - {self.status}"
+
+    def is_stale(self, max_age):
+        """True when a ready bundle was built more than `max_age` (timedelta) ago."""
+        from django.utils import timezone
+        return bool(self.completed_at) and timezone.now() - self.completed_at > max_age
+
+    def rebuild_pending(self, timeout):
+        """True while a rebuild queued less than `timeout` (timedelta) ago has not landed."""
+        from django.utils import timezone
+        return bool(self.rebuild_queued_at) and timezone.now() - self.rebuild_queued_at < timeout
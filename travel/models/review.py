@@ -1,7 +1,16 @@
 from django.db import models
 from django.conf import settings
+from travel.models.business import Business
 from travel.models.destination import Destination  # Update this import
 
+class ReviewQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Load everything ReviewSerializer renders in a fixed number of queries:
+        user and destination joined, images prefetched.
+        """
+        return self.select_related('user', 'destination').prefetch_related('images')
+
 class Review(models.Model):
     RATING_CHOICES = [
         (1, '1 - Poor'),
@@ -13,11 +22,15 @@ class Review(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     destination = models.ForeignKey(Destination, on_delete=models.CASCADE, null=True, blank=True)
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, null=True, blank=True)
     rating = models.IntegerField(choices=RATING_CHOICES)
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    likes_count = models.PositiveIntegerField(default=0)  # Maintained by travel/signals.py
+
+    objects = ReviewQuerySet.as_manager()
 
     def __str__(self):
         return f"Review by {self.user.email}"
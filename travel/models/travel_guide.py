@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from travel.utils.weather_utils import get_weather_info
+from ai_driven_travel_platform.caching import bump_generation
+from travel.utils.counters import increment_counter
+from travel.utils.weather_utils import get_cached_weather
 
 User = get_user_model()
 
@@ -91,9 +93,8 @@ class TravelGuide(models.Model):
         return f"{self.title} ({self.get_guide_type_display()})"
 
     def increment_views(self):
-        """Increment the view count"""
-        self.views_count += 1
-        self.save()
+        """Increment the view count (buffered in Redis, see travel/utils/counters.py)"""
+        increment_counter(self, 'views_count')
 
     def get_related_content(self):
         """Get related guides and content"""
@@ -139,8 +140,18 @@ class TravelGuide(models.Model):
         }
 
     def update_weather_info(self):
-        """Update weather information for the travel guide"""
-        weather_data = get_weather_info(self.region)
+        """
+        Update weather information for the travel guide from the weather cache.
+
+        Never calls the weather API: on a cache miss a background refresh is
+        queued, which writes the result back to every guide in the region.
+        """
+        region_name = self.get_region_display()
+        weather_data = get_cached_weather(region_name)
         if weather_data:
             self.weather_info = weather_data
-            self.save()
\ No newline at end of file
+            TravelGuide.objects.filter(pk=self.pk).update(weather_info=weather_data)
+            bump_generation('travel.travelguide')
+        else:
+            from travel.tasks import refresh_weather_cache
+            refresh_weather_cache.delay([region_name])
\ No newline at end of file
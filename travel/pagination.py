@@ -0,0 +1,21 @@
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination
+from travel.search.filters import SEARCH_RANK
+
+
+class CatalogCursorPagination(CursorPagination):
+    """
+    Cursor pagination for catalog listings, newest first.
+
+    Each page is a range query from the cursor position, so deep pages cost
+    the same as the first one and no COUNT query is run. `?search=` results
+    are paged in relevance order unless `?ordering=` is given.
+    """
+    ordering = '-created_at'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        if SEARCH_RANK in queryset.query.annotations and not request.query_params.get(OrderingFilter.ordering_param):
+            return (SEARCH_RANK,)
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,107 @@
+import logging
+from django.apps import apps
+from travel.search.index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _text(value):
+    """Flatten JSON list/dict field content into indexable text."""
+    if isinstance(value, dict):
+        return ' '.join(_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_text(v) for v in value)
+    return str(value) if value is not None else ''
+
+
+def _snippet(text, length=160):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= length else text[:length].rsplit(' ', 1)[0] + '...'
+
+
+# Document type -> how a model is indexed.
+# fields: (attribute, weight); summary: attribute used for the result snippet.
+SEARCH_DOCUMENTS = {
+    'destination': {
+        'model': 'travel.destination',
+        'filter': {'is_active': True},
+        'title': 'name',
+        'summary': 'description',
+        'fields': [('name', 4), ('location', 3), ('region', 2), ('category', 1), ('description', 1), ('attractions', 1), ('activities', 1)],
+        'extra': ('location', 'region', 'category'),
+    },
+    'business': {
+        'model': 'travel.business',
+        'filter': {'is_active': True},
+        'title': 'name',
+        'summary': 'description',
+        'fields': [('name', 4), ('location', 3), ('region', 2), ('business_type', 1), ('description', 1), ('services', 1)],
+        'extra': ('location', 'region', 'business_type'),
+    },
+    'guide': {
+        'model': 'travel.travelguide',
+        'filter': {'is_active': True},
+        'title': 'title',
+        'summary': 'summary',
+        'fields': [('title', 4), ('region', 2), ('guide_type', 1), ('summary', 2), ('content', 1), ('key_points', 1)],
+        'extra': ('region', 'guide_type'),
+    },
+    'news': {
+        'model': 'travel.news',
+        'filter': {'is_active': True, 'is_archived': False},
+        'title': 'title',
+        'summary': 'summary',
+        'fields': [('title', 4), ('region', 2), ('news_type', 1), ('summary', 2), ('content', 1), ('tags', 2)],
+        'extra': ('region', 'news_type'),
+    },
+}
+
+MODEL_DOCUMENT_TYPES = {spec['model']: doc_type for doc_type, spec in SEARCH_DOCUMENTS.items()}
+
+
+def document_key(instance):
+    """Search document key for a model instance, or None if the model is not indexed."""
+    doc_type = MODEL_DOCUMENT_TYPES.get(instance._meta.label_lower)
+    return f"{doc_type}:{instance.pk}" if doc_type else None
+
+
+def _index_instance(index, doc_type, instance):
+    spec = SEARCH_DOCUMENTS[doc_type]
+    weighted = [(_text(getattr(instance, field)), weight) for field, weight in spec['fields']]
+    stored = {
+        'type': doc_type,
+        'id': instance.pk,
+        'title': getattr(instance, spec['title']),
+        'snippet': _snippet(getattr(instance, spec['summary'])),
+    }
+    for field in spec['extra']:
+        stored[field] = getattr(instance, field)
+    index.add(f"{doc_type}:{instance.pk}", weighted, stored)
+
+
+def _queryset(doc_type):
+    spec = SEARCH_DOCUMENTS[doc_type]
+    model = apps.get_model(spec['model'])
+    fields = {'id'} | {field for field, _ in spec['fields']} | {spec['title'], spec['summary']} | set(spec['extra'])
+    return model.objects.filter(**spec['filter']).only(*fields)
+
+
+def build_index():
+    """Build a complete index from the database."""
+    index = SearchIndex()
+    for doc_type in SEARCH_DOCUMENTS:
+        for instance in _queryset(doc_type).iterator():
+            _index_instance(index, doc_type, instance)
+    return index
+
+
+def reindex_document(index, doc_key):
+    """Refresh one document from the database, dropping it if deleted or inactive."""
+    doc_type, pk = doc_key.split(':', 1)
+    if doc_type not in SEARCH_DOCUMENTS:
+        return
+    instance = _queryset(doc_type).filter(pk=pk).first()
+    if instance is None:
+        index.remove(doc_key)
+    else:
+        _index_instance(index, doc_type, instance)
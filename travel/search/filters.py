@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+from rest_framework import filters
+from travel.search.documents import MODEL_DOCUMENT_TYPES
+from travel.search.index import get_search_index
+
+# Annotation holding a row's position in the search results (0 = best match)
+SEARCH_RANK = 'search_rank'
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter answered from the search index instead of `icontains` scans.
+
+    Only the best SEARCH_FILTER_LIMIT matches are returned. Rows are
+    annotated with their rank so CatalogCursorPagination can keep
+    relevance order. Models that are not indexed keep the default
+    SearchFilter behaviour.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        doc_type = MODEL_DOCUMENT_TYPES.get(queryset.model._meta.label_lower)
+        if not query.strip() or doc_type is None:
+            return super().filter_queryset(request, queryset, view)
+        results = get_search_index().search(query, types=[doc_type], limit=settings.SEARCH_FILTER_LIMIT)
+        ids = [result['id'] for result in results]
+        if not ids:
+            return queryset.none()
+        rank = Case(*(When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)), output_field=IntegerField())
+        return queryset.filter(pk__in=ids).annotate(**{SEARCH_RANK: rank})
@@ -0,0 +1,226 @@
+import math
+import time
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from travel.search.tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_KEY = 'search:seq'
+CHANGE_KEY_PREFIX = 'search:change'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def _deletes(term):
+    """All strings one deletion away from `term` (typo-tolerance neighbourhood)."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class SearchIndex:
+    """
+    In-process inverted index with BM25 ranking.
+
+    Documents are keyed by "<type>:<pk>". Field weights are applied by
+    counting a term occurrence `weight` times, so a title hit outranks a body
+    hit. Query terms are matched exactly, by prefix (the last term, for
+    search-as-you-type) and within one edit via a deletion neighbourhood.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings = defaultdict(dict)  # term -> {doc_key: weighted tf}
+        self.doc_terms = {}                # doc_key -> Counter of terms
+        self.doc_lengths = {}
+        self.documents = {}                # doc_key -> stored result fields
+        self.total_length = 0
+        self._sorted_terms = None
+        self._deletion_map = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, doc_key, weighted_fields, stored):
+        """
+        Index or re-index a document.
+
+        Args:
+            doc_key (str): "<type>:<pk>".
+            weighted_fields (list): (text, weight) pairs.
+            stored (dict): Fields returned with search results.
+        """
+        terms = Counter()
+        for text, weight in weighted_fields:
+            for term in tokenize(text):
+                terms[term] += weight
+        with self._lock:
+            self._remove(doc_key)
+            for term, frequency in terms.items():
+                self.postings[term][doc_key] = frequency
+            length = sum(terms.values())
+            self.doc_terms[doc_key] = terms
+            self.doc_lengths[doc_key] = length
+            self.documents[doc_key] = stored
+            self.total_length += length
+            self._sorted_terms = self._deletion_map = None
+
+    def remove(self, doc_key):
+        with self._lock:
+            self._remove(doc_key)
+            self._sorted_terms = self._deletion_map = None
+
+    def _remove(self, doc_key):
+        terms = self.doc_terms.pop(doc_key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_key, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_key, 0)
+        self.documents.pop(doc_key, None)
+
+    def _vocabulary(self):
+        if self._sorted_terms is None:
+            sorted_terms = sorted(self.postings)
+            deletion_map = defaultdict(set)
+            for term in sorted_terms:
+                if len(term) >= 4:
+                    for variant in _deletes(term):
+                        deletion_map[variant].add(term)
+            self._sorted_terms, self._deletion_map = sorted_terms, deletion_map
+        return self._sorted_terms, self._deletion_map
+
+    def expand(self, term, prefix=False, max_expansions=20):
+        """
+        Index terms matching a query term.
+
+        Returns:
+            dict: Matching term -> score multiplier (1.0 exact, lower for prefix/typo matches).
+        """
+        sorted_terms, deletion_map = self._vocabulary()
+        matches = {}
+        if term in self.postings:
+            matches[term] = 1.0
+        if prefix and len(term) >= 2:
+            start = bisect.bisect_left(sorted_terms, term)
+            for candidate in sorted_terms[start:start + max_expansions]:
+                if not candidate.startswith(term):
+                    break
+                matches.setdefault(candidate, 0.8)
+        if len(term) >= 4 and len(matches) < max_expansions:
+            # Candidates within one insertion, deletion or substitution
+            candidates = set(deletion_map.get(term, ()))
+            for variant in _deletes(term):
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates |= deletion_map.get(variant, set())
+            for candidate in sorted(candidates)[:max_expansions]:
+                matches.setdefault(candidate, 0.6)
+        return matches
+
+    def search(self, query, types=None, limit=20):
+        """
+        Rank documents for a query with BM25.
+
+        Args:
+            query (str): Free-text query.
+            types (iterable, optional): Restrict results to these document types.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Stored document fields plus "score", best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        types = set(types) if types else None
+        with self._lock:
+            doc_count = len(self.documents) or 1
+            average_length = (self.total_length / doc_count) or 1
+            scores = defaultdict(float)
+            for position, term in enumerate(terms):
+                is_last = position == len(terms) - 1
+                for matched, multiplier in self.expand(term, prefix=is_last).items():
+                    postings = self.postings[matched]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_key, frequency in postings.items():
+                        if types and doc_key.split(':', 1)[0] not in types:
+                            continue
+                        norm = frequency + K1 * (1 - B + B * self.doc_lengths[doc_key] / average_length)
+                        scores[doc_key] += multiplier * idf * frequency * (K1 + 1) / norm
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [dict(self.documents[doc_key], score=round(score, 4)) for doc_key, score in ranked]
+
+
+def record_changes(doc_keys):
+    """
+    Publish changed documents so every worker re-indexes them.
+
+    The keys go into a shared, sequence-numbered log in the cache; each
+    process (including this one) replays entries newer than the last one it
+    applied on its next query.
+    """
+    doc_keys = list(doc_keys)
+    if not doc_keys:
+        return
+    try:
+        cache.add(SEQUENCE_KEY, 0, None)
+        last = cache.incr(SEQUENCE_KEY, len(doc_keys))
+        first = last - len(doc_keys) + 1
+        cache.set_many(
+            {f"{CHANGE_KEY_PREFIX}:{sequence}": doc_key for sequence, doc_key in zip(range(first, last + 1), doc_keys)},
+            settings.SEARCH_CHANGE_LOG_TTL,
+        )
+    except Exception as e:
+        logger.warning(f"Could not publish search index changes for {len(doc_keys)} documents: {e}")
+
+
+def record_change(doc_key):
+    record_changes([doc_key])
+
+
+_state = {}
+_state_lock = threading.Lock()
+
+
+def get_search_index():
+    """
+    Return this process's search index, built on first use and kept current
+    by replaying the shared change log.
+    """
+    from travel.search.documents import build_index, reindex_document
+
+    try:
+        sequence = cache.get(SEQUENCE_KEY) or 0
+    except Exception:
+        sequence = _state.get('sequence', 0)
+
+    with _state_lock:
+        index = _state.get('index')
+        applied = _state.get('sequence', 0)
+        if index is None or sequence - applied > settings.SEARCH_MAX_REPLAY:
+            started = time.monotonic()
+            index = build_index()
+            _state.update(index=index, sequence=sequence)
+            logger.info(f"Built search index of {len(index)} documents in {time.monotonic() - started:.2f}s")
+        elif sequence > applied:
+            keys = [f"{CHANGE_KEY_PREFIX}:{n}" for n in range(applied + 1, sequence + 1)]
+            changes = cache.get_many(keys)
+            if len(changes) < len(keys):
+                # Part of the log expired: start over from the database
+                index = build_index()
+                _state['index'] = index
+            else:
+                for doc_key in dict.fromkeys(changes[key] for key in keys):
+                    reindex_document(index, doc_key)
+            _state['sequence'] = sequence
+    return index
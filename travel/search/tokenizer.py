@@ -0,0 +1,71 @@
+import re
+import unicodedata
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the
+their there this to was were will with you your our we can all also into
+""".split())
+
+# Common spellings of transliterated Amharic/Tigrinya place names differ in
+# these ways (Aksum/Axum, Mekele/Mekelle, Dessie/Dese, Kibre/Qibre).
+TRANSLITERATION_RULES = (
+    ('ph', 'f'),
+    ('x', 'ks'),
+    ('q', 'k'),
+    ('w', 'u'),
+    ('y', 'i'),
+    ('ie', 'e'),
+    ('ee', 'i'),
+    ('oo', 'u'),
+)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def fold_text(text):
+    """Lowercase and strip accents and Ethiopic/Latin diacritics."""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def fold_transliteration(token):
+    """
+    Reduce a token to a spelling-insensitive key.
+
+    Applies the rules above and collapses doubled letters, so "Mekelle" and
+    "Mekele" or "Axum" and "Aksum" produce the same key.
+    """
+    for source, target in TRANSLITERATION_RULES:
+        token = token.replace(source, target)
+    return re.sub(r'(.)\1+', r'\1', token)
+
+
+def stem(token):
+    """Very light English suffix stripping (plurals and -ing/-ed)."""
+    if len(token) > 5 and token.endswith('ing'):
+        return token[:-3]
+    if len(token) > 4 and token.endswith('ed'):
+        return token[:-2]
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def normalize_token(token):
+    return fold_transliteration(stem(token))
+
+
+def tokenize(text):
+    """
+    Split text into normalized index terms.
+
+    Returns:
+        list: Terms in order of appearance, stop words removed.
+    """
+    return [
+        normalize_token(token)
+        for token in TOKEN_PATTERN.findall(fold_text(text))
+        if token not in STOP_WORDS
+    ]
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models.user_profile import UserProfile
 from .models.business import Business
 from .models.destination import Destination
@@ -14,38 +15,132 @@ from .models.certification_code import CertificationCode
 from .models.travel_history import TravelHistory
 from users.serializers import UserSerializer
 
+
+def _query_param_list(request, name):
+    value = request.query_params.get(name, '') if request is not None else ''
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+class SparseFieldsetMixin:
+    """
+    Lets clients choose the fields they receive.
+
+    `?fields=a,b` returns only those fields (plus id). Serializers that set
+    `Meta.default_fields` return just that set by default, and `?expand=c,d`
+    adds more fields on top of it. Only output is trimmed: serializers given
+    `data`, or used for a write request, keep every field for validation.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if hasattr(self, 'initial_data') or (request is not None and request.method not in SAFE_METHODS):
+            return
+        requested = _query_param_list(request, 'fields')
+        default = getattr(self.Meta, 'default_fields', None)
+        if requested:
+            allowed = set(requested) | {'id'}
+        elif default:
+            allowed = set(default) | set(_query_param_list(request, 'expand'))
+        else:
+            return
+        for name in list(self.fields):
+            if name not in allowed:
+                self.fields.pop(name)
+
+    def model_field_names(self):
+        """Concrete model fields the selected serializer fields read, for QuerySet.only()."""
+        concrete = {field.name for field in self.Meta.model._meta.concrete_fields}
+        names = {'id'}
+        for field in self.fields.values():
+            source = field.source.split('.')[0]
+            if source in concrete:
+                names.add(source)
+        return names
+
+class CoverImageField(serializers.ReadOnlyField):
+    """First URL of an `images` list, for compact cards."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'images')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value[0] if value else None
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = '__all__'
         read_only_fields = ('user', 'created_at', 'updated_at')
 
-class BusinessSerializer(serializers.ModelSerializer):
+class BusinessSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Business
         fields = '__all__'
 
-class DestinationSerializer(serializers.ModelSerializer):
+class BusinessCardSerializer(BusinessSerializer):
+    cover_image = CoverImageField()
+
+    class Meta(BusinessSerializer.Meta):
+        default_fields = (
+            'id', 'name', 'business_type', 'location', 'region', 'price_range',
+            'cover_image', 'average_rating', 'review_count', 'is_verified', 'created_at',
+        )
+
+class DestinationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Destination
         fields = '__all__'
 
+class DestinationCardSerializer(DestinationSerializer):
+    cover_image = CoverImageField()
+
+    class Meta(DestinationSerializer.Meta):
+        default_fields = (
+            'id', 'name', 'location', 'region', 'category', 'cover_image',
+            'average_rating', 'review_count', 'is_featured', 'created_at',
+        )
+
+class DestinationSummarySerializer(serializers.ModelSerializer):
+    """Slim destination representation for embedding in other resources."""
+    class Meta:
+        model = Destination
+        fields = ('id', 'name', 'location', 'region', 'category', 'average_rating')
+
 class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = News
         fields = '__all__'
 
-class TravelGuideSerializer(serializers.ModelSerializer):
+class NewsCardSerializer(NewsSerializer):
+    cover_image = CoverImageField()
+
+    class Meta(NewsSerializer.Meta):
+        default_fields = (
+            'id', 'title', 'news_type', 'region', 'summary', 'cover_image',
+            'impact_level', 'valid_from', 'is_featured', 'created_at',
+        )
+
+class TravelGuideSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = TravelGuide
         fields = '__all__'
         read_only_fields = ('author', 'published_date')
 
+class TravelGuideCardSerializer(TravelGuideSerializer):
+    cover_image = CoverImageField()
+
+    class Meta(TravelGuideSerializer.Meta):
+        default_fields = (
+            'id', 'title', 'guide_type', 'region', 'summary', 'cover_image',
+            'views_count', 'is_featured', 'created_at',
+        )
+
 class ReviewImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReviewImage
@@ -54,17 +149,13 @@ class ReviewImageSerializer(serializers.ModelSerializer):
 
 class ReviewSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    destination = DestinationSerializer(read_only=True)
+    destination = DestinationSummarySerializer(read_only=True)
     images = ReviewImageSerializer(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Review
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at', 'user')
-
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+        read_only_fields = ('created_at', 'updated_at', 'user', 'likes_count')
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
     images = serializers.ListField(
@@ -74,7 +165,7 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('destination', 'rating', 'title', 'content', 'images')
+        fields = ('destination', 'business', 'rating', 'title', 'content', 'images')
 
     def create(self, validated_data):
         images_data = validated_data.pop('images', [])
@@ -0,0 +1,105 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from travel.models.business import Business
+from travel.models.destination import Destination
+from travel.models.gazetteer import GazetteerEntry  # noqa: F401 (registers the model; geocoding imports it lazily)
+from travel.models.news import News
+from travel.models.review import Review, ReviewLike
+from travel.models.travel_guide import TravelGuide
+from ai_driven_travel_platform.caching import bump_generation
+from travel.search.documents import document_key
+from travel.search.index import record_change
+from travel.utils.ratings import apply_likes_delta, apply_rating_delta
+from travel.utils.spatial_index import mark_spatial_change
+
+# Review foreign key -> rated model
+RATED_TARGETS = (
+    ('destination_id', Destination),
+    ('business_id', Business),
+)
+
+
+def _snapshot(review):
+    # Read from __dict__ so deferred fields are never loaded just for this
+    return {name: review.__dict__.get(name) for name in ('rating', 'destination_id', 'business_id')}
+
+
+@receiver(post_init, sender=Review)
+def remember_review_state(sender, instance, **kwargs):
+    instance._aggregate_snapshot = _snapshot(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_aggregates_on_review_save(sender, instance, created, **kwargs):
+    before = {} if created else instance._aggregate_snapshot
+    after = _snapshot(instance)
+    for field, model in RATED_TARGETS:
+        old_target, new_target = before.get(field), after[field]
+        old_rating = before.get('rating') or 0
+        if old_target == new_target:
+            if old_target is not None:
+                apply_rating_delta(model, new_target, after['rating'] - old_rating, 0)
+            continue
+        if old_target is not None:
+            apply_rating_delta(model, old_target, -old_rating, -1)
+        if new_target is not None:
+            apply_rating_delta(model, new_target, after['rating'], 1)
+    instance._aggregate_snapshot = after
+
+
+@receiver(post_delete, sender=Review)
+def update_aggregates_on_review_delete(sender, instance, **kwargs):
+    for field, model in RATED_TARGETS:
+        apply_rating_delta(model, getattr(instance, field), -instance.rating, -1)
+
+
+@receiver(post_save, sender=ReviewLike)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        apply_likes_delta(Review, instance.review_id, 1)
+
+
+@receiver(post_delete, sender=ReviewLike)
+def decrement_likes_count(sender, instance, **kwargs):
+    apply_likes_delta(Review, instance.review_id, -1)
+
+
+@receiver(post_save, sender=Destination)
+@receiver(post_save, sender=Business)
+@receiver(post_save, sender=TravelGuide)
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=Destination)
+@receiver(post_delete, sender=Business)
+@receiver(post_delete, sender=TravelGuide)
+@receiver(post_delete, sender=News)
+def update_search_index(sender, instance, **kwargs):
+    doc_key = document_key(instance)
+    transaction.on_commit(lambda: record_change(doc_key))
+
+
+@receiver(post_save, sender=Destination)
+@receiver(post_save, sender=Business)
+def update_spatial_index_on_save(sender, instance, **kwargs):
+    transaction.on_commit(mark_spatial_change)
+
+
+@receiver(post_delete, sender=Destination)
+@receiver(post_delete, sender=Business)
+def update_spatial_index_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: mark_spatial_change(deleted=True))
+
+
+@receiver(post_save, sender=Destination)
+@receiver(post_save, sender=Business)
+@receiver(post_save, sender=TravelGuide)
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=Review)  # Trip context reviews (travel/utils/trip_context.py)
+@receiver(post_delete, sender=Destination)
+@receiver(post_delete, sender=Business)
+@receiver(post_delete, sender=TravelGuide)
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=Review)
+def invalidate_catalog_responses(sender, instance, **kwargs):
+    label = sender._meta.label_lower
+    transaction.on_commit(lambda: bump_generation(label))
@@ -0,0 +1,167 @@
+import logging
+import openrouteservice
+from celery import shared_task
+from django.db.models import Q
+from django.utils import timezone
+from ai_driven_travel_platform.caching import bump_generation
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+from travel.models.offline_bundle import OfflineMapBundle
+from travel.utils.geocoding import geocode_location
+from travel.utils.offline_bundle import collect_bundle_content, package_bundle, store_bundle
+from travel.utils.weather_utils import refresh_weather
+from travel.utils.geocoding import normalize_place_name
+from travel.utils.counters import flush_counters
+from travel.utils.spatial_index import mark_spatial_change
+from travel.utils.ratings import reconcile_likes_counts, reconcile_rating_aggregates
+from travel.utils.ors_client import build_ors_client
+from travel.utils.distance_matrix import build_distance_matrix, save_distance_matrix
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def precompute_distance_matrix(profile='driving-car'):
+    """Rebuild the destination distance/duration matrix for a routing profile."""
+    client = build_ors_client(rate_limit_wait=120)
+    ids, distances, durations = build_distance_matrix(client, profile)
+    path = save_distance_matrix(profile, ids, distances, durations)
+    logger.info(f"Distance matrix for {len(ids)} destinations ({profile}) written to {path}")
+    return len(ids)
+
+
+@shared_task
+def geocode_catalog():
+    """
+    Fill in coordinates for destinations and businesses that have none.
+
+    Uses the geocoding tiers (gazetteer first), so well-known places cost
+    no ORS calls.
+    """
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+
+    client = build_ors_client(rate_limit_wait=60)
+    located = 0
+    for model in (Destination, Business):
+        missing = model.objects.filter(Q(longitude__isnull=True) | Q(latitude__isnull=True))
+        for pk, location in missing.values_list('id', 'location').iterator():
+            coords = geocode_location(client, location)
+            if not coords:
+                logger.warning(f"Could not geocode {model.__name__} {pk}: {location!r}")
+                continue
+            # updated_at moves so spatial indexes pick the row up incrementally
+            model.objects.filter(pk=pk).update(longitude=coords[0], latitude=coords[1], updated_at=timezone.now())
+            located += 1
+    if located:
+        mark_spatial_change()
+        bump_generation('travel.destination', 'travel.business')
+    logger.info(f"Geocoded {located} catalog records")
+    return located
+
+
+@shared_task
+def refresh_weather_cache(locations=None):
+    """
+    Refresh cached weather ahead of expiry and copy it onto stored records.
+
+    Without `locations`, every guide region and active destination location is
+    refreshed, so request paths always find warm weather entries.
+    """
+    from travel.models.destination import Destination
+    from travel.models.travel_guide import TravelGuide
+
+    regions = dict(TravelGuide.REGION_CHOICES)
+    if locations is None:
+        locations = list(regions.values())
+        locations += list(Destination.objects.filter(is_active=True).values_list('location', flat=True).distinct())
+
+    refreshed = refresh_weather(locations)
+
+    # One bulk UPDATE per place instead of a full save() per record
+    for code, name in regions.items():
+        weather = refreshed.get(normalize_place_name(name))
+        if weather:
+            TravelGuide.objects.filter(region=code, is_active=True).update(weather_info=weather)
+    for location in set(locations):
+        weather = refreshed.get(normalize_place_name(location))
+        if weather:
+            Destination.objects.filter(location=location, is_active=True).update(weather_info=weather)
+    bump_generation('travel.travelguide', 'travel.destination')
+    return len(refreshed)
+
+
+@shared_task
+def reconcile_review_aggregates():
+    """Repair drift in the incrementally maintained rating and like counters."""
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+    from travel.models.review import Review, ReviewLike
+
+    repaired = reconcile_rating_aggregates(Destination, Review, 'destination')
+    repaired += reconcile_rating_aggregates(Business, Review, 'business')
+    repaired += reconcile_likes_counts(Review, ReviewLike)
+    return repaired
+
+
+@shared_task
+def flush_buffered_counters():
+    """Write buffered News/TravelGuide view, share and comment counts to the database."""
+    return flush_counters()
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def build_offline_bundle(self, bundle_id):
+    """
+    Build, compress and store the offline package for an OfflineMapBundle.
+
+    The package is stored under its content hash, so rebuilding unchanged
+    data reuses the existing file.
+    """
+    try:
+        bundle = OfflineMapBundle.objects.get(pk=bundle_id)
+    except OfflineMapBundle.DoesNotExist:
+        logger.warning(f"Offline bundle {bundle_id} no longer exists; skipping build")
+        return
+
+    # A stale ready bundle keeps serving its current file until the rebuild lands
+    if bundle.status != OfflineMapBundle.STATUS_READY:
+        bundle.status = OfflineMapBundle.STATUS_PROCESSING
+        bundle.save(update_fields=['status', 'updated_at'])
+
+    client = build_ors_client(rate_limit_wait=60)
+    try:
+        coords = bundle.center or geocode_location(client, bundle.location)
+        if not coords:
+            raise ValueError(f"Could not geocode location: {bundle.location}")
+        content = collect_bundle_content(client, bundle.location, coords, bundle.area_km)
+    except (RateLimitExceeded, CircuitOpen, openrouteservice.exceptions.ApiError, openrouteservice.exceptions.Timeout) as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"Retrying offline bundle {bundle_id} after upstream error: {e}")
+            raise self.retry(exc=e)
+        return _fail_bundle(bundle, e)
+    except Exception as e:
+        return _fail_bundle(bundle, e)
+
+    payload, content_hash = package_bundle(content)
+    bundle.file.name = store_bundle(payload, content_hash)
+    bundle.center = coords
+    bundle.content_hash = content_hash
+    bundle.size_bytes = len(payload)
+    bundle.status = OfflineMapBundle.STATUS_READY
+    bundle.error_message = ''
+    bundle.completed_at = timezone.now()
+    bundle.rebuild_queued_at = None
+    bundle.save()
+    logger.info(f"Offline bundle {bundle_id} for {bundle.location} stored as {bundle.file.name}")
+
+
+def _fail_bundle(bundle, error):
+    logger.error(f"Error building offline bundle {bundle.id}: {error}")
+    bundle.error_message = str(error)
+    if bundle.status == OfflineMapBundle.STATUS_READY:
+        # Keep serving the previous package; the rebuild is retried once OFFLINE_BUNDLE_REBUILD_TIMEOUT passes
+        bundle.save(update_fields=['error_message', 'updated_at'])
+        return
+    bundle.status = OfflineMapBundle.STATUS_FAILED
+    bundle.save(update_fields=['status', 'error_message', 'updated_at'])
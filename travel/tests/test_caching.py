@@ -0,0 +1,27 @@
+import asyncio
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from ai_driven_travel_platform.caching import aget_or_set_single_flight, get_or_set_single_flight
+
+
+class SingleFlightWithoutCacheTests(SimpleTestCase):
+    """A cache outage must not take down the endpoints that cache through single-flight."""
+
+    def setUp(self):
+        down = mock.Mock(side_effect=ConnectionError("cache down"), __name__='cache')
+        for operation in ('get', 'add', 'set', 'delete', 'incr'):
+            patcher = mock.patch.object(cache, operation, down)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_sync_calls_the_producer(self):
+        with self.assertLogs('ai_driven_travel_platform.caching', 'WARNING'):
+            self.assertEqual(get_or_set_single_flight('key', lambda: 'value', 60, stats_namespace='test'), 'value')
+
+    def test_async_calls_the_producer(self):
+        async def producer():
+            return 'value'
+
+        with self.assertLogs('ai_driven_travel_platform.caching', 'WARNING'):
+            self.assertEqual(asyncio.run(aget_or_set_single_flight('key', producer, 60, stats_namespace='test')), 'value')
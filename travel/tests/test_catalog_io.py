@@ -0,0 +1,14 @@
+import io
+from django.test import TestCase
+from travel.utils.catalog_io import import_catalog, iter_records
+
+
+class CatalogCsvImportTests(TestCase):
+    def test_rows_with_wrong_cell_counts_are_reported(self):
+        lines = io.StringIO('name,location,region\nLalibela,Lalibela\nAxum,Axum,Tigray,extra\n')
+        summary = import_catalog('destinations', iter_records(lines, 'csv'), dry_run=True)
+        self.assertEqual(summary['invalid'], 2)
+        self.assertEqual(summary['errors'], [
+            {'line': 2, 'errors': "Expected 3 cells, got 2"},
+            {'line': 3, 'errors': "Expected 3 cells, got 4"},
+        ])
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from travel.models.offline_bundle import OfflineMapBundle
+from travel.tasks import build_offline_bundle
+from travel.utils import distance_matrix
+from travel.utils.offline_bundle import bundle_request_hash
+from travel.views.map_view import queue_offline_bundle
+
+
+class DestinationDistanceProfileTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_unknown_profile_rejected(self):
+        for profile in ('../../etc/passwd', 'teleport'):
+            response = self.client.get('/map/distance/', {'from': 1, 'to': 2, 'profile': profile})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('Profile must be one of', response.data['error'])
+        self.assertNotIn('teleport', distance_matrix._matrices)
+
+    def test_unknown_profile_never_reaches_the_file_system(self):
+        with self.assertRaises(ValueError):
+            distance_matrix.matrix_path('../secrets')
+
+
+@override_settings(OFFLINE_BUNDLE_MAX_AGE=60, OFFLINE_BUNDLE_REBUILD_TIMEOUT=600)
+class OfflineBundleRebuildTests(TestCase):
+    def setUp(self):
+        self.bundle = OfflineMapBundle.objects.create(
+            request_hash=bundle_request_hash('Gondar', 5), location='Gondar', area_km=5,
+            status=OfflineMapBundle.STATUS_READY, file='offline_bundles/old.zip',
+            completed_at=timezone.now() - timedelta(hours=1),
+        )
+
+    def test_stale_bundle_stays_ready_and_is_queued_once(self):
+        with mock.patch('travel.views.map_view.build_offline_bundle') as task:
+            queue_offline_bundle('Gondar', 5)
+            queue_offline_bundle('Gondar', 5)
+        task.delay.assert_called_once_with(self.bundle.id)
+        self.bundle.refresh_from_db()
+        self.assertEqual(self.bundle.status, OfflineMapBundle.STATUS_READY)
+        self.assertIsNotNone(self.bundle.completed_at)
+
+    def test_lost_rebuild_is_queued_again(self):
+        self.bundle.rebuild_queued_at = timezone.now() - timedelta(hours=1)
+        self.bundle.save()
+        with mock.patch('travel.views.map_view.build_offline_bundle') as task:
+            queue_offline_bundle('Gondar', 5)
+        task.delay.assert_called_once_with(self.bundle.id)
+
+    def test_failed_rebuild_keeps_the_previous_package(self):
+        with mock.patch('travel.tasks.collect_bundle_content', side_effect=ValueError("no data")), \
+                mock.patch('travel.tasks.build_ors_client'):
+            self.bundle.center = [37.47, 12.6]
+            self.bundle.save()
+            build_offline_bundle.apply(args=(self.bundle.id,))
+        self.bundle.refresh_from_db()
+        self.assertEqual(self.bundle.status, OfflineMapBundle.STATUS_READY)
+        self.assertEqual(self.bundle.file.name, 'offline_bundles/old.zip')
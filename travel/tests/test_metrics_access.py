@@ -0,0 +1,37 @@
+import tempfile
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@override_settings(METRICS_TOKEN=None, PROFILE_SAMPLE_RATE=1.0)
+class MetricsAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create(username='staff', email='staff@example.com', is_staff=True)
+        cls.member = User.objects.create(username='member', email='member@example.com')
+
+    def bearer(self, user):
+        return {'HTTP_AUTHORIZATION': f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_metrics_is_staff_only_without_a_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', **self.bearer(self.member)).status_code, 403)
+        self.assertEqual(self.client.get('/metrics', **self.bearer(self.staff)).status_code, 200)
+
+    @override_settings(METRICS_TOKEN='scrape')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape').status_code, 200)
+        self.assertEqual(self.client.get('/metrics', **self.bearer(self.staff)).status_code, 401)
+
+    def test_profiling_requires_staff(self):
+        with mock.patch('ai_driven_travel_platform.middleware.cProfile.Profile') as profile, \
+                override_settings(PROFILE_DIR=tempfile.mkdtemp()):
+            profile.return_value.runcall.side_effect = lambda function, *args: function(*args)
+            self.client.get('/search/', HTTP_X_PROFILE='1')
+            self.client.get('/search/', HTTP_X_PROFILE='1', **self.bearer(self.member))
+            profile.assert_not_called()
+            self.client.get('/search/', HTTP_X_PROFILE='1', **self.bearer(self.staff))
+            profile.assert_called_once()
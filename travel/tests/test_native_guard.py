@@ -0,0 +1,42 @@
+import asyncio
+from django.test import SimpleTestCase, override_settings
+from ai_driven_travel_platform.async_views import AsyncResponse, serve
+
+
+async def ok(request):
+    return AsyncResponse({'ok': True})
+
+
+def call(host, origin=None):
+    headers = [(b'host', host.encode())]
+    if origin:
+        headers.append((b'origin', origin.encode()))
+    scope = {'type': 'http', 'method': 'GET', 'path': '/map/nearby/', 'query_string': b'', 'headers': headers}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(serve(ok, 'nearby-attractions', {}, scope, receive, send))
+    start = sent[0]
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}
+
+
+@override_settings(ALLOWED_HOSTS=['api.example.com'], CORS_ALLOW_ALL_ORIGINS=False,
+                   CORS_ALLOWED_ORIGINS=['https://app.example.com'])
+class NativeGuardTests(SimpleTestCase):
+    def test_rejects_hosts_outside_allowed_hosts(self):
+        with self.assertLogs('django.security.DisallowedHost', 'WARNING'):
+            status, _ = call('evil.example.net')
+        self.assertEqual(status, 400)
+        self.assertEqual(call('api.example.com:8000')[0], 200)
+
+    def test_cors_follows_allowed_origins(self):
+        _, headers = call('api.example.com', origin='https://app.example.com')
+        self.assertEqual(headers['access-control-allow-origin'], 'https://app.example.com')
+        self.assertEqual(headers['x-content-type-options'], 'nosniff')
+        _, headers = call('api.example.com', origin='https://other.example.net')
+        self.assertNotIn('access-control-allow-origin', headers)
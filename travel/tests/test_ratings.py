@@ -0,0 +1,48 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from travel.models.destination import Destination
+from travel.models.review import Review
+
+
+class RatingAggregateTests(TestCase):
+    """Review signals keep Destination rating aggregates current (see travel/utils/ratings.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username='reviewer', email='reviewer@example.com')
+        cls.destination = Destination.objects.create(
+            name='Fasil Ghebbi', description='Royal enclosure', location='Gondar', region='Amhara',
+            category='historical', price_range='$', best_time_to_visit='October', safety_level='high',
+        )
+
+    def review(self, rating):
+        return Review.objects.create(user=self.user, destination=self.destination, rating=rating, title='Visit', content='Good')
+
+    def assertAggregates(self, rating_sum, review_count, average_rating):
+        self.destination.refresh_from_db()
+        self.assertEqual(
+            (self.destination.rating_sum, self.destination.review_count, self.destination.average_rating),
+            (rating_sum, review_count, Decimal(average_rating)),
+        )
+
+    def test_create_update_delete(self):
+        first = self.review(5)
+        self.review(4)
+        self.assertAggregates(9, 2, '4.50')
+
+        first.rating = 1
+        first.save()
+        self.assertAggregates(5, 2, '2.50')
+
+        first.delete()
+        self.assertAggregates(4, 1, '4.00')
+
+    def test_average_is_rounded(self):
+        for rating in (5, 4, 4):
+            self.review(rating)
+        self.assertAggregates(13, 3, '4.33')
+
+    def test_last_review_deleted(self):
+        self.review(3).delete()
+        self.assertAggregates(0, 0, '0')
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from travel.models.destination import Destination
+from travel.models.review import Review, ReviewImage, ReviewLike
+
+
+class ReviewListQueryCountTests(APITestCase):
+    """Listing reviews must not issue per-review queries (see Review.objects.for_listing)."""
+
+    # Page count, the page with user and destination joined, and the image prefetch
+    QUERIES_PER_PAGE = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [User.objects.create(username=f"reviewer{i}", email=f"reviewer{i}@example.com") for i in range(3)]
+        cls.destinations = [
+            Destination.objects.create(
+                name=f"Destination {i}", description='A place', location='Gondar', region='Amhara',
+                category='historical', price_range='$', best_time_to_visit='October', safety_level='high',
+            )
+            for i in range(2)
+        ]
+
+    def create_reviews(self, count):
+        for i in range(count):
+            review = Review.objects.create(
+                user=self.users[i % len(self.users)], destination=self.destinations[i % len(self.destinations)],
+                rating=1 + i % 5, title=f"Review {i}", content='Worth the trip',
+            )
+            ReviewImage.objects.create(review=review, image=f"review_images/{i}.jpg")
+            ReviewLike.objects.create(user=self.users[(i + 1) % len(self.users)], review=review)
+
+    def test_first_page(self):
+        self.create_reviews(4)
+        with self.assertNumQueries(self.QUERIES_PER_PAGE):
+            response = self.client.get('/reviews/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 4)
+        review = response.data['results'][0]
+        self.assertEqual(len(review['images']), 1)
+        self.assertEqual(review['likes_count'], 1)
+        self.assertIn('name', review['destination'])
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.create_reviews(25)
+        with self.assertNumQueries(self.QUERIES_PER_PAGE):
+            response = self.client.get('/reviews/')
+        self.assertEqual(len(response.data['results']), 10)
+        with self.assertNumQueries(self.QUERIES_PER_PAGE):
+            response = self.client.get('/reviews/', {'page': 3})
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_filtered_by_destination(self):
+        self.create_reviews(6)
+        # Plus one: django-filter loads the destination to validate the filter value
+        with self.assertNumQueries(self.QUERIES_PER_PAGE + 1):
+            response = self.client.get('/reviews/', {'destination': self.destinations[0].pk})
+        self.assertEqual(response.data['count'], 3)
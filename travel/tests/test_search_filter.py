@@ -0,0 +1,38 @@
+from unittest import mock
+from django.test import TestCase
+from travel.models.destination import Destination
+
+
+class SearchFilterOrderTests(TestCase):
+    def setUp(self):
+        self.destinations = [
+            Destination.objects.create(
+                name=name, description='...', location='...', region='amhara', category='historical',
+                price_range='$', best_time_to_visit='October',
+            )
+            for name in ('Gondar', 'Lalibela', 'Axum')
+        ]
+
+    def ranked(self, *destinations):
+        index = mock.Mock()
+        index.search.return_value = [{'id': destination.pk} for destination in destinations]
+        return mock.patch('travel.search.filters.get_search_index', return_value=index)
+
+    def names(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()['results']], response.json()['next']
+
+    def test_results_keep_relevance_order_across_pages(self):
+        gondar, lalibela, axum = self.destinations
+        with self.ranked(lalibela, axum, gondar):
+            first, next_page = self.names('/destinations/?search=north&page_size=2')
+            second, _ = self.names(next_page)
+        self.assertEqual(first + second, ['Lalibela', 'Axum', 'Gondar'])
+
+    def test_explicit_ordering_wins(self):
+        gondar, lalibela, axum = self.destinations
+        with self.ranked(lalibela, axum, gondar):
+            self.assertEqual(self.names('/destinations/?search=north&ordering=name')[0], ['Axum', 'Gondar', 'Lalibela'])
+        with self.ranked():
+            self.assertEqual(self.names('/destinations/?search=nothing')[0], [])
@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from travel.serializers import DestinationSerializer, TravelGuideCardSerializer
+
+
+class SparseFieldsetTests(SimpleTestCase):
+    factory = APIRequestFactory()
+
+    def context(self, method, path):
+        return {'request': Request(getattr(self.factory, method)(path))}
+
+    def test_reads_are_trimmed(self):
+        serializer = DestinationSerializer(context=self.context('get', '/destinations/?fields=name'))
+        self.assertEqual(set(serializer.fields), {'id', 'name'})
+        card = TravelGuideCardSerializer(context=self.context('get', '/travel-guides/'))
+        self.assertNotIn('content', card.fields)
+
+    def test_writes_validate_every_field(self):
+        serializer = DestinationSerializer(data={'name': 'Axum'}, context=self.context('post', '/destinations/?fields=name'))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('location', serializer.errors)
+        patch = DestinationSerializer(context=self.context('patch', '/destinations/1/?fields=name'))
+        self.assertIn('region', patch.fields)
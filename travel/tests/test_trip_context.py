@@ -0,0 +1,65 @@
+import threading
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+from travel.models.destination import Destination
+from travel.models.review import Review
+from travel.models.travel_guide import TravelGuide
+from travel.utils import trip_context
+
+
+class TripContextTests(TransactionTestCase):
+    """
+    Database-backed parts only; weather and nearby would call the upstream APIs.
+
+    Parts are read on pool threads with their own connections, so the rows
+    must be committed rather than held in a per-test transaction.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = get_user_model().objects.create(username='reviewer', email='reviewer@example.com')
+        self.destination = Destination.objects.create(
+            name='Fasil Ghebbi', description='Royal enclosure', location='Gondar', region='Amhara',
+            category='historical', price_range='$', best_time_to_visit='October', safety_level='high',
+        )
+        Review.objects.create(user=user, destination=self.destination, rating=5, title='Castles', content='Worth it')
+        TravelGuide.objects.create(
+            title='Amhara highlights', guide_type=TravelGuide.GUIDE_TYPES[0][0], region='amhara',
+            author=user, content='Guide', summary='Summary',
+        )
+
+    def test_selected_parts(self):
+        response = self.client.get(f'/destinations/{self.destination.pk}/context/', {'parts': 'reviews,guides'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'destination', 'reviews', 'guides', 'missing'})
+        self.assertEqual(response.data['destination']['name'], 'Fasil Ghebbi')
+        self.assertEqual([review['title'] for review in response.data['reviews']], ['Castles'])
+        self.assertEqual([guide['title'] for guide in response.data['guides']], ['Amhara highlights'])
+        self.assertEqual(response.data['missing'], {})
+
+    def test_unknown_destination(self):
+        self.assertEqual(self.client.get('/destinations/999/context/').status_code, 404)
+
+    def test_unknown_part(self):
+        response = self.client.get(f'/destinations/{self.destination.pk}/context/', {'parts': 'flights'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_busy_upstream_pool_does_not_delay_database_parts(self):
+        release = threading.Event()
+        trip_context.get_executor()
+        with mock.patch.object(trip_context, '_upstream_slots', threading.BoundedSemaphore(1)):
+            # An earlier request's nearby part still waiting on the upstream
+            blocked = trip_context.submit_upstream(release.wait)
+            try:
+                with mock.patch.object(trip_context, 'get_weather') as get_weather:
+                    response = self.client.get(f'/destinations/{self.destination.pk}/context/', {'parts': 'weather,reviews'})
+                get_weather.assert_not_called()
+            finally:
+                release.set()
+                blocked.result()
+        self.assertEqual(response.data['missing'], {'weather': 'unavailable'})
+        self.assertEqual([review['title'] for review in response.data['reviews']], ['Castles'])
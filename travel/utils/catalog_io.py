@@ -0,0 +1,231 @@
+import io
+import csv
+import json
+import logging
+from django.db import transaction
+from django.utils import timezone
+from ai_driven_travel_platform.caching import bump_generation
+from travel.search.index import record_changes
+from travel.utils.spatial_index import mark_spatial_change
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('ndjson', 'csv')
+CATALOG_KINDS = ('destinations', 'businesses')
+
+# Fields maintained by the application, never taken from an import file
+IMPORT_EXCLUDED_FIELDS = ('id', 'average_rating', 'review_count', 'rating_sum', 'created_at', 'updated_at')
+
+
+def catalog_spec(kind):
+    """
+    Model, serializer, natural key and search document type for a catalog kind.
+
+    Raises:
+        ValueError: If `kind` is not "destinations" or "businesses".
+    """
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+    from travel.serializers import BusinessSerializer, DestinationSerializer
+
+    specs = {
+        'destinations': (Destination, DestinationSerializer, ('name', 'location'), 'destination'),
+        'businesses': (Business, BusinessSerializer, ('name', 'location'), 'business'),
+    }
+    if kind not in specs:
+        raise ValueError(f"Unknown catalog {kind!r}; expected one of: {', '.join(specs)}")
+    return specs[kind]
+
+
+def _parse_csv_cell(value):
+    """CSV cells holding JSON lists/objects are decoded; everything else stays a string."""
+    stripped = value.strip()
+    if stripped[:1] in ('[', '{'):
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+    return value
+
+
+def iter_records(lines, fmt):
+    """
+    Read records one at a time from a text stream or any iterable of lines.
+
+    Yields:
+        tuple: (line number, record dict or None, parse error or None)
+    """
+    if fmt == 'ndjson':
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Each line must be a JSON object"
+                continue
+            yield line_number, record, None
+    elif fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            # DictReader pads short rows with None and collects extra cells under the None key
+            extra = record.pop(None, [])
+            if extra or None in record.values():
+                cells = sum(value is not None for value in record.values()) + len(extra)
+                yield reader.line_num, None, f"Expected {len(reader.fieldnames)} cells, got {cells}"
+                continue
+            yield reader.line_num, {key: _parse_csv_cell(value) for key, value in record.items()}, None
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of: {', '.join(FORMATS)}")
+
+
+def _write_chunk(model, key_fields, rows, dry_run):
+    """
+    Upsert validated rows on the natural key with one bulk insert and one bulk update.
+
+    Returns:
+        tuple: (created count, updated count, changed primary keys)
+    """
+    names = {attrs['name'] for _, attrs in rows}
+    existing = {
+        tuple(getattr(obj, field) for field in key_fields): obj
+        for obj in model.objects.filter(name__in=names)
+    }
+
+    to_create, to_update, update_fields = [], [], set()
+    now = timezone.now()
+    for _, attrs in rows:
+        natural_key = tuple(attrs.get(field) for field in key_fields)
+        obj = existing.get(natural_key)
+        if obj is None:
+            obj = model(**attrs)
+            existing[natural_key] = obj  # Later duplicates in the same chunk update this row
+            to_create.append(obj)
+        else:
+            for field, value in attrs.items():
+                setattr(obj, field, value)
+            obj.updated_at = now
+            update_fields.update(attrs)
+            if obj.pk is not None:
+                to_update.append(obj)
+
+    if dry_run:
+        return len(to_create), len(to_update), []
+
+    with transaction.atomic():
+        model.objects.bulk_create(to_create)
+        if to_update:
+            model.objects.bulk_update(to_update, sorted(update_fields | {'updated_at'}))
+
+    # Some backends (djongo among them) do not return primary keys from bulk inserts
+    created_keys = {tuple(getattr(obj, field) for field in key_fields) for obj in to_create}
+    created_pks = [
+        obj.pk for obj in model.objects.filter(name__in={key[0] for key in created_keys}).only(*key_fields)
+        if tuple(getattr(obj, field) for field in key_fields) in created_keys
+    ]
+    return len(to_create), len(to_update), created_pks + [obj.pk for obj in to_update]
+
+
+def import_catalog(kind, records, chunk_size=500, dry_run=False):
+    """
+    Validate and upsert catalog records in chunks.
+
+    Each row is validated with the catalog serializer; invalid rows are
+    reported and skipped without aborting the batch. Valid rows are written
+    per chunk with bulk_create/bulk_update, matched on (name, location).
+
+    Args:
+        kind (str): "destinations" or "businesses".
+        records (iterable): Output of iter_records().
+        chunk_size (int): Rows validated and written per batch.
+        dry_run (bool): Validate and match only, write nothing.
+
+    Returns:
+        dict: created, updated and invalid counts plus per-row errors.
+    """
+    model, serializer_class, key_fields, doc_type = catalog_spec(kind)
+    summary = {'created': 0, 'updated': 0, 'invalid': 0, 'errors': []}
+    changed_pks = []
+
+    def flush(rows):
+        created, updated, pks = _write_chunk(model, key_fields, rows, dry_run)
+        summary['created'] += created
+        summary['updated'] += updated
+        changed_pks.extend(pks)
+
+    # Empty cells (as exported from null values) mean null wherever the field allows it
+    nullable = {name for name, field in serializer_class().fields.items() if field.allow_null}
+
+    chunk = []
+    for line_number, record, error in records:
+        if error is None:
+            data = {
+                key: None if value == '' and key in nullable else value
+                for key, value in record.items() if key not in IMPORT_EXCLUDED_FIELDS
+            }
+            serializer = serializer_class(data=data)
+            if serializer.is_valid():
+                chunk.append((line_number, serializer.validated_data))
+            else:
+                error = serializer.errors
+        if error is not None:
+            summary['invalid'] += 1
+            summary['errors'].append({'line': line_number, 'errors': error})
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    if changed_pks:
+        # Bulk writes skip model signals: publish the changes explicitly
+        bump_generation(model._meta.label_lower)
+        mark_spatial_change()
+        record_changes(f"{doc_type}:{pk}" for pk in changed_pks)
+    logger.info(
+        f"Catalog import of {kind}: {summary['created']} created, {summary['updated']} updated, "
+        f"{summary['invalid']} invalid{' (dry run)' if dry_run else ''}"
+    )
+    return summary
+
+
+def export_catalog(kind, fmt, chunk_size=500):
+    """
+    Stream the catalog as NDJSON lines or CSV rows.
+
+    Rows are read with a server-side iterator and serialized one at a time,
+    so memory use does not grow with the catalog size.
+
+    Yields:
+        str: Output chunks (a CSV header first, for CSV).
+    """
+    model, serializer_class, _, _ = catalog_spec(kind)
+    queryset = model.objects.order_by('id').iterator(chunk_size=chunk_size)
+    if fmt == 'ndjson':
+        for obj in queryset:
+            yield json.dumps(serializer_class(obj).data, default=str) + '\n'
+    elif fmt == 'csv':
+        columns = list(serializer_class().fields)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+
+        def drain():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
+
+        writer.writeheader()
+        yield drain()
+        for obj in queryset:
+            row = {
+                column: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                for column, value in serializer_class(obj).data.items()
+            }
+            writer.writerow(row)
+            yield drain()
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of: {', '.join(FORMATS)}")
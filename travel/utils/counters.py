@@ -0,0 +1,185 @@
+import logging
+from collections import defaultdict
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY_PREFIX = 'counter'
+DIRTY_SET_KEY = 'counter:dirty'
+
+# Model label -> counter fields that may be incremented through Redis
+COUNTED_FIELDS = {
+    'travel.news': ('views_count', 'shares_count', 'comments_count'),
+    'travel.travelguide': ('views_count',),
+}
+
+# Atomically read and clear a batch of counter keys
+DRAIN_SCRIPT = """
+local values = {}
+for i, key in ipairs(KEYS) do
+    values[i] = redis.call('GET', key) or '0'
+    redis.call('DEL', key)
+end
+return values
+"""
+
+_drain_script = None
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def counter_key(label, pk, field):
+    return f"{COUNTER_KEY_PREFIX}:{label}:{pk}:{field}"
+
+
+def _parse_key(key):
+    """(label, pk, field) of a counter key. Raises ValueError unless it names a buffered counter of a row."""
+    if isinstance(key, bytes):
+        key = key.decode('utf-8')
+    _, label, pk, field = key.split(':')
+    _check_field(label, field)
+    return label, int(pk), field
+
+
+def _check_field(label, field):
+    if field not in COUNTED_FIELDS.get(label, ()):
+        raise ValueError(f"{field} is not a buffered counter of {label}")
+
+
+def increment_counter(instance, field, amount=1):
+    """
+    Record a hit on a counter without writing the row.
+
+    The hit is an INCR on a Redis key; flush_counters() later applies the
+    accumulated total with one atomic UPDATE. If Redis is not reachable the
+    increment is applied to the database directly.
+
+    Args:
+        instance: News or TravelGuide instance.
+        field (str): Counter field, e.g. "views_count".
+        amount (int): Increment.
+    """
+    label = instance._meta.label_lower
+    _check_field(label, field)
+    key = counter_key(label, instance.pk, field)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.incrby(key, amount)
+        pipe.sadd(DIRTY_SET_KEY, key)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Counter buffer unavailable, writing {key} directly: {e}")
+        type(instance).objects.filter(pk=instance.pk).update(**{field: F(field) + amount})
+
+
+def get_pending_counts(instances, fields):
+    """
+    Counts recorded in Redis but not yet flushed to the database.
+
+    Returns:
+        dict: (pk, field) -> pending amount, fetched with a single MGET.
+    """
+    pairs = [(instance, field) for instance in instances for field in fields]
+    if not pairs:
+        return {}
+    keys = [counter_key(instance._meta.label_lower, instance.pk, field) for instance, field in pairs]
+    try:
+        values = _redis().mget(keys)
+    except Exception as e:
+        logger.warning(f"Counter buffer unavailable, pending counts ignored: {e}")
+        return {}
+    return {
+        (instance.pk, field): int(value or 0)
+        for (instance, field), value in zip(pairs, values)
+    }
+
+
+def get_counts(instance, fields=None):
+    """
+    Current counter values for an instance: persisted value plus pending hits.
+
+    Returns:
+        dict: field -> count.
+    """
+    fields = fields or COUNTED_FIELDS[instance._meta.label_lower]
+    pending = get_pending_counts([instance], fields)
+    return {field: getattr(instance, field) + pending.get((instance.pk, field), 0) for field in fields}
+
+
+def merge_pending_counts(instances, fields=None):
+    """Add pending counts onto the counter attributes of loaded instances (not saved)."""
+    instances = list(instances)
+    if not instances:
+        return instances
+    fields = fields or COUNTED_FIELDS[instances[0]._meta.label_lower]
+    pending = get_pending_counts(instances, fields)
+    for instance in instances:
+        for field in fields:
+            setattr(instance, field, getattr(instance, field) + pending.get((instance.pk, field), 0))
+    return instances
+
+
+def flush_counters(batch_size=500):
+    """
+    Apply buffered counter increments to the database.
+
+    Dirty keys are drained in batches; rows receiving the same increment for
+    the same field share one `UPDATE ... SET field = field + n WHERE pk IN (...)`.
+    If the database write fails the drained amounts are put back in Redis.
+    Malformed keys are logged and dropped so they cannot block later flushes.
+    Cache generations are left alone: cached list pages may show counts up
+    to CATALOG_RESPONSE_CACHE_TTL old rather than being dropped on every flush.
+
+    Returns:
+        int: Number of counter keys flushed.
+    """
+    global _drain_script
+    redis = _redis()
+    if _drain_script is None:
+        _drain_script = redis.register_script(DRAIN_SCRIPT)
+
+    flushed = 0
+    while True:
+        keys = redis.spop(DIRTY_SET_KEY, batch_size)
+        if not keys:
+            break
+        values = _drain_script(keys=keys)
+
+        updates = defaultdict(lambda: defaultdict(list))  # (label, field) -> amount -> [pk]
+        drained = []
+        for key, value in zip(keys, values):
+            amount = int(value)
+            if not amount:
+                continue
+            try:
+                label, pk, field = _parse_key(key)
+            except ValueError as e:
+                logger.error(f"Dropping malformed counter key {key!r} ({amount} pending): {e}")
+                continue
+            updates[(label, field)][amount].append(pk)
+            drained.append((key, amount))
+
+        try:
+            with transaction.atomic():
+                for (label, field), by_amount in updates.items():
+                    model = apps.get_model(label)
+                    for amount, pks in by_amount.items():
+                        model.objects.filter(pk__in=pks).update(**{field: F(field) + amount})
+        except Exception:
+            pipe = redis.pipeline(transaction=False)
+            for key, amount in drained:
+                pipe.incrby(key, amount)
+                pipe.sadd(DIRTY_SET_KEY, key)
+            pipe.execute()
+            logger.exception("Counter flush failed; pending counts restored")
+            raise
+        flushed += len(keys)
+
+    if flushed:
+        logger.info(f"Flushed {flushed} buffered counters")
+    return flushed
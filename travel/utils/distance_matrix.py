@@ -0,0 +1,158 @@
+import os
+import logging
+import threading
+import numpy as np
+from django.conf import settings
+from travel.utils.geocoding import geocode_location
+from travel.utils.ors_client import ORS_PROFILES
+
+logger = logging.getLogger(__name__)
+
+
+def matrix_path(profile):
+    if profile not in ORS_PROFILES:
+        raise ValueError(f"Unknown ORS profile: {profile!r}")
+    return os.path.join(settings.DISTANCE_MATRIX_DIR, f"distance_matrix_{profile}.npz")
+
+
+def _destination_points(client=None):
+    """Return ([destination ids], [[lon, lat], ...]) for active destinations that can be located."""
+    from travel.models.destination import Destination
+
+    ids, points = [], []
+    rows = Destination.objects.filter(is_active=True).values_list('id', 'location', 'longitude', 'latitude')
+    for destination_id, location, longitude, latitude in rows.iterator():
+        if longitude is not None and latitude is not None:
+            coords = [longitude, latitude]
+        else:
+            coords = geocode_location(client, location)
+        if coords:
+            ids.append(destination_id)
+            points.append(coords)
+        else:
+            logger.warning(f"Skipping destination {destination_id}: could not geocode {location!r}")
+    return ids, points
+
+
+def build_distance_matrix(client, profile='driving-car', block_size=None):
+    """
+    Compute a full distance/duration matrix across all active destinations.
+
+    The ORS matrix endpoint limits the number of cells per request, so the
+    matrix is filled block by block: each request covers one block of
+    sources against one block of destinations.
+
+    Args:
+        client: OpenRouteService client instance.
+        profile (str): ORS routing profile.
+        block_size (int, optional): Locations per block. Default: `DISTANCE_MATRIX_BLOCK_SIZE`.
+
+    Returns:
+        tuple: (ids, distances in meters, durations in seconds) as NumPy arrays.
+            Unreachable pairs are NaN.
+    """
+    block_size = block_size or settings.DISTANCE_MATRIX_BLOCK_SIZE
+    ids, points = _destination_points(client)
+    size = len(ids)
+    distances = np.full((size, size), np.nan, dtype=np.float32)
+    durations = np.full((size, size), np.nan, dtype=np.float32)
+
+    for row_start in range(0, size, block_size):
+        rows = list(range(row_start, min(row_start + block_size, size)))
+        for col_start in range(0, size, block_size):
+            cols = list(range(col_start, min(col_start + block_size, size)))
+            # Send the union of both blocks once and address it by index
+            locations_index = sorted(set(rows) | set(cols))
+            position = {index: offset for offset, index in enumerate(locations_index)}
+            result = client.distance_matrix(
+                locations=[points[index] for index in locations_index],
+                profile=profile,
+                sources=[position[index] for index in rows],
+                destinations=[position[index] for index in cols],
+                metrics=['distance', 'duration'],
+                units='m',
+            )
+            block_distances = np.array(result['distances'], dtype=np.float32)
+            block_durations = np.array(result['durations'], dtype=np.float32)
+            distances[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1] = block_distances
+            durations[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1] = block_durations
+
+    return np.array(ids, dtype=np.int64), distances, durations
+
+
+def save_distance_matrix(profile, ids, distances, durations):
+    """Write the matrix atomically so readers never see a partial file."""
+    os.makedirs(settings.DISTANCE_MATRIX_DIR, exist_ok=True)
+    path = matrix_path(profile)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, ids=ids, distances=distances, durations=durations)
+    os.replace(tmp_path, path)
+    return path
+
+
+class DistanceMatrix:
+    """
+    Read side of a precomputed matrix, reloaded when the file on disk changes.
+
+    Lookups are two dict/array indexings, so "how far is X from Y" is answered
+    without touching the database or ORS.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._index = {}
+        self._distances = None
+        self._durations = None
+
+    def _ensure_loaded(self):
+        path = matrix_path(self.profile)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return False
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with np.load(path) as data:
+                        self._index = {int(destination_id): i for i, destination_id in enumerate(data['ids'])}
+                        self._distances = data['distances']
+                        self._durations = data['durations']
+                    self._mtime = mtime
+        return True
+
+    def lookup(self, from_id, to_id):
+        """
+        Return the precomputed distance and duration between two destinations.
+
+        Returns:
+            dict: distance_km and duration_minutes, or None if either destination
+                is not in the matrix or the pair is unreachable.
+        """
+        if not self._ensure_loaded():
+            return None
+        i = self._index.get(int(from_id))
+        j = self._index.get(int(to_id))
+        if i is None or j is None:
+            return None
+        distance, duration = self._distances[i, j], self._durations[i, j]
+        if np.isnan(distance) or np.isnan(duration):
+            return None
+        return {
+            'distance_km': round(float(distance) / 1000, 2),
+            'duration_minutes': round(float(duration) / 60, 2),
+        }
+
+
+_matrices = {}
+
+
+def get_distance_matrix(profile='driving-car'):
+    """Process-wide matrix for a profile. Raises ValueError for profiles not in ORS_PROFILES."""
+    if profile not in ORS_PROFILES:
+        raise ValueError(f"Unknown ORS profile: {profile!r}")
+    matrix = _matrices.get(profile)
+    if matrix is None:
+        matrix = _matrices.setdefault(profile, DistanceMatrix(profile))
+    return matrix
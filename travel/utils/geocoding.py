@@ -0,0 +1,287 @@
+import re
+import logging
+import unicodedata
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from ai_driven_travel_platform.caching import LRUCache, make_cache_key
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_NAMESPACE = 'geocode'
+
+# Well-known Ethiopian places resolved without any lookup: display name -> ([lon, lat], aliases)
+BUILTIN_GAZETTEER = {
+    'Addis Ababa': ([38.7469, 9.0250], ['addis', 'addis abeba', 'finfinne']),
+    'Gondar': ([37.4667, 12.6000], ['gonder']),
+    'Lalibela': ([39.0476, 12.0317], ['lalibella']),
+    'Axum': ([38.7231, 14.1211], ['aksum']),
+    'Bahir Dar': ([37.3903, 11.5936], ['bahar dar', 'bahirdar']),
+    'Mekelle': ([39.4753, 13.4967], ['mekele', 'makelle']),
+    'Harar': ([42.1188, 9.3126], ['harer']),
+    'Dire Dawa': ([41.8661, 9.5931], ['diredawa']),
+    'Hawassa': ([38.4763, 7.0621], ['awasa', 'awassa']),
+    'Arba Minch': ([37.5500, 6.0333], ['arbaminch']),
+    'Jinka': ([36.5500, 5.7833], []),
+    'Adama': ([39.2705, 8.5400], ['nazret', 'nazareth']),
+    'Bishoftu': ([38.9833, 8.7500], ['debre zeyit', 'debre zeit']),
+    'Jimma': ([36.8344, 7.6733], []),
+    'Dessie': ([39.6333, 11.1333], ['dese']),
+    'Simien Mountains': ([38.0667, 13.2500], ['simien mountains national park', 'semien mountains']),
+    'Danakil Depression': ([40.2990, 14.2417], ['dallol', 'danakil']),
+}
+
+_lru = LRUCache(maxsize=settings.GEOCODE_LRU_SIZE, ttl=settings.GEOCODE_LRU_TTL)
+_builtin_index = None
+
+
+def normalize_place_name(name):
+    """
+    Normalize a free-text place name for cache and gazetteer lookups.
+
+    Lowercases, strips accents and punctuation, collapses whitespace and drops
+    a trailing country name, so "Gondar, Ethiopia" and "  gondar " share a key.
+    """
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"['’`]", '', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = ' '.join(text.split())
+    stripped = re.sub(r'\s*\bethiopia$', '', text).strip()
+    return stripped or text
+
+
+def _cache_key(normalized):
+    return make_cache_key(GEOCODE_NAMESPACE, normalized)
+
+
+def _get_builtin_index():
+    global _builtin_index
+    if _builtin_index is None:
+        index = {}
+        for display_name, (coords, aliases) in BUILTIN_GAZETTEER.items():
+            for alias in [display_name, *aliases]:
+                index[normalize_place_name(alias)] = coords
+        _builtin_index = index
+    return _builtin_index
+
+
+def lookup_gazetteer(normalized):
+    """
+    Resolve a normalized place name from the local gazetteer only.
+
+    Returns:
+        list: [longitude, latitude] or None if the place is unknown locally.
+    """
+    coords = _get_builtin_index().get(normalized)
+    if coords:
+        return list(coords)
+    from travel.models.gazetteer import GazetteerEntry
+    row = GazetteerEntry.objects.filter(name=normalized).values_list('longitude', 'latitude').first()
+    return list(row) if row else None
+
+
+def _first_feature_coords(geocode):
+    if geocode and geocode.get('features'):
+        coords = geocode['features'][0]['geometry']['coordinates']
+        return [coords[0], coords[1]]  # [longitude, latitude]
+    return None
+
+
+def _geocode_remote(client, location):
+    """Geocode with ORS Pelias. Returns None when nothing matches; raises on API errors."""
+    return _first_feature_coords(client.pelias_search(text=location))
+
+
+def _cached_coords(normalized):
+    """Coordinates from the LRU or shared cache; [] for a cached miss, None if not cached."""
+    coords = _lru.get(normalized)
+    if coords is not None:
+        return coords
+    coords = cache.get(_cache_key(normalized))
+    if coords is not None:
+        _lru.set(normalized, coords)
+    return coords
+
+
+def _remember(normalized, coords):
+    """Write a lookup result to both cache tiers; None records a short-lived miss."""
+    if coords is None:
+        cache.set(_cache_key(normalized), [], settings.GEOCODE_NEGATIVE_TTL)
+        _lru.set(normalized, [])
+    else:
+        cache.set(_cache_key(normalized), coords, settings.GEOCODE_CACHE_TTL)
+        _lru.set(normalized, coords)
+
+
+def geocode_location(client, location):
+    """
+    Geocode a location name to coordinates.
+
+    Lookups go through an in-process LRU, then the shared Redis cache, then
+    the local gazetteer (built-in places plus seeded destination/business
+    locations), and only then OpenRouteService. Results are written back to
+    the cache tiers; places ORS cannot find are cached briefly as misses.
+
+    Args:
+        client: OpenRouteService client instance, or None to skip the network tier.
+        location (str): Location name or address.
+
+    Returns:
+        list: [longitude, latitude] or None if geocoding fails.
+    """
+    normalized = normalize_place_name(location)
+    if not normalized:
+        return None
+
+    coords = _cached_coords(normalized)
+    if coords is not None:
+        return coords or None
+
+    coords = lookup_gazetteer(normalized)
+    if coords is None and client is not None:
+        try:
+            coords = _geocode_remote(client, location)
+        except (RateLimitExceeded, CircuitOpen):
+            raise
+        except Exception as e:
+            logger.error(f"Geocoding error for {location}: {e}")
+            return None
+        if coords is None:
+            _remember(normalized, None)
+            return None
+    if coords is None:
+        return None
+
+    _remember(normalized, coords)
+    return coords
+
+
+async def ageocode_location(client, location):
+    """
+    `geocode_location` for async handlers.
+
+    Only the in-process LRU is read on the event loop; shared cache and
+    gazetteer lookups run on a worker thread.
+
+    Args:
+        client: AsyncORSClient, or None to skip the network tier.
+        location (str): Location name or address.
+    """
+    normalized = normalize_place_name(location)
+    if not normalized:
+        return None
+
+    coords = _lru.get(normalized)
+    if coords is None:
+        coords = await sync_to_async(_cached_coords, thread_sensitive=False)(normalized)
+    if coords is not None:
+        return coords or None
+
+    coords = await sync_to_async(lookup_gazetteer)(normalized)
+    if coords is None and client is not None:
+        try:
+            coords = _first_feature_coords(await client.pelias_search(location))
+        except (RateLimitExceeded, CircuitOpen):
+            raise
+        except Exception as e:
+            logger.error(f"Geocoding error for {location}: {e}")
+            return None
+        if coords is None:
+            await sync_to_async(_remember, thread_sensitive=False)(normalized, None)
+            return None
+    if coords is None:
+        return None
+
+    await sync_to_async(_remember, thread_sensitive=False)(normalized, coords)
+    return coords
+
+
+def warm_geocode_cache(client=None):
+    """
+    Seed the gazetteer and the shared cache with every known place.
+
+    Built-in places are pushed to Redis. Distinct `Destination.location` and
+    `Business.location` values that are not yet in the gazetteer are resolved
+    once through `client` (when given) and stored as gazetteer entries.
+
+    Returns:
+        dict: Counts of cached, seeded and unresolved place names.
+    """
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+    from travel.models.gazetteer import GazetteerEntry
+
+    stats = {'cached': 0, 'seeded': 0, 'unresolved': []}
+    for display_name, (coords, aliases) in BUILTIN_GAZETTEER.items():
+        for alias in [display_name, *aliases]:
+            cache.set(_cache_key(normalize_place_name(alias)), list(coords), settings.GEOCODE_CACHE_TTL)
+            stats['cached'] += 1
+
+    sources = [
+        ('destination', Destination.objects.values_list('location', flat=True).distinct()),
+        ('business', Business.objects.values_list('location', flat=True).distinct()),
+    ]
+    for source, locations in sources:
+        for location in locations:
+            normalized = normalize_place_name(location)
+            if not normalized:
+                continue
+            coords = lookup_gazetteer(normalized)
+            if coords is None and client is not None:
+                try:
+                    coords = _geocode_remote(client, location)
+                except Exception as e:
+                    logger.error(f"Geocoding error for {location}: {e}")
+                if coords:
+                    GazetteerEntry.objects.update_or_create(
+                        name=normalized,
+                        defaults={
+                            'display_name': location.strip(),
+                            'longitude': coords[0],
+                            'latitude': coords[1],
+                            'source': source,
+                        },
+                    )
+                    stats['seeded'] += 1
+            if coords is None:
+                stats['unresolved'].append(location)
+                continue
+            cache.set(_cache_key(normalized), coords, settings.GEOCODE_CACHE_TTL)
+            stats['cached'] += 1
+    return stats
+
+
+def invalidate_geocode(names=None, delete_gazetteer=False):
+    """
+    Drop cached coordinates for the given place names, or for every place.
+
+    Other worker processes drop their in-process copies once
+    `GEOCODE_LRU_TTL` expires.
+
+    Args:
+        names (list, optional): Place names to invalidate. Default: all.
+        delete_gazetteer (bool): Also delete matching (non built-in) gazetteer entries.
+
+    Returns:
+        int: Number of names invalidated, or -1 when the whole cache was cleared.
+    """
+    from travel.models.gazetteer import GazetteerEntry
+
+    if names is None:
+        _lru.clear()
+        if hasattr(cache, 'delete_pattern'):
+            cache.delete_pattern(f"{GEOCODE_NAMESPACE}:*")
+        if delete_gazetteer:
+            GazetteerEntry.objects.exclude(source='builtin').delete()
+        return -1
+
+    normalized_names = [normalize_place_name(name) for name in names]
+    for normalized in normalized_names:
+        _lru.delete(normalized)
+        cache.delete(_cache_key(normalized))
+    if delete_gazetteer:
+        GazetteerEntry.objects.filter(name__in=normalized_names).exclude(source='builtin').delete()
+    return len(normalized_names)
@@ -0,0 +1,79 @@
+import math
+
+
+def encode_polyline(coordinates, precision=5):
+    """
+    Encode [lon, lat] coordinates with the Google encoded polyline algorithm.
+
+    Args:
+        coordinates (list): Sequence of [longitude, latitude] pairs (GeoJSON order).
+        precision (int): Decimal places kept. Default: 5 (~1 m).
+
+    Returns:
+        str: Encoded polyline (latitude first, as the format expects).
+    """
+    factor = 10 ** precision
+    output = []
+    prev_lat = prev_lon = 0
+    for lon, lat, *_ in coordinates:
+        lat_i = int(round(lat * factor))
+        lon_i = int(round(lon * factor))
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                output.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            output.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+    return ''.join(output)
+
+
+def tolerance_for_zoom(zoom, pixels=1.0):
+    """
+    Simplification tolerance in degrees for a web-map zoom level.
+
+    One 256 px tile spans 360 degrees at zoom 0, so detail smaller than
+    `pixels` screen pixels at `zoom` can be dropped without a visible change.
+    """
+    zoom = max(0, min(20, zoom))
+    return pixels * 360.0 / (256 * (2 ** zoom))
+
+
+def _perpendicular_distance(point, start, end):
+    if start == end:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    return abs(dy * point[0] - dx * point[1] + end[0] * start[1] - end[1] * start[0]) / math.hypot(dx, dy)
+
+
+def simplify_line(coordinates, tolerance):
+    """
+    Simplify a line with the Douglas-Peucker algorithm.
+
+    Iterative, so very long routes do not hit the recursion limit.
+
+    Args:
+        coordinates (list): Sequence of [longitude, latitude] pairs.
+        tolerance (float): Maximum allowed deviation in degrees.
+
+    Returns:
+        list: The retained coordinates, always including both endpoints.
+    """
+    if len(coordinates) < 3:
+        return list(coordinates)
+
+    keep = [False] * len(coordinates)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coordinates) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _perpendicular_distance(coordinates[i], coordinates[first], coordinates[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [coords for coords, kept in zip(coordinates, keep) if kept]
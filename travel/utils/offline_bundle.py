@@ -0,0 +1,107 @@
+import io
+import json
+import hashlib
+import zipfile
+import logging
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from travel.utils.geocoding import normalize_place_name
+from travel.utils.places import fetch_attractions
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_DIRECTORY = 'offline_bundles'
+# Fixed timestamp so identical content always zips to identical bytes
+ZIP_TIMESTAMP = (2020, 1, 1, 0, 0, 0)
+
+
+def bundle_request_hash(location, area_km):
+    """Identify a bundle request by normalized location and area rounded to 100 m."""
+    key = json.dumps([BUNDLE_FORMAT_VERSION, normalize_place_name(location), round(float(area_km), 1)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _region_codes(regions, choices):
+    """Map free-text region names to TravelGuide region codes."""
+    wanted = {region.strip().lower() for region in regions if region}
+    return [code for code, label in choices if code in wanted or label.lower() in wanted]
+
+
+def collect_bundle_content(client, location, coords, area_km):
+    """
+    Gather everything an offline package for a location contains.
+
+    Returns:
+        dict: File name -> JSON-serializable content.
+    """
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+    from travel.models.travel_guide import TravelGuide
+    from travel.serializers import BusinessSerializer, DestinationSerializer
+
+    isochrone = client.isochrones(
+        locations=[coords],
+        range=[area_km * 1000],  # Distance in meters
+        range_type='distance'
+    )
+    attractions = fetch_attractions(client, coords, area_km * 1000)
+
+    place_filter = Q(location__icontains=location) | Q(region__icontains=location)
+    destinations = Destination.objects.filter(place_filter, is_active=True).order_by('id')
+    businesses = Business.objects.filter(place_filter, is_active=True).order_by('id')
+
+    regions = set(destinations.values_list('region', flat=True)) | {location}
+    guides = (
+        TravelGuide.objects
+        .filter(Q(region__in=_region_codes(regions, TravelGuide.REGION_CHOICES)) | Q(title__icontains=location), is_active=True)
+        .order_by('id')
+        .values('id', 'title', 'guide_type', 'region', 'offline_content')
+    )
+
+    return {
+        'manifest.json': {
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'location': location,
+            'center': coords,
+            'area_km': area_km,
+        },
+        'isochrone.geojson': isochrone,
+        'attractions.json': attractions,
+        'destinations.json': DestinationSerializer(destinations, many=True).data,
+        'businesses.json': BusinessSerializer(businesses, many=True).data,
+        'guides.json': [guide for guide in guides if guide['offline_content']],
+    }
+
+
+def package_bundle(content):
+    """
+    Zip bundle content deterministically.
+
+    Returns:
+        tuple: (zip bytes, sha256 hex digest of the bytes)
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in sorted(content):
+            info = zipfile.ZipInfo(name, date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            data = json.dumps(content[name], sort_keys=True, separators=(',', ':'), default=str)
+            archive.writestr(info, data)
+    payload = buffer.getvalue()
+    return payload, hashlib.sha256(payload).hexdigest()
+
+
+def store_bundle(payload, content_hash):
+    """
+    Save a package under its content hash, reusing an identical stored file.
+
+    Returns:
+        str: Storage name of the package.
+    """
+    name = f"{BUNDLE_DIRECTORY}/{content_hash}.zip"
+    if default_storage.exists(name):
+        logger.info(f"Reusing stored offline bundle {name}")
+        return name
+    return default_storage.save(name, ContentFile(payload))
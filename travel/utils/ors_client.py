@@ -0,0 +1,218 @@
+import os
+import logging
+import threading
+import httpx
+import requests
+import openrouteservice
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from ai_driven_travel_platform.async_http import get_async_client
+from ai_driven_travel_platform.circuit_breaker import get_breaker
+from ai_driven_travel_platform.metrics import track_upstream
+from ai_driven_travel_platform.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# ORS URL path prefix -> quota bucket in settings.ORS_RATE_LIMITS
+ORS_ENDPOINT_BUCKETS = [
+    ('/geocode', 'geocode'),
+    ('/v2/directions', 'directions'),
+    ('/v2/isochrones', 'isochrones'),
+    ('/v2/matrix', 'matrix'),
+    ('/pois', 'pois'),
+]
+
+# Routing profiles ORS supports
+ORS_PROFILES = (
+    'driving-car', 'driving-hgv', 'cycling-regular', 'cycling-road', 'cycling-mountain',
+    'cycling-electric', 'foot-walking', 'foot-hiking', 'wheelchair',
+)
+
+
+def is_ors_failure(error):
+    """True for errors that mean ORS itself is unhealthy (timeouts, 5xx, quota), not a bad request."""
+    if isinstance(error, openrouteservice.exceptions.ApiError):
+        status_code = error.status if isinstance(error.status, int) else 0
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, (
+        openrouteservice.exceptions.Timeout,
+        openrouteservice.exceptions.HTTPError,
+        requests.RequestException,
+    ))
+
+
+def build_buckets():
+    """One shared token bucket per ORS quota in settings.ORS_RATE_LIMITS."""
+    return {name: TokenBucket(f"ors:{name}", per_minute) for name, per_minute in settings.ORS_RATE_LIMITS.items()}
+
+
+def bucket_for(buckets, url):
+    for prefix, name in ORS_ENDPOINT_BUCKETS:
+        if url.startswith(prefix):
+            return buckets.get(name, buckets['default'])
+    return buckets['default']
+
+
+class ThrottledORSClient(openrouteservice.Client):
+    """
+    openrouteservice.Client that draws from a shared per-endpoint token bucket
+    before every HTTP attempt, including the library's own retries.
+
+    Requests wait up to `rate_limit_wait` seconds (default `ORS_RATE_LIMIT_WAIT`)
+    for quota and then raise RateLimitExceeded instead of hammering ORS into 429s.
+    Every call also goes through the "ors" circuit breaker, which raises
+    CircuitOpen while ORS is failing or too many calls are already in flight.
+    """
+
+    def __init__(self, *args, rate_limit_wait=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limit_wait = settings.ORS_RATE_LIMIT_WAIT if rate_limit_wait is None else rate_limit_wait
+        self._buckets = build_buckets()
+
+    def request(self, url, *args, **kwargs):
+        if kwargs.get('dry_run'):
+            return super().request(url, *args, **kwargs)
+        breaker = get_breaker('ors')
+        breaker.check()  # Fail fast before waiting for quota
+        bucket_for(self._buckets, url).acquire(timeout=self.rate_limit_wait)
+        with breaker.guard(is_ors_failure), track_upstream('ors'):
+            return super().request(url, *args, **kwargs)
+
+
+class AsyncORSClient:
+    """
+    Async ORS client for the native ASGI views, on the event loop's shared httpx pool.
+
+    Covers the endpoints those views use with the same method names and
+    results as openrouteservice.Client, under the same quotas and circuit
+    breaker. Error responses raise openrouteservice ApiError (transport
+    failures as 502, timeouts as 504), so callers handle both clients alike.
+    Unlike the sync client it does not retry 503/504; the breaker decides.
+    """
+
+    def __init__(self, rate_limit_wait=None):
+        self.api_key = settings.ORS_API_KEY
+        self.base_url = settings.ORS_BASE_URL.rstrip('/')
+        self.timeout = settings.ORS_TIMEOUT
+        self.rate_limit_wait = settings.ORS_RATE_LIMIT_WAIT if rate_limit_wait is None else rate_limit_wait
+        self._buckets = build_buckets()
+
+    async def request(self, url, params=None, post_json=None):
+        breaker = get_breaker('ors')
+        await breaker.acheck()  # Fail fast before waiting for quota
+        await bucket_for(self._buckets, url).acquire_async(timeout=self.rate_limit_wait)
+        async with breaker.aguard(is_ors_failure):
+            with track_upstream('ors'):
+                try:
+                    response = await get_async_client().request(
+                        'POST' if post_json is not None else 'GET',
+                        f"{self.base_url}{url}",
+                        params=params,
+                        json=post_json,
+                        headers={'Authorization': self.api_key or ''},
+                        timeout=self.timeout,
+                    )
+                except httpx.TimeoutException as e:
+                    raise openrouteservice.exceptions.ApiError(504, f"ORS request timed out: {e}")
+                except httpx.HTTPError as e:
+                    raise openrouteservice.exceptions.ApiError(502, f"ORS request failed: {e}")
+                try:
+                    body = response.json()
+                except ValueError:
+                    raise openrouteservice.exceptions.ApiError(response.status_code, response.text[:500])
+                if response.status_code != 200:
+                    raise openrouteservice.exceptions.ApiError(response.status_code, body)
+                return body
+
+    async def pelias_search(self, text):
+        return await self.request('/geocode/search', params={'text': text})
+
+    async def directions(self, coordinates, profile='driving-car', format='geojson'):
+        return await self.request(f"/v2/directions/{profile}/{format}", post_json={'coordinates': coordinates})
+
+    async def isochrones(self, locations, profile='driving-car', range=None, range_type='time'):
+        return await self.request(
+            f"/v2/isochrones/{profile}/geojson",
+            post_json={'locations': locations, 'range': range, 'range_type': range_type},
+        )
+
+    async def pois(self, body):
+        """POST a raw /pois request body (see places.poi_request)."""
+        return await self.request('/pois', post_json=body)
+
+
+def build_ors_client(**overrides):
+    """Create a throttled ORS client from settings; batch jobs pass a longer `rate_limit_wait`."""
+    options = {
+        'key': settings.ORS_API_KEY,
+        'base_url': settings.ORS_BASE_URL,
+        'timeout': settings.ORS_TIMEOUT,
+        'retry_timeout': settings.ORS_RETRY_TIMEOUT,
+        'retry_over_query_limit': False,  # The shared limiter paces requests instead
+    }
+    options.update(overrides)
+    return ThrottledORSClient(**options)
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_ors_client():
+    """
+    Return the process-wide ORS client.
+
+    One client (and so one pooled `requests.Session`) is shared by every
+    request in a worker process and recreated after a fork.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = build_ors_client()
+                _client_pid = pid
+    return _client
+
+
+_async_client = None
+
+
+def get_async_ors_client():
+    """Return the process-wide AsyncORSClient; HTTP connections are pooled per event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncORSClient()
+    return _async_client
+
+
+def quota_exceeded_payload(error):
+    """(data, status, headers) for RateLimitExceeded or CircuitOpen, telling the client when to retry."""
+    logger.warning(str(error))
+    retry_after = max(1, int(round(error.retry_after)))
+    return (
+        {"error": "Map service is busy, please retry shortly", "retry_after": retry_after},
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        {'Retry-After': str(retry_after)},
+    )
+
+
+def quota_exceeded_response(error):
+    """503 response for RateLimitExceeded or CircuitOpen."""
+    data, status_code, headers = quota_exceeded_payload(error)
+    return Response(data, status=status_code, headers=headers)
+
+
+def ors_error_payload(error):
+    """(data, status) for an ORS ApiError: 400 when ORS rejected the request, 502 when ORS itself failed."""
+    logger.error(f"OpenRouteService API error: {error}")
+    if is_ors_failure(error):
+        return {"error": "Map service error, please retry shortly"}, status.HTTP_502_BAD_GATEWAY
+    return {"error": f"OpenRouteService API error: {error}"}, status.HTTP_400_BAD_REQUEST
+
+
+def ors_error_response(error):
+    data, status_code = ors_error_payload(error)
+    return Response(data, status=status_code)
@@ -0,0 +1,114 @@
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+from .spatial_index import nearby_catalog
+
+logger = logging.getLogger(__name__)
+
+ATTRACTION_CATEGORY_IDS = [206, 208, 220]  # Tourist attractions, museums, historical sites
+MAX_POI_BUFFER_M = 2000  # ORS POI search buffer limit
+
+
+def poi_request(coords, radius):
+    """ORS /pois request body for tourist attractions within `radius` meters of `coords`, nearest first."""
+    return {
+        'request': 'pois',
+        'geometry': {
+            'geojson': {
+                'type': 'Point',
+                'coordinates': coords
+            },
+            'buffer': min(int(radius), MAX_POI_BUFFER_M),  # Buffer in meters
+        },
+        'filters': {
+            'category_ids': ATTRACTION_CATEGORY_IDS
+        },
+        'sortby': 'distance'
+    }
+
+
+def parse_attractions(places):
+    return [
+        {
+            "name": feature.get('properties', {}).get('name', 'Unnamed'),
+            "distance_m": feature.get('properties', {}).get('distance', 0),
+            "coordinates": feature['geometry']['coordinates']
+        }
+        for feature in places.get('features', [])
+    ]
+
+
+def fetch_attractions(client, coords, radius):
+    """
+    Find tourist attractions around a point using the OpenRouteService POI service.
+
+    Args:
+        client: OpenRouteService client instance.
+        coords (list): [longitude, latitude] of the center.
+        radius (int): Search radius in meters (capped at the ORS buffer limit).
+
+    Returns:
+        list: Attractions with name, distance_m and coordinates, nearest first.
+    """
+    body = poi_request(coords, radius)
+    logger.debug(f"POI request body: {body}")
+    return parse_attractions(client.request('/pois', {}, post_json=body))
+
+
+async def afetch_attractions(client, coords, radius):
+    """`fetch_attractions` for async handlers; `client` is an AsyncORSClient."""
+    return parse_attractions(await client.pois(poi_request(coords, radius)))
+
+
+def merge_attractions(attractions, pois):
+    """Add ORS POIs not already in the catalog results, nearest first."""
+    known = {attraction['name'].lower() for attraction in attractions}
+    for poi in pois:
+        if poi['name'].lower() not in known:
+            attractions.append(dict(poi, type='poi'))
+    attractions.sort(key=lambda attraction: attraction['distance_m'])
+    return attractions
+
+
+def nearby_results(client, coords, radius, bbox=None, limit=20):
+    """
+    Catalog destinations and businesses near `coords`, topped up with ORS POIs.
+
+    ORS is only queried when fewer than NEARBY_MIN_LOCAL_RESULTS catalog
+    entries are found, and skipped when it is unavailable but the catalog
+    had some results.
+
+    Returns:
+        tuple: (attractions, source), source being "catalog" or "catalog+ors".
+
+    Raises:
+        RateLimitExceeded, CircuitOpen: ORS is unavailable and the catalog had nothing.
+    """
+    attractions = nearby_catalog(coords[0], coords[1], radius_m=radius, bbox=bbox, limit=limit)
+    if len(attractions) >= settings.NEARBY_MIN_LOCAL_RESULTS:
+        return attractions, 'catalog'
+    try:
+        pois = fetch_attractions(client, coords, radius)
+    except (RateLimitExceeded, CircuitOpen) as e:
+        if not attractions:
+            raise
+        logger.warning(f"Serving catalog results only near {coords}: {e}")
+        return attractions, 'catalog'
+    return merge_attractions(attractions, pois), 'catalog+ors'
+
+
+async def anearby_results(client, coords, radius, bbox=None, limit=20):
+    """`nearby_results` for async handlers; `client` is an AsyncORSClient."""
+    attractions = await sync_to_async(nearby_catalog)(coords[0], coords[1], radius_m=radius, bbox=bbox, limit=limit)
+    if len(attractions) >= settings.NEARBY_MIN_LOCAL_RESULTS:
+        return attractions, 'catalog'
+    try:
+        pois = await afetch_attractions(client, coords, radius)
+    except (RateLimitExceeded, CircuitOpen) as e:
+        if not attractions:
+            raise
+        logger.warning(f"Serving catalog results only near {coords}: {e}")
+        return attractions, 'catalog'
+    return merge_attractions(attractions, pois), 'catalog+ors'
@@ -0,0 +1,109 @@
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from ai_driven_travel_platform.caching import bump_generation
+
+logger = logging.getLogger(__name__)
+
+
+def apply_rating_delta(model, pk, sum_delta, count_delta):
+    """
+    Atomically adjust the running rating aggregates of one Destination or Business.
+
+    `rating_sum` and `review_count` are plain `F()` increments, which djongo
+    translates to `$inc`; `average_rating` is then derived from the stored
+    totals in a second UPDATE. The cost is O(1) however many reviews exist.
+    Concurrent reviews of the same row can leave the average briefly behind
+    the totals; the nightly reconcile_rating_aggregates() repairs any drift.
+
+    Args:
+        model: Destination or Business.
+        pk: Primary key of the rated object.
+        sum_delta (int): Change in the sum of ratings.
+        count_delta (int): Change in the number of reviews.
+    """
+    if pk is None or (sum_delta == 0 and count_delta == 0):
+        return
+    queryset = model.objects.filter(pk=pk)
+    queryset.update(
+        rating_sum=F('rating_sum') + sum_delta,
+        review_count=F('review_count') + count_delta,
+        updated_at=timezone.now(),  # Invalidates HTTP validators and spatial index rows
+    )
+    totals = queryset.values_list('rating_sum', 'review_count').first()
+    if totals is not None:
+        queryset.update(average_rating=average_of(*totals))
+    label = model._meta.label_lower
+    transaction.on_commit(lambda: bump_generation(label))
+
+
+def apply_likes_delta(review_model, pk, delta):
+    """Atomically adjust a review's denormalized like counter."""
+    review_model.objects.filter(pk=pk).update(likes_count=F('likes_count') + delta)
+
+
+def average_of(rating_sum, review_count):
+    if not review_count:
+        return Decimal('0')
+    return (Decimal(rating_sum) / Decimal(review_count)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def reconcile_rating_aggregates(model, review_model, field):
+    """
+    Recompute rating aggregates from the reviews and repair any drift.
+
+    Uses one grouped aggregate query over the reviews and only writes rows
+    whose stored values differ.
+
+    Args:
+        model: Destination or Business.
+        review_model: Review.
+        field (str): Review foreign key pointing at `model` ("destination" or "business").
+
+    Returns:
+        int: Number of rows repaired.
+    """
+    actual = {
+        row[field]: (row['total'], row['count'])
+        for row in review_model.objects.filter(**{f"{field}__isnull": False})
+        .values(field)
+        .annotate(total=Sum('rating'), count=Count('id'))
+        .order_by()
+    }
+    repaired = 0
+    stored = model.objects.values_list('pk', 'rating_sum', 'review_count', 'average_rating')
+    for pk, rating_sum, review_count, average_rating in stored.iterator():
+        total, count = actual.get(pk, (0, 0))
+        average = average_of(total, count)
+        if (rating_sum, review_count, average_rating) != (total, count, average):
+            model.objects.filter(pk=pk).update(
+                rating_sum=total, review_count=count, average_rating=average, updated_at=timezone.now()
+            )
+            repaired += 1
+    if repaired:
+        bump_generation(model._meta.label_lower)
+        logger.warning(f"Repaired rating aggregates for {repaired} {model.__name__} rows")
+    return repaired
+
+
+def reconcile_likes_counts(review_model, like_model):
+    """
+    Recompute review like counters from ReviewLike rows and repair any drift.
+
+    Returns:
+        int: Number of reviews repaired.
+    """
+    actual = dict(
+        like_model.objects.values('review').annotate(count=Count('id')).order_by().values_list('review', 'count')
+    )
+    repaired = 0
+    for pk, likes_count in review_model.objects.values_list('pk', 'likes_count').iterator():
+        count = actual.get(pk, 0)
+        if likes_count != count:
+            review_model.objects.filter(pk=pk).update(likes_count=count)
+            repaired += 1
+    if repaired:
+        logger.warning(f"Repaired like counters for {repaired} reviews")
+    return repaired
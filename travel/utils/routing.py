@@ -0,0 +1,85 @@
+import logging
+from django.conf import settings
+from ai_driven_travel_platform.caching import LRUCache, make_cache_key, aget_or_set_single_flight, get_or_set_single_flight
+
+logger = logging.getLogger(__name__)
+
+ROUTE_NAMESPACE = 'route'
+
+_lru = LRUCache(maxsize=settings.ROUTE_LRU_SIZE, ttl=settings.ROUTE_LRU_TTL)
+
+
+def quantize_coords(coords, precision=None):
+    """
+    Snap [lon, lat] onto the route cache grid.
+
+    With the default precision of 3 decimals the grid is roughly 100 m, so
+    requests for the same town or landmark share a cached route.
+    """
+    precision = settings.ROUTE_GRID_PRECISION if precision is None else precision
+    return [round(float(coords[0]), precision), round(float(coords[1]), precision)]
+
+
+def get_route(client, start_coords, end_coords, profile='driving-car'):
+    """
+    Return the ORS GeoJSON route between two points, served from cache when possible.
+
+    Coordinates are quantized to the grid before both the cache lookup and
+    the ORS request, so a cached route is exactly what ORS returned for the
+    grid points. Routes live in a size-bounded in-process LRU in front of
+    Redis (`ROUTE_CACHE_TTL`); concurrent misses for one key share a call.
+    Expired routes are kept for `ROUTE_STALE_TTL` and served if ORS fails.
+
+    Args:
+        client: OpenRouteService client instance.
+        start_coords (list): [longitude, latitude] of the start.
+        end_coords (list): [longitude, latitude] of the end.
+        profile (str): ORS routing profile.
+
+    Returns:
+        dict: GeoJSON FeatureCollection from `client.directions`.
+    """
+    start = quantize_coords(start_coords)
+    end = quantize_coords(end_coords)
+    key = make_cache_key(ROUTE_NAMESPACE, profile, start, end)
+
+    route = _lru.get(key)
+    if route is not None:
+        return route
+
+    route = get_or_set_single_flight(
+        key,
+        lambda: client.directions(coordinates=[start, end], profile=profile, format='geojson'),
+        settings.ROUTE_CACHE_TTL,
+        stats_namespace=ROUTE_NAMESPACE,
+        stale_ttl=settings.ROUTE_STALE_TTL,
+    )
+    _lru.set(key, route)
+    return route
+
+
+async def aget_route(client, start_coords, end_coords, profile='driving-car'):
+    """`get_route` for async handlers; `client` is an AsyncORSClient."""
+    start = quantize_coords(start_coords)
+    end = quantize_coords(end_coords)
+    key = make_cache_key(ROUTE_NAMESPACE, profile, start, end)
+
+    route = _lru.get(key)
+    if route is not None:
+        return route
+
+    route = await aget_or_set_single_flight(
+        key,
+        lambda: client.directions(coordinates=[start, end], profile=profile, format='geojson'),
+        settings.ROUTE_CACHE_TTL,
+        stats_namespace=ROUTE_NAMESPACE,
+        stale_ttl=settings.ROUTE_STALE_TTL,
+    )
+    _lru.set(key, route)
+    return route
+
+
+def route_summary(route):
+    """Return (distance in meters, duration in seconds) of the first route segment."""
+    segment = route['features'][0]['properties']['segments'][0]
+    return segment['distance'], segment['duration']
@@ -0,0 +1,233 @@
+import math
+import logging
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'spatial:generation'
+REBUILD_TOKEN_KEY = 'spatial:rebuild-token'
+EARTH_RADIUS_M = 6371008.8
+
+# Entry type -> (model label, extra queryset filter)
+SPATIAL_SOURCES = {
+    'destination': ('travel.destination', {'is_active': True}),
+    'business': ('travel.business', {'is_active': True, 'is_verified': True}),
+}
+
+
+def haversine_m(lon1, lat1, lon2, lat2):
+    """Great-circle distance in meters between two [lon, lat] points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    """
+    Uniform lon/lat grid over catalog points.
+
+    Each point lives in one cell of `cell_degrees` size; radius and bounding
+    box queries only look at the cells overlapping the query area, then
+    filter exactly.
+    """
+
+    def __init__(self, cell_degrees=None):
+        self.cell_degrees = cell_degrees or settings.SPATIAL_GRID_DEGREES
+        self._lock = threading.RLock()
+        self.cells = defaultdict(set)
+        self.points = {}  # key -> (lon, lat, cell)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell(self, lon, lat):
+        return (math.floor(lon / self.cell_degrees), math.floor(lat / self.cell_degrees))
+
+    def upsert(self, key, lon, lat):
+        with self._lock:
+            self.remove(key)
+            cell = self._cell(lon, lat)
+            self.points[key] = (lon, lat, cell)
+            self.cells[cell].add(key)
+
+    def remove(self, key):
+        with self._lock:
+            entry = self.points.pop(key, None)
+            if entry is not None:
+                members = self.cells[entry[2]]
+                members.discard(key)
+                if not members:
+                    del self.cells[entry[2]]
+
+    def _candidates(self, min_lon, min_lat, max_lon, max_lat):
+        (x0, y0), (x1, y1) = self._cell(min_lon, min_lat), self._cell(max_lon, max_lat)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            yield from self.points
+            return
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield from self.cells.get((x, y), ())
+
+    def within_radius(self, lon, lat, radius_m, types=None):
+        """
+        Points within `radius_m` of [lon, lat].
+
+        Returns:
+            list: (key, distance_m) pairs, nearest first.
+        """
+        lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+        lon_delta = lat_delta / max(0.01, math.cos(math.radians(lat)))
+        results = []
+        with self._lock:
+            for key in self._candidates(lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta):
+                if types and key[0] not in types:
+                    continue
+                point_lon, point_lat, _ = self.points[key]
+                distance = haversine_m(lon, lat, point_lon, point_lat)
+                if distance <= radius_m:
+                    results.append((key, distance))
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def within_bbox(self, min_lon, min_lat, max_lon, max_lat, center=None, types=None):
+        """
+        Points inside a bounding box, sorted by distance from `center` (default: box center).
+
+        Returns:
+            list: (key, distance_m) pairs.
+        """
+        center_lon, center_lat = center or ((min_lon + max_lon) / 2, (min_lat + max_lat) / 2)
+        results = []
+        with self._lock:
+            for key in self._candidates(min_lon, min_lat, max_lon, max_lat):
+                if types and key[0] not in types:
+                    continue
+                point_lon, point_lat, _ = self.points[key]
+                if min_lon <= point_lon <= max_lon and min_lat <= point_lat <= max_lat:
+                    results.append((key, haversine_m(center_lon, center_lat, point_lon, point_lat)))
+        results.sort(key=lambda item: item[1])
+        return results
+
+
+def _source_rows(entry_type, updated_since=None):
+    from django.apps import apps
+    label, filters = SPATIAL_SOURCES[entry_type]
+    model = apps.get_model(label)
+    if updated_since is None:
+        queryset = model.objects.filter(latitude__isnull=False, longitude__isnull=False, **filters)
+    else:
+        # Every changed row, so ones that left the filter (deactivated, unverified) get removed
+        queryset = model.objects.filter(updated_at__gte=updated_since)
+    return queryset.values('id', 'longitude', 'latitude', *filters).iterator()
+
+
+def _apply_row(index, entry_type, row):
+    key = (entry_type, row['id'])
+    _, filters = SPATIAL_SOURCES[entry_type]
+    included = all(row.get(field) == value for field, value in filters.items())
+    if included and row['longitude'] is not None and row['latitude'] is not None:
+        index.upsert(key, row['longitude'], row['latitude'])
+    else:
+        index.remove(key)
+
+
+def mark_spatial_change(deleted=False):
+    """Tell every worker its spatial index is out of date (deletes force a rebuild)."""
+    try:
+        if deleted:
+            cache.set(REBUILD_TOKEN_KEY, timezone.now().isoformat(), None)
+        cache.add(GENERATION_KEY, 0, None)
+        cache.incr(GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not publish spatial index change: {e}")
+
+
+_state = {}
+_state_lock = threading.Lock()
+
+
+def get_spatial_index():
+    """
+    Return this process's spatial index of active destinations and verified businesses.
+
+    After a save anywhere, the next query reloads only rows whose `updated_at`
+    moved since the last sync; after a delete the index is rebuilt.
+    """
+    try:
+        generation, rebuild_token = cache.get(GENERATION_KEY), cache.get(REBUILD_TOKEN_KEY)
+    except Exception:
+        generation, rebuild_token = _state.get('generation'), _state.get('rebuild_token')
+
+    with _state_lock:
+        index = _state.get('index')
+        if index is not None and generation == _state['generation'] and rebuild_token == _state['rebuild_token']:
+            return index
+
+        started = timezone.now()
+        if index is None or rebuild_token != _state['rebuild_token']:
+            index = SpatialIndex()
+            for entry_type in SPATIAL_SOURCES:
+                for row in _source_rows(entry_type):
+                    _apply_row(index, entry_type, row)
+            logger.info(f"Built spatial index of {len(index)} points")
+        else:
+            for entry_type in SPATIAL_SOURCES:
+                for row in _source_rows(entry_type, updated_since=_state['synced_at']):
+                    _apply_row(index, entry_type, row)
+        # Rows saved while loading are picked up again on the next sync
+        _state.update(index=index, generation=generation, rebuild_token=rebuild_token, synced_at=started)
+    return index
+
+
+def nearby_catalog(lon, lat, radius_m=None, bbox=None, limit=20):
+    """
+    Our own destinations and verified businesses near a point, nearest first.
+
+    Args:
+        lon (float), lat (float): Query center.
+        radius_m (float, optional): Search radius in meters.
+        bbox (tuple, optional): (min_lon, min_lat, max_lon, max_lat); used instead of the radius.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Dicts with type, id, name, location, distance_m and coordinates.
+    """
+    from travel.models.business import Business
+    from travel.models.destination import Destination
+
+    index = get_spatial_index()
+    if bbox is not None:
+        hits = index.within_bbox(*bbox, center=(lon, lat))[:limit]
+    else:
+        hits = index.within_radius(lon, lat, radius_m)[:limit]
+
+    ids = defaultdict(list)
+    for (entry_type, pk), _ in hits:
+        ids[entry_type].append(pk)
+    rows = {
+        'destination': Destination.objects.in_bulk(ids['destination']) if ids['destination'] else {},
+        'business': Business.objects.in_bulk(ids['business']) if ids['business'] else {},
+    }
+
+    results = []
+    for (entry_type, pk), distance in hits:
+        obj = rows[entry_type].get(pk)
+        if obj is None:
+            continue
+        results.append({
+            "type": entry_type,
+            "id": pk,
+            "name": obj.name,
+            "location": obj.location,
+            "category": obj.category if entry_type == 'destination' else obj.business_type,
+            "average_rating": float(obj.average_rating),
+            "distance_m": round(distance, 1),
+            "coordinates": [obj.longitude, obj.latitude],
+        })
+    return results
@@ -0,0 +1,358 @@
+"""
+Parts of the trip context aggregate served by travel/views/trip_context_view.py.
+
+A destination page needs the destination, its weather, what is nearby,
+recent reviews and travel guides. Each part is produced and cached on its
+own and fetched concurrently with its own timeout, so a slow or failing
+upstream only drops that part from the response.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextvars import copy_context
+import openrouteservice
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from ai_driven_travel_platform.caching import aget_or_set_single_flight, get_generation, get_or_set_single_flight, make_cache_key
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+from travel.models.destination import Destination
+from travel.models.review import Review
+from travel.models.travel_guide import TravelGuide
+from travel.serializers import DestinationSerializer, ReviewSerializer, TravelGuideCardSerializer
+from .geocoding import ageocode_location, geocode_location
+from .ors_client import get_async_ors_client, get_ors_client
+from .places import anearby_results, nearby_results
+from .weather_utils import WeatherUnavailable, aget_weather_info, essential_weather, get_weather_info
+
+logger = logging.getLogger(__name__)
+
+TRIP_CONTEXT_NAMESPACE = 'trip-context'
+PARTS = ('weather', 'nearby', 'reviews', 'guides')
+CACHED_PARTS = ('destination', 'nearby', 'reviews', 'guides')  # Weather is cached by weather_utils
+UPSTREAM_PARTS = ('weather', 'nearby')  # May wait on OpenWeatherMap or ORS
+
+# Upstream outages mark a part "unavailable" rather than "error"
+UNAVAILABLE_ERRORS = (RateLimitExceeded, CircuitOpen, WeatherUnavailable, openrouteservice.exceptions.ApiError)
+
+
+def part_cache_key(part, labels, *parts):
+    """Cache key of a part under the generations of the models it reads, or None without a cache."""
+    generations = [get_generation(label) for label in labels]
+    if None in generations:
+        return None
+    return make_cache_key(f"{TRIP_CONTEXT_NAMESPACE}:{part}", generations, *parts)
+
+
+def _cached(part, key, producer, timeout):
+    if key is None:
+        return producer()
+    return get_or_set_single_flight(key, producer, timeout, stats_namespace=f"{TRIP_CONTEXT_NAMESPACE}:{part}")
+
+
+async def _acached(part, key, producer, timeout):
+    if key is None:
+        return await producer()
+    return await aget_or_set_single_flight(key, producer, timeout, stats_namespace=f"{TRIP_CONTEXT_NAMESPACE}:{part}")
+
+
+def get_destination(destination_id):
+    """The destination as /destinations/<id>/ returns it, or None if it does not exist."""
+    def produce():
+        destination = Destination.objects.filter(pk=destination_id).first()
+        return DestinationSerializer(destination).data if destination is not None else None
+
+    key = part_cache_key('destination', ('travel.destination',), destination_id)
+    return _cached('destination', key, produce, settings.TRIP_CONTEXT_CACHE_TTL)
+
+
+def get_weather(destination):
+    weather_data = get_weather_info(destination['location'])
+    return essential_weather(weather_data) if weather_data else None
+
+
+async def aget_weather(destination):
+    weather_data = await aget_weather_info(destination['location'])
+    return essential_weather(weather_data) if weather_data else None
+
+
+def _coords(destination):
+    if destination.get('longitude') is None or destination.get('latitude') is None:
+        return None
+    return [destination['longitude'], destination['latitude']]
+
+
+def _nearby_key(destination):
+    return part_cache_key(
+        'nearby', ('travel.destination', 'travel.business'),
+        destination['id'], settings.TRIP_CONTEXT_NEARBY_RADIUS, settings.TRIP_CONTEXT_NEARBY_LIMIT,
+    )
+
+
+def _nearby_payload(destination, attractions, source):
+    """Nearby results without the destination itself, as /map/nearby/ shapes them."""
+    attractions = [
+        attraction for attraction in attractions
+        if not (attraction.get('type') == 'destination' and attraction.get('id') == destination['id'])
+    ]
+    return {'attractions': attractions[:settings.TRIP_CONTEXT_NEARBY_LIMIT], 'source': source}
+
+
+def get_nearby(destination):
+    """
+    Catalog entries and attractions around the destination.
+
+    Uses the destination's stored coordinates and only geocodes its location
+    when travel.tasks.geocode_catalog has not filled them yet.
+    """
+    def produce():
+        client = get_ors_client()
+        coords = _coords(destination) or geocode_location(client, destination['location'])
+        if not coords:
+            return None
+        # One extra result in case the destination itself is among them
+        found = nearby_results(client, coords, settings.TRIP_CONTEXT_NEARBY_RADIUS, limit=settings.TRIP_CONTEXT_NEARBY_LIMIT + 1)
+        return _nearby_payload(destination, *found)
+
+    return _cached('nearby', _nearby_key(destination), produce, settings.TRIP_CONTEXT_NEARBY_CACHE_TTL)
+
+
+async def aget_nearby(destination):
+    """`get_nearby` for async handlers."""
+    async def produce():
+        client = get_async_ors_client()
+        coords = _coords(destination) or await ageocode_location(client, destination['location'])
+        if not coords:
+            return None
+        found = await anearby_results(client, coords, settings.TRIP_CONTEXT_NEARBY_RADIUS, limit=settings.TRIP_CONTEXT_NEARBY_LIMIT + 1)
+        return _nearby_payload(destination, *found)
+
+    key = await sync_to_async(_nearby_key, thread_sensitive=False)(destination)
+    return await _acached('nearby', key, produce, settings.TRIP_CONTEXT_NEARBY_CACHE_TTL)
+
+
+def get_reviews(destination_id):
+    """Most recent reviews of the destination, as /reviews/?destination=<id> returns them."""
+    def produce():
+        reviews = Review.objects.for_listing().filter(destination_id=destination_id).order_by('-created_at')
+        return ReviewSerializer(reviews[:settings.TRIP_CONTEXT_REVIEWS_LIMIT], many=True).data
+
+    key = part_cache_key('reviews', ('travel.review',), destination_id, settings.TRIP_CONTEXT_REVIEWS_LIMIT)
+    return _cached('reviews', key, produce, settings.TRIP_CONTEXT_CACHE_TTL)
+
+
+def guide_region(region):
+    """TravelGuide region key matching a destination's free-text region, or None."""
+    region = (region or '').strip().lower()
+    for key, label in TravelGuide.REGION_CHOICES:
+        if region in (key, label.lower()):
+            return key
+    return None
+
+
+def get_guides(destination):
+    """Guide cards for the destination's region, or the latest guides when it has none."""
+    region = guide_region(destination.get('region'))
+
+    def produce():
+        queryset = TravelGuide.objects.only(*TravelGuideCardSerializer().model_field_names()).order_by('-created_at')
+        guides = list(queryset.filter(region=region)[:settings.TRIP_CONTEXT_GUIDES_LIMIT]) if region else []
+        if not guides:
+            guides = list(queryset[:settings.TRIP_CONTEXT_GUIDES_LIMIT])
+        return TravelGuideCardSerializer(guides, many=True).data
+
+    key = part_cache_key('guides', ('travel.travelguide',), region, settings.TRIP_CONTEXT_GUIDES_LIMIT)
+    return _cached('guides', key, produce, settings.TRIP_CONTEXT_CACHE_TTL)
+
+
+_executors = {}
+_executors_pid = None
+_executor_lock = threading.Lock()
+_upstream_slots = None
+
+
+def get_executor(pool='database'):
+    """
+    Return a process-wide thread pool running part producers.
+
+    Parts that time out keep running after the response is sent, so their
+    result still lands in the cache for the next request. Upstream-bound
+    parts use the separate "upstream" pool, so a slow upstream filling it
+    never delays the database parts.
+    """
+    global _executors, _executors_pid, _upstream_slots
+    pid = os.getpid()
+    if _executors_pid != pid:
+        with _executor_lock:
+            if _executors_pid != pid:
+                _executors = {
+                    'database': ThreadPoolExecutor(max_workers=settings.TRIP_CONTEXT_MAX_WORKERS, thread_name_prefix='trip-context'),
+                    'upstream': ThreadPoolExecutor(max_workers=settings.TRIP_CONTEXT_UPSTREAM_MAX_WORKERS, thread_name_prefix='trip-context-upstream'),
+                }
+                _upstream_slots = threading.BoundedSemaphore(settings.TRIP_CONTEXT_UPSTREAM_MAX_WORKERS)
+                _executors_pid = pid
+    return _executors[pool]
+
+
+def submit_upstream(producer):
+    """
+    Submit an upstream-bound part producer to the upstream pool.
+
+    Returns None instead of queueing when every upstream worker is busy,
+    typically with timed-out parts of earlier requests.
+    """
+    executor = get_executor('upstream')
+    slots = _upstream_slots
+    if not slots.acquire(blocking=False):
+        return None
+    future = executor.submit(copy_context().run, run_part, producer)
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def run_part(producer):
+    """Run a part producer outside the request thread, releasing expired database connections like a request would."""
+    close_old_connections()
+    try:
+        return producer()
+    finally:
+        close_old_connections()
+
+
+def _part_error(name, error):
+    if isinstance(error, UNAVAILABLE_ERRORS):
+        logger.warning(f"Trip context part {name} unavailable: {error}")
+        return 'unavailable'
+    logger.error(f"Trip context part {name} failed: {error!r}")
+    return 'error'
+
+
+def gather_parts(producers):
+    """
+    Run part producers concurrently on the shared thread pools.
+
+    Each part gets TRIP_CONTEXT_TIMEOUTS[name] seconds from the start of the
+    fan-out. Producers run in a copy of the request context so their
+    upstream time is still attributed to the request. Parts in
+    UPSTREAM_PARTS run on the bounded upstream pool and are reported
+    "unavailable" when it is full.
+
+    Args:
+        producers (dict): Part name -> zero-argument function.
+
+    Returns:
+        tuple: (results, missing); missing maps the name of each part left
+            out to "timeout", "unavailable" or "error".
+    """
+    executor = get_executor()
+    started = time.monotonic()
+    futures = {
+        name: submit_upstream(producer) if name in UPSTREAM_PARTS else executor.submit(copy_context().run, run_part, producer)
+        for name, producer in producers.items()
+    }
+    results, missing = {}, {}
+    for name, future in futures.items():
+        if future is None:
+            logger.warning(f"Trip context part {name} skipped: upstream workers busy")
+            missing[name] = 'unavailable'
+            continue
+        remaining = started + settings.TRIP_CONTEXT_TIMEOUTS[name] - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeout:
+            logger.warning(f"Trip context part {name} timed out")
+            missing[name] = 'timeout'
+        except Exception as e:
+            missing[name] = _part_error(name, e)
+    return results, missing
+
+
+async def agather_parts(producers):
+    """`gather_parts` for async handlers; producers are zero-argument coroutine functions."""
+    async def run(name, producer):
+        return await asyncio.wait_for(producer(), settings.TRIP_CONTEXT_TIMEOUTS[name])
+
+    names = list(producers)
+    outcomes = await asyncio.gather(*(run(name, producers[name]) for name in names), return_exceptions=True)
+    results, missing = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning(f"Trip context part {name} timed out")
+            missing[name] = 'timeout'
+        elif isinstance(outcome, Exception):
+            missing[name] = _part_error(name, outcome)
+        else:
+            results[name] = outcome
+    return results, missing
+
+
+def in_thread(producer):
+    """Coroutine function running a sync part producer on a worker thread, so database parts run in parallel."""
+    return lambda: sync_to_async(run_part, thread_sensitive=False)(producer)
+
+
+def parse_parts(value):
+    """
+    Parts requested with `?parts=weather,reviews`; all of PARTS when empty.
+
+    Raises:
+        ValueError: A name is not one of PARTS.
+    """
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in PARTS]
+    if unknown:
+        raise ValueError(f"Unknown parts: {', '.join(unknown)}. Choose from: {', '.join(PARTS)}")
+    return tuple(name for name in PARTS if name in names) or PARTS
+
+
+def trip_context_payload(destination, parts, results, missing):
+    return {
+        'destination': destination,
+        **{name: results.get(name) for name in parts},
+        'missing': missing,
+    }
+
+
+def get_trip_context(destination_id, parts=PARTS):
+    """
+    Destination page data in one call.
+
+    Args:
+        destination_id (int): Destination primary key.
+        parts (tuple): Names from PARTS to include besides the destination.
+
+    Returns:
+        dict: destination, one key per part (None when there is no data)
+            and missing (parts left out and why), or None if the
+            destination does not exist.
+    """
+    destination = get_destination(destination_id)
+    if destination is None:
+        return None
+    producers = {
+        'weather': lambda: get_weather(destination),
+        'nearby': lambda: get_nearby(destination),
+        'reviews': lambda: get_reviews(destination_id),
+        'guides': lambda: get_guides(destination),
+    }
+    results, missing = gather_parts({name: producers[name] for name in parts})
+    return trip_context_payload(destination, parts, results, missing)
+
+
+async def aget_trip_context(destination_id, parts=PARTS):
+    """`get_trip_context` for async handlers; upstream-bound parts run on the event loop."""
+    destination = await sync_to_async(run_part, thread_sensitive=False)(lambda: get_destination(destination_id))
+    if destination is None:
+        return None
+    producers = {
+        'weather': lambda: aget_weather(destination),
+        'nearby': lambda: aget_nearby(destination),
+        'reviews': in_thread(lambda: get_reviews(destination_id)),
+        'guides': in_thread(lambda: get_guides(destination)),
+    }
+    results, missing = await agather_parts({name: producers[name] for name in parts})
+    return trip_context_payload(destination, parts, results, missing)
@@ -1,21 +1,226 @@
-import os
+import zlib
+import logging
+import httpx
 import requests
-from dotenv import load_dotenv
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from ai_driven_travel_platform.async_http import get_async_client
+from ai_driven_travel_platform.caching import aget_or_set_single_flight, get_or_set_single_flight, set_cached_value
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen, get_breaker
+from ai_driven_travel_platform.metrics import track_upstream
+from travel.utils.geocoding import normalize_place_name
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
-WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
+WEATHER_NAMESPACE = 'weather'
 
-def get_weather_info(location):
-    params = {
+_session = requests.Session()
+
+
+class WeatherError(Exception):
+    """Raised when OpenWeatherMap does not return usable data."""
+
+
+class WeatherUnavailable(WeatherError):
+    """Raised when OpenWeatherMap is down, overloaded or its circuit is open."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def weather_cache_key(location):
+    return f"{WEATHER_NAMESPACE}:{normalize_place_name(location)}"
+
+
+def weather_ttl(location):
+    """
+    TTL for a location's cached weather.
+
+    Each location gets a stable offset inside [WEATHER_CACHE_TTL_MIN,
+    WEATHER_CACHE_TTL_MAX], so entries written by one refresh run expire
+    spread out instead of all at once.
+    """
+    low, high = settings.WEATHER_CACHE_TTL_MIN, settings.WEATHER_CACHE_TTL_MAX
+    spread = max(0, high - low)
+    offset = zlib.crc32(normalize_place_name(location).encode('utf-8')) % (spread + 1)
+    return low + offset
+
+
+def _weather_params(location):
+    return {
         'q': location,
-        'appid': WEATHER_API_KEY,
+        'appid': settings.WEATHER_API_KEY,
         'units': 'metric'
     }
-    response = requests.get(WEATHER_API_URL, params=params)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error fetching weather data: {response.status_code} - {response.text}")
-        return None
\ No newline at end of file
+
+
+def _raise_for_status(status_code, text):
+    if status_code == 429 or status_code >= 500:
+        raise WeatherUnavailable(f"Error fetching weather data: {status_code} - {text}")
+    if status_code != 200:
+        raise WeatherError(f"Error fetching weather data: {status_code} - {text}")
+
+
+def is_weather_failure(error):
+    return isinstance(error, WeatherUnavailable)
+
+
+def _fetch_remote(location):
+    try:
+        with get_breaker('openweathermap').guard(is_weather_failure):
+            try:
+                with track_upstream('openweathermap'):
+                    response = _session.get(
+                        settings.WEATHER_API_URL,
+                        params=_weather_params(location),
+                        timeout=(settings.WEATHER_CONNECT_TIMEOUT, settings.WEATHER_READ_TIMEOUT),
+                    )
+            except requests.RequestException as e:
+                raise WeatherUnavailable(f"Weather request for {location} failed: {e}") from e
+            _raise_for_status(response.status_code, response.text)
+            return response.json()
+    except CircuitOpen as e:
+        raise WeatherUnavailable(str(e), retry_after=e.retry_after) from e
+
+
+async def _afetch_remote(location):
+    try:
+        async with get_breaker('openweathermap').aguard(is_weather_failure):
+            try:
+                with track_upstream('openweathermap'):
+                    response = await get_async_client().get(
+                        settings.WEATHER_API_URL,
+                        params=_weather_params(location),
+                        timeout=httpx.Timeout(settings.WEATHER_READ_TIMEOUT, connect=settings.WEATHER_CONNECT_TIMEOUT),
+                    )
+            except httpx.HTTPError as e:
+                raise WeatherUnavailable(f"Weather request for {location} failed: {e}") from e
+            _raise_for_status(response.status_code, response.text)
+            return response.json()
+    except CircuitOpen as e:
+        raise WeatherUnavailable(str(e), retry_after=e.retry_after) from e
+
+
+def get_weather_info(location):
+    """
+    Current weather for a location, served from the shared cache.
+
+    Concurrent misses for the same location share one upstream request.
+    While OpenWeatherMap is unavailable, the last payload fetched within
+    `WEATHER_STALE_TTL` is returned instead.
+
+    Args:
+        location (str): Place name, e.g. "Gondar".
+
+    Returns:
+        dict: Raw OpenWeatherMap payload, or None if it could not be fetched.
+
+    Raises:
+        WeatherUnavailable: If OpenWeatherMap is down and nothing is cached.
+    """
+    if not location:
+        return None
+    try:
+        return get_or_set_single_flight(
+            weather_cache_key(location),
+            lambda: _fetch_remote(location),
+            weather_ttl(location),
+            stats_namespace=WEATHER_NAMESPACE,
+            lock_timeout=settings.WEATHER_READ_TIMEOUT + settings.WEATHER_CONNECT_TIMEOUT,
+            stale_ttl=settings.WEATHER_STALE_TTL,
+            stale_on=(WeatherUnavailable,),
+        )
+    except WeatherUnavailable:
+        raise
+    except WeatherError as e:
+        logger.error(str(e))
+        return None
+
+
+async def aget_weather_info(location):
+    """`get_weather_info` for async handlers, fetching over the shared httpx pool."""
+    if not location:
+        return None
+    try:
+        return await aget_or_set_single_flight(
+            weather_cache_key(location),
+            lambda: _afetch_remote(location),
+            weather_ttl(location),
+            stats_namespace=WEATHER_NAMESPACE,
+            lock_timeout=settings.WEATHER_READ_TIMEOUT + settings.WEATHER_CONNECT_TIMEOUT,
+            stale_ttl=settings.WEATHER_STALE_TTL,
+            stale_on=(WeatherUnavailable,),
+        )
+    except WeatherUnavailable:
+        raise
+    except WeatherError as e:
+        logger.error(str(e))
+        return None
+
+
+def get_cached_weather(location):
+    """Cached weather for a location without ever calling the upstream API."""
+    if not location:
+        return None
+    entry = cache.get(weather_cache_key(location))
+    return entry['value'] if entry is not None else None
+
+
+def refresh_weather(locations):
+    """
+    Fetch and cache weather for many locations in one pass.
+
+    Locations are deduplicated by normalized name and fetched over the pooled
+    session; failures are logged and skipped.
+
+    Returns:
+        dict: Normalized location name -> weather payload for each success.
+    """
+    unique = {}
+    for location in locations:
+        if location:
+            unique.setdefault(normalize_place_name(location), location)
+
+    refreshed = {}
+    for normalized, location in unique.items():
+        try:
+            data = _fetch_remote(location)
+        except WeatherError as e:
+            logger.warning(str(e))
+            continue
+        set_cached_value(weather_cache_key(location), data, weather_ttl(location), settings.WEATHER_STALE_TTL)
+        refreshed[normalized] = data
+    logger.info(f"Refreshed weather for {len(refreshed)}/{len(unique)} locations")
+    return refreshed
+
+
+def weather_unavailable_payload(error):
+    """(data, status, headers) for a weather request made while OpenWeatherMap is unavailable."""
+    logger.warning(str(error))
+    retry_after = max(1, int(round(error.retry_after or get_breaker('openweathermap').reset_timeout)))
+    return (
+        {"error": "Weather service is temporarily unavailable, please retry shortly", "retry_after": retry_after},
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        {'Retry-After': str(retry_after)},
+    )
+
+
+def weather_unavailable_response(error):
+    """503 response for WeatherUnavailable."""
+    data, status_code, headers = weather_unavailable_payload(error)
+    return Response(data, status=status_code, headers=headers)
+
+
+def essential_weather(weather_data):
+    """Reduce an OpenWeatherMap payload to the fields the API exposes."""
+    return {
+        "location": weather_data.get("name"),
+        "temperature": weather_data["main"].get("temp"),
+        "description": weather_data["weather"][0].get("description"),
+        "humidity": weather_data["main"].get("humidity"),
+        "wind_speed": weather_data["wind"].get("speed"),
+        "country": weather_data["sys"].get("country"),
+    }
@@ -0,0 +1,175 @@
+"""
+Native async handlers for the upstream-bound travel endpoints.
+
+Served under ASGI ahead of Django (see ai_driven_travel_platform/asgi.py)
+with the same paths, parameters and responses as the DRF views in
+map_view.py, weather_view.py and trip_context_view.py, which keep serving WSGI deployments.
+Upstream calls go through AsyncORSClient and the shared httpx pools, so a
+request waiting on ORS or OpenWeatherMap holds no worker thread.
+"""
+import asyncio
+import logging
+import openrouteservice
+from asgiref.sync import sync_to_async
+from ai_driven_travel_platform.async_views import AsyncResponse
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+from travel.models.offline_bundle import OfflineMapBundle
+from travel.utils.geocoding import ageocode_location
+from travel.utils.ors_client import get_async_ors_client, ors_error_payload, quota_exceeded_payload
+from travel.utils.places import anearby_results
+from travel.utils.routing import aget_route, route_summary
+from travel.utils.trip_context import aget_trip_context, parse_parts
+from travel.utils.weather_utils import WeatherUnavailable, aget_weather_info, essential_weather, weather_unavailable_payload
+from travel.views.map_view import ROUTE_FORMATS, bundle_status_payload, compact_route, parse_bbox, queue_offline_bundle
+
+logger = logging.getLogger(__name__)
+
+
+def _bad_request(message):
+    logger.error(message)
+    return AsyncResponse({"error": message}, status=400)
+
+
+async def get_directions(request):
+    """Async `map_view.get_directions`; start and end are geocoded concurrently."""
+    client = get_async_ors_client()
+    start = request.query_params.get('start')
+    end = request.query_params.get('end')
+    profile = request.query_params.get('profile', 'driving-car')
+    route_format = request.query_params.get('route_format', 'geojson')
+
+    if not start or not end:
+        return _bad_request("Start and end parameters are required")
+    if route_format not in ROUTE_FORMATS:
+        return AsyncResponse({"error": f"route_format must be one of: {', '.join(ROUTE_FORMATS)}"}, status=400)
+    try:
+        zoom = int(request.query_params.get('zoom', 10))
+    except ValueError:
+        return AsyncResponse({"error": "Zoom must be an integer"}, status=400)
+
+    try:
+        start_coords, end_coords = await asyncio.gather(
+            ageocode_location(client, start),
+            ageocode_location(client, end),
+        )
+        if not start_coords:
+            return _bad_request(f"Could not geocode start location: {start}")
+        if not end_coords:
+            return _bad_request(f"Could not geocode end location: {end}")
+
+        directions = await aget_route(client, start_coords, end_coords, profile)
+        distance_m, duration_sec = route_summary(directions)
+        distance_km = distance_m / 1000
+
+        response_data = {
+            "distance_km": round(distance_km, 2),
+            "duration_minutes": round(duration_sec / 60, 2),
+            "map_link": f"https://www.google.com/maps/dir/?api=1&origin={start}&destination={end}&travelmode={profile.split('-')[0]}",
+        }
+        if route_format == 'geojson':
+            response_data["route"] = directions
+        elif route_format != 'summary':
+            response_data["route"] = compact_route(directions, route_format, zoom)
+
+        logger.info(f"Directions generated: {start} to {end}, Distance: {distance_km} km")
+        return AsyncResponse(response_data)
+
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return AsyncResponse(*quota_exceeded_payload(e))
+    except openrouteservice.exceptions.ApiError as e:
+        return AsyncResponse(*ors_error_payload(e))
+
+
+async def nearby_attractions(request):
+    """Async `map_view.nearby_attractions`."""
+    location = request.query_params.get('location')
+    bbox = request.query_params.get('bbox')
+    if not location and not bbox:
+        return _bad_request("Location parameter is required")
+
+    try:
+        radius = int(request.query_params.get('radius', 1000))
+        limit = int(request.query_params.get('limit', 20))
+        bbox = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        return AsyncResponse({"error": f"Invalid parameter: {e}"}, status=400)
+
+    try:
+        client = get_async_ors_client()
+        if location:
+            coords = await ageocode_location(client, location)
+            if not coords:
+                return _bad_request(f"Could not geocode location: {location}")
+        else:
+            coords = [(bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2]
+
+        attractions, source = await anearby_results(client, coords, radius, bbox=bbox, limit=limit)
+        logger.info(f"Found {len(attractions)} attractions near {location or bbox} ({source})")
+        return AsyncResponse({"attractions": attractions, "source": source})
+
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return AsyncResponse(*quota_exceeded_payload(e))
+    except openrouteservice.exceptions.ApiError as e:
+        return AsyncResponse(*ors_error_payload(e))
+
+
+def _queue_bundle_payload(location, area_km):
+    bundle = queue_offline_bundle(location, area_km)
+    return bundle_status_payload(bundle), bundle.status == OfflineMapBundle.STATUS_READY
+
+
+async def download_map(request):
+    """Async `map_view.download_map`; `live=true` fetches the isochrone over the async ORS client."""
+    location = request.query_params.get('location')
+    area_km = request.query_params.get('area')
+    if not location or not area_km:
+        return _bad_request("Location and area parameters are required")
+    try:
+        area_km = float(area_km)
+    except ValueError:
+        return _bad_request("Area must be a valid number (kilometers)")
+    if area_km <= 0:
+        return _bad_request("Area must be a positive number (kilometers)")
+
+    if request.query_params.get('live', 'false').lower() != 'true':
+        payload, ready = await sync_to_async(_queue_bundle_payload)(location, area_km)
+        return AsyncResponse(payload, status=200 if ready else 202)
+
+    try:
+        client = get_async_ors_client()
+        coords = await ageocode_location(client, location)
+        if not coords:
+            return _bad_request(f"Could not geocode location: {location}")
+        isochrone = await client.isochrones(locations=[coords], range=[area_km * 1000], range_type='distance')
+        logger.info(f"Map generated for {location} with {area_km} km area")
+        return AsyncResponse({"geojson": isochrone, "center": coords, "area_km": area_km})
+
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return AsyncResponse(*quota_exceeded_payload(e))
+    except openrouteservice.exceptions.ApiError as e:
+        return AsyncResponse(*ors_error_payload(e))
+
+
+async def fetch_weather(request, location):
+    """Async `weather_view.fetch_weather`."""
+    try:
+        weather_data = await aget_weather_info(location)
+    except WeatherUnavailable as e:
+        return AsyncResponse(*weather_unavailable_payload(e))
+    if weather_data:
+        return AsyncResponse(essential_weather(weather_data))
+    return AsyncResponse({"error": "Failed to fetch weather data"}, status=400)
+
+
+async def trip_context(request, pk):
+    """Async `trip_context_view.trip_context`; weather and nearby parts run on the event loop."""
+    try:
+        parts = parse_parts(request.query_params.get('parts'))
+    except ValueError as e:
+        return AsyncResponse({"error": str(e)}, status=400)
+
+    context = await aget_trip_context(int(pk), parts)
+    if context is None:
+        return AsyncResponse({"error": "Destination not found"}, status=404)
+    return AsyncResponse(context)
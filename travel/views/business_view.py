@@ -1,12 +1,15 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from .mixins import CatalogViewSetMixin
+from travel.search.filters import IndexedSearchFilter
 from ..models.business import Business
-from ..serializers import BusinessSerializer
+from ..serializers import BusinessSerializer, BusinessCardSerializer
 
-class BusinessViewSet(viewsets.ModelViewSet):
+class BusinessViewSet(CatalogViewSetMixin, viewsets.ModelViewSet):
     queryset = Business.objects.all()
     serializer_class = BusinessSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    card_serializer_class = BusinessCardSerializer
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     filterset_fields = ['business_type', 'is_verified']  # Ensure these are valid model fields
     search_fields = ['name', 'description', 'location']
     ordering_fields = ['name', 'is_verified']
\ No newline at end of file
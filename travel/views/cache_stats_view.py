@@ -0,0 +1,36 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from ai_driven_travel_platform.caching import get_cache_stats, get_generation
+from ai_services.utils.llm_cache import get_llm_cache_stats
+from travel.utils.routing import ROUTE_NAMESPACE
+from travel.utils.trip_context import CACHED_PARTS, TRIP_CONTEXT_NAMESPACE
+from travel.utils.weather_utils import WEATHER_NAMESPACE
+from .mixins import CATALOG_CACHE_NAMESPACE
+
+CATALOG_MODELS = ('travel.destination', 'travel.business', 'travel.news', 'travel.travelguide')
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """
+    API endpoint reporting hit/miss counters for the application caches (admin only).
+    
+    Returns:
+        - catalog (dict): Per-model list response cache stats and current generation.
+        - llm (dict): Per-endpoint Gemini response cache stats.
+        - route (dict), weather (dict): Routing and weather cache stats.
+        - trip_context (dict): Per-part trip context cache stats.
+    """
+    catalog = {
+        label: dict(get_cache_stats(f"{CATALOG_CACHE_NAMESPACE}:{label}"), generation=get_generation(label))
+        for label in CATALOG_MODELS
+    }
+    return Response({
+        "catalog": catalog,
+        "llm": get_llm_cache_stats(),
+        "route": get_cache_stats(ROUTE_NAMESPACE),
+        "weather": get_cache_stats(WEATHER_NAMESPACE),
+        "trip_context": {part: get_cache_stats(f"{TRIP_CONTEXT_NAMESPACE}:{part}") for part in CACHED_PARTS},
+    }, status=status.HTTP_200_OK)
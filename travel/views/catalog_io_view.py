@@ -0,0 +1,99 @@
+import codecs
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import BaseParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from travel.utils.catalog_io import CATALOG_KINDS, FORMATS, export_catalog, import_catalog, iter_records
+
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+class StreamParser(BaseParser):
+    """Leaves NDJSON/CSV request bodies unread so they can be consumed line by line."""
+    media_type = '*/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+def _request_format(request, content_type=''):
+    fmt = request.query_params.get('file_format')
+    if fmt is None:
+        fmt = 'csv' if 'csv' in content_type else 'ndjson'
+    return fmt if fmt in FORMATS else None
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser, StreamParser])
+def import_catalog_view(request, kind):
+    """
+    API endpoint bulk-upserting destinations or businesses from NDJSON or CSV (admin only).
+
+    The body is either the raw file (Content-Type application/x-ndjson or
+    text/csv) or a multipart upload in the "file" field. Rows are read and
+    written in chunks, matched on (name, location); invalid rows are reported
+    without stopping the import.
+
+    Query Parameters:
+        - file_format (str, optional): "ndjson" or "csv"; defaults from the content type.
+        - dry_run (bool, optional): Validate and match rows without writing.
+        - chunk_size (int, optional): Rows per batch (default 500).
+
+    Returns:
+        - created (int), updated (int), invalid (int): Row counts.
+        - errors (list): {line, errors} for each rejected row.
+    """
+    if request.content_type.startswith('multipart/'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the data in a 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = _request_format(request, upload.content_type or upload.name)
+        raw = upload.file
+    else:
+        fmt = _request_format(request, request.content_type)
+        raw = request.data
+    if raw is None:
+        return Response({"error": "The request body is empty"}, status=status.HTTP_400_BAD_REQUEST)
+    if fmt is None:
+        return Response({"error": f"file_format must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        chunk_size = max(1, int(request.query_params.get('chunk_size', 500)))
+    except ValueError:
+        return Response({"error": "chunk_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    if kind not in CATALOG_KINDS:
+        return Response({"error": f"Unknown catalog {kind!r}"}, status=status.HTTP_404_NOT_FOUND)
+    dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+    # Decode incrementally: the body is never held in memory as a whole
+    lines = codecs.iterdecode(raw, 'utf-8')
+    try:
+        summary = import_catalog(kind, iter_records(lines, fmt), chunk_size=chunk_size, dry_run=dry_run)
+    except UnicodeDecodeError:
+        return Response({"error": "The file must be UTF-8 encoded"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(summary, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_catalog_view(request, kind):
+    """
+    API endpoint streaming every destination or business as NDJSON or CSV (admin only).
+
+    Query Parameters:
+        - file_format (str, optional): "ndjson" (default) or "csv".
+
+    Returns:
+        A streamed file download, one record per line.
+    """
+    fmt = request.query_params.get('file_format', 'ndjson')
+    if fmt not in FORMATS:
+        return Response({"error": f"file_format must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    if kind not in CATALOG_KINDS:
+        return Response({"error": f"Unknown catalog {kind!r}"}, status=status.HTTP_404_NOT_FOUND)
+    response = StreamingHttpResponse(export_catalog(kind, fmt), content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
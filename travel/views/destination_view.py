@@ -1,12 +1,15 @@
 
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from .mixins import CatalogViewSetMixin
+from travel.search.filters import IndexedSearchFilter
 from travel.models.destination import Destination
-from ..serializers import DestinationSerializer
+from ..serializers import DestinationSerializer, DestinationCardSerializer
 
-class DestinationViewSet(viewsets.ModelViewSet):
+class DestinationViewSet(CatalogViewSetMixin, viewsets.ModelViewSet):
     queryset = Destination.objects.all()
     serializer_class = DestinationSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    card_serializer_class = DestinationCardSerializer
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'description', 'location']
     ordering_fields = ['name']
\ No newline at end of file
@@ -3,11 +3,56 @@ from rest_framework.response import Response
 from rest_framework import status
 import openrouteservice
 import logging
+from datetime import timedelta
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.shortcuts import render
+from django.urls import reverse
+from django.utils import timezone
+from ai_driven_travel_platform.circuit_breaker import CircuitOpen
+from ai_driven_travel_platform.rate_limit import RateLimitExceeded
+from travel.utils.geocoding import geocode_location
+from travel.utils.ors_client import ORS_PROFILES, get_ors_client, ors_error_response, quota_exceeded_response
+from travel.utils.places import nearby_results
+from travel.utils.routing import get_route, route_summary
+from travel.utils.geometry import encode_polyline, simplify_line, tolerance_for_zoom
+from travel.utils.distance_matrix import get_distance_matrix
+from travel.utils.offline_bundle import bundle_request_hash
+from travel.models.offline_bundle import OfflineMapBundle
+from travel.tasks import build_offline_bundle
 
 logger = logging.getLogger(__name__)
 
+ROUTE_FORMATS = ('geojson', 'polyline', 'simplified', 'summary')
+
+def compact_route(directions, route_format, zoom):
+    """
+    Build a compact representation of an ORS GeoJSON route.
+    
+    Args:
+        directions (dict): ORS GeoJSON FeatureCollection.
+        route_format (str): "polyline" or "simplified".
+        zoom (int): Map zoom level used to pick the simplification tolerance.
+    
+    Returns:
+        dict: Encoded polyline or simplified LineString, with the route bbox.
+    """
+    coordinates = directions['features'][0]['geometry']['coordinates']
+    if route_format == 'polyline':
+        return {
+            "type": "polyline",
+            "polyline": encode_polyline(coordinates),
+            "precision": 5,
+            "bbox": directions.get('bbox'),
+        }
+    simplified = simplify_line(coordinates, tolerance_for_zoom(zoom))
+    return {
+        "type": "LineString",
+        "coordinates": simplified,
+        "zoom": zoom,
+        "bbox": directions.get('bbox'),
+    }
+
 @api_view(['GET'])
 def get_directions(request):
     """
@@ -17,22 +62,39 @@ def get_directions(request):
         - start (str): Starting location (e.g., "Addis Ababa").
         - end (str): Destination location (e.g., "Gondar").
         - profile (str, optional): Travel mode (e.g., "driving-car", "foot-walking"). Default: "driving-car".
+        - route_format (str, optional): Route representation ("format" selects the DRF renderer). Default: "geojson".
+            - "geojson": full ORS GeoJSON FeatureCollection.
+            - "polyline": encoded polyline (precision 5) of the route geometry.
+            - "simplified": Douglas-Peucker simplified LineString for the given zoom.
+            - "summary": distance and duration only, no route.
+        - zoom (int, optional): Map zoom level for "simplified" (0-20). Default: 10.
     
     Returns:
         - distance_km (float): Distance in kilometers.
         - duration_minutes (float): Duration in minutes.
         - map_link (str): Google Maps URL for the route (optional, without API key).
-        - route (dict): Full GeoJSON route data.
+        - route (dict): Route data in the requested format (omitted for "summary").
     """
-    client = openrouteservice.Client(key=settings.ORS_API_KEY)
+    client = get_ors_client()
     start = request.query_params.get('start')
     end = request.query_params.get('end')
     profile = request.query_params.get('profile', 'driving-car')  # Default: driving-car
+    route_format = request.query_params.get('route_format', 'geojson')
 
     if not start or not end:
         logger.error("Start and end parameters are required")
         return Response({"error": "Start and end parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
 
+    if route_format not in ROUTE_FORMATS:
+        return Response(
+            {"error": f"route_format must be one of: {', '.join(ROUTE_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        zoom = int(request.query_params.get('zoom', 10))
+    except ValueError:
+        return Response({"error": "Zoom must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         # Geocode start location
         start_coords = geocode_location(client, start)
@@ -46,14 +108,10 @@ def get_directions(request):
             logger.error(f"Could not geocode end location: {end}")
             return Response({"error": f"Could not geocode end location: {end}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Get directions
-        directions = client.directions(
-            coordinates=[start_coords, end_coords],
-            profile=profile,
-            format='geojson'
-        )
-        distance_km = directions['features'][0]['properties']['segments'][0]['distance'] / 1000  # Meters to kilometers
-        duration_sec = directions['features'][0]['properties']['segments'][0]['duration']  # Duration in seconds
+        # Get directions (cached per grid-snapped start/end and profile)
+        directions = get_route(client, start_coords, end_coords, profile)
+        distance_m, duration_sec = route_summary(directions)
+        distance_km = distance_m / 1000  # Meters to kilometers
 
         # Google Maps link (no API key needed)
         map_link = f"https://www.google.com/maps/dir/?api=1&origin={start}&destination={end}&travelmode={profile.split('-')[0]}"
@@ -62,32 +120,91 @@ def get_directions(request):
             "distance_km": round(distance_km, 2),
             "duration_minutes": round(duration_sec / 60, 2),
             "map_link": map_link,
-            "route": directions  # Full GeoJSON for detailed route info
         }
+        if route_format == 'geojson':
+            response_data["route"] = directions  # Full GeoJSON for detailed route info
+        elif route_format != 'summary':
+            response_data["route"] = compact_route(directions, route_format, zoom)
 
         logger.info(f"Directions generated: {start} to {end}, Distance: {distance_km} km")
         return Response(response_data, status=status.HTTP_200_OK)
 
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return quota_exceeded_response(e)
     except openrouteservice.exceptions.ApiError as e:
-        logger.error(f"OpenRouteService API error: {e}")
-        return Response({"error": f"OpenRouteService API error: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return ors_error_response(e)
     except Exception as e:
         logger.error(f"Error in get_directions: {str(e)}")
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def bundle_status_payload(bundle):
+    """Describe an offline bundle job; ready bundles include a signed download URL."""
+    payload = {
+        "job_id": bundle.id,
+        "status": bundle.status,
+        "location": bundle.location,
+        "area_km": bundle.area_km,
+        "status_url": reverse('download-map-status', args=[bundle.id]),
+    }
+    if bundle.status == OfflineMapBundle.STATUS_READY:
+        payload.update({
+            "download_url": default_storage.url(bundle.file.name),
+            "content_hash": bundle.content_hash,
+            "size_bytes": bundle.size_bytes,
+            "completed_at": bundle.completed_at,
+        })
+    elif bundle.status == OfflineMapBundle.STATUS_FAILED:
+        payload["error"] = bundle.error_message
+    return payload
+
+def queue_offline_bundle(location, area_km):
+    """
+    Get or create the offline bundle for a location and area, queueing a
+    build when it is new, failed or older than OFFLINE_BUNDLE_MAX_AGE.
+
+    Returns:
+        OfflineMapBundle: The bundle; a stale ready one stays downloadable while it is rebuilt.
+    """
+    bundle, created = OfflineMapBundle.objects.get_or_create(
+        request_hash=bundle_request_hash(location, area_km),
+        defaults={'location': location, 'area_km': round(area_km, 1)},
+    )
+    max_age = timedelta(seconds=settings.OFFLINE_BUNDLE_MAX_AGE)
+    rebuild_timeout = timedelta(seconds=settings.OFFLINE_BUNDLE_REBUILD_TIMEOUT)
+    failed = bundle.status == OfflineMapBundle.STATUS_FAILED
+    stale = bundle.status == OfflineMapBundle.STATUS_READY and bundle.is_stale(max_age)
+    if created or failed or (stale and not bundle.rebuild_pending(rebuild_timeout)):
+        if failed:
+            bundle.status = OfflineMapBundle.STATUS_PENDING
+            bundle.error_message = ''
+            bundle.save(update_fields=['status', 'error_message', 'updated_at'])
+        elif stale:
+            # The stale bundle stays ready and downloadable while it is rebuilt
+            bundle.rebuild_queued_at = timezone.now()
+            bundle.save(update_fields=['rebuild_queued_at', 'updated_at'])
+        build_offline_bundle.delay(bundle.id)
+        logger.info(f"Queued offline bundle {bundle.id} for {location} with {area_km} km area")
+    return bundle
+
 @api_view(['GET'])
 def download_map(request):
     """
-    API endpoint to generate and provide a GeoJSON map for a given location and area using OpenRouteService.
+    API endpoint to request an offline map bundle for a given location and area.
+    
+    The bundle (isochrone, nearby attractions, destinations, businesses and
+    travel guide offline content, zipped) is built by a Celery task and stored
+    under its content hash, so repeated requests reuse the same package.
     
     Query Parameters:
         - location (str): The name of the location (e.g., "Addis Ababa").
         - area (float): The radius of the area in kilometers (e.g., "5" for 5 km). Must be a positive number.
+        - live (bool, optional): Return the isochrone GeoJSON directly instead of a bundle. Default: false.
     
     Returns:
-        - geojson (dict): GeoJSON data representing the area (isochrone).
-        - center (list): Coordinates of the location [longitude, latitude].
-        - area_km (float): The requested area in kilometers.
+        - job_id (int): Bundle job identifier.
+        - status (str): "pending", "processing", "ready" or "failed".
+        - status_url (str): Endpoint to poll for the job.
+        - download_url (str): Signed package URL, once the bundle is ready.
     
     Example:
         GET /map/download/?location=Addis%20Ababa&area=5
@@ -119,7 +236,27 @@ def download_map(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        client = openrouteservice.Client(key=settings.ORS_API_KEY)
+        if request.query_params.get('live', 'false').lower() == 'true':
+            return live_map_response(location, area_km)
+
+        bundle = queue_offline_bundle(location, area_km)
+        ready = bundle.status == OfflineMapBundle.STATUS_READY
+        return Response(
+            bundle_status_payload(bundle),
+            status=status.HTTP_200_OK if ready else status.HTTP_202_ACCEPTED
+        )
+
+    except Exception as e:
+        logger.error(f"Error in download_map: {str(e)}")
+        return Response(
+            {"error": f"Internal server error: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+def live_map_response(location, area_km):
+    """Synchronously geocode and return the isochrone GeoJSON for a location."""
+    try:
+        client = get_ors_client()
 
         # Geocode location
         coords = geocode_location(client, location)
@@ -143,101 +280,122 @@ def download_map(request):
         logger.info(f"Map generated for {location} with {area_km} km area")
         return Response(map_data, status=status.HTTP_200_OK)
 
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return quota_exceeded_response(e)
     except openrouteservice.exceptions.ApiError as e:
-        logger.error(f"OpenRouteService API error: {e}")
-        return Response(
-            {"error": f"OpenRouteService API error: {e}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-    except Exception as e:
-        logger.error(f"Error in download_map: {str(e)}")
-        return Response(
-            {"error": f"Internal server error: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return ors_error_response(e)
+
+@api_view(['GET'])
+def download_map_status(request, job_id):
+    """
+    API endpoint to poll an offline map bundle job.
+    
+    Returns:
+        - status (str): Job status; "ready" responses include a signed download_url.
+    """
+    try:
+        bundle = OfflineMapBundle.objects.get(pk=job_id)
+    except OfflineMapBundle.DoesNotExist:
+        return Response({"error": "Offline map job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(bundle_status_payload(bundle), status=status.HTTP_200_OK)
+
+def parse_bbox(value):
+    """Parse "min_lon,min_lat,max_lon,max_lat" into a tuple of floats."""
+    parts = [float(part) for part in value.split(',')]
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    return tuple(parts)
 
 @api_view(['GET'])
 def nearby_attractions(request):
     """
-    API endpoint to find nearby attractions using OpenRouteService POI service.
+    API endpoint to find nearby destinations, verified businesses and attractions.
+    
+    Our own catalog is searched first through the in-process spatial index;
+    the OpenRouteService POI service is only queried when fewer than
+    NEARBY_MIN_LOCAL_RESULTS catalog entries are found, and skipped when ORS
+    is unavailable but the catalog had some results.
     
     Query Parameters:
-        - location (str): The name of the location (e.g., "Axum").
+        - location (str): The name of the location (e.g., "Axum"). Required unless bbox is given.
         - radius (int, optional): Search radius in meters (e.g., "2000"). Default: 1000.
+        - bbox (str, optional): "min_lon,min_lat,max_lon,max_lat"; searches the box instead of a radius.
+        - limit (int, optional): Maximum catalog results. Default: 20.
     
     Returns:
-        - attractions (list): List of nearby attractions with name, distance, and coordinates.
+        - attractions (list): Results with type, name, distance_m and coordinates, nearest first.
+        - source (str): "catalog", or "catalog+ors" when ORS POIs were added.
     """
-    client = openrouteservice.Client(key=settings.ORS_API_KEY)
     location = request.query_params.get('location')
     radius = request.query_params.get('radius', 1000)  # Default radius in meters
+    bbox = request.query_params.get('bbox')
 
-    if not location:
+    if not location and not bbox:
         logger.error("Location parameter is required")
         return Response({"error": "Location parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
         radius = int(radius)  # Ensure radius is an integer
-        coords = geocode_location(client, location)
-        if not coords:
-            logger.error(f"Could not geocode location: {location}")
-            return Response({"error": f"Could not geocode location: {location}"}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Corrected params structure for ORS places endpoint
-        params = {
-            'request': 'pois',
-            'geojson': {
-                'type': 'Point',
-                'coordinates': coords
-            },
-            'buffer': radius,  # Buffer in meters
-            'filters': {
-                'category_ids': [206, 208, 220]  # Tourist attractions, museums, historical sites
-            },
-            'sortby': 'distance'
-        }
-        logger.debug(f"POI request params: {params}")
-        places = client.places(**params)
-
-        # Simplify response
-        attractions = [
-            {
-                "name": feature.get('properties', {}).get('name', 'Unnamed'),
-                "distance_m": feature.get('properties', {}).get('distance', 0),
-                "coordinates": feature['geometry']['coordinates']
-            }
-            for feature in places.get('features', [])
-        ]
-
-        logger.info(f"Found {len(attractions)} attractions near {location}")
-        return Response({"attractions": attractions}, status=status.HTTP_200_OK)
+        limit = int(request.query_params.get('limit', 20))
+        bbox = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        return Response({"error": f"Invalid parameter: {e}"}, status=status.HTTP_400_BAD_REQUEST)
 
+    try:
+        client = get_ors_client()
+        if location:
+            coords = geocode_location(client, location)
+            if not coords:
+                logger.error(f"Could not geocode location: {location}")
+                return Response({"error": f"Could not geocode location: {location}"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            coords = [(bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2]
+
+        attractions, source = nearby_results(client, coords, radius, bbox=bbox, limit=limit)
+        logger.info(f"Found {len(attractions)} attractions near {location or bbox} ({source})")
+        return Response({"attractions": attractions, "source": source}, status=status.HTTP_200_OK)
+
+    except (RateLimitExceeded, CircuitOpen) as e:
+        return quota_exceeded_response(e)
     except openrouteservice.exceptions.ApiError as e:
-        logger.error(f"OpenRouteService API error: {e}")
-        return Response({"error": f"OpenRouteService API error: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return ors_error_response(e)
     except Exception as e:
         logger.error(f"Error in nearby_attractions: {str(e)}")
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-def geocode_location(client, location):
+@api_view(['GET'])
+def destination_distance(request):
     """
-    Geocode a location name to coordinates using OpenRouteService.
+    API endpoint returning the precomputed travel distance between two destinations.
     
-    Args:
-        client: OpenRouteService client instance.
-        location (str): Location name or address.
+    Query Parameters:
+        - from (int): Source destination ID.
+        - to (int): Target destination ID.
+        - profile (str, optional): Travel mode, one of the ORS profiles. Default: "driving-car".
     
     Returns:
-        list: [longitude, latitude] or None if geocoding fails.
+        - distance_km (float): Distance in kilometers.
+        - duration_minutes (float): Duration in minutes.
     """
+    from_id = request.query_params.get('from')
+    to_id = request.query_params.get('to')
+    profile = request.query_params.get('profile', 'driving-car')
+
+    if not from_id or not to_id:
+        return Response({"error": "From and to parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
+    if profile not in ORS_PROFILES:
+        return Response({"error": f"Profile must be one of: {', '.join(ORS_PROFILES)}"}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        geocode = client.pelias_search(text=location)
-        if geocode and 'features' in geocode and len(geocode['features']) > 0:
-            coords = geocode['features'][0]['geometry']['coordinates']
-            return [coords[0], coords[1]]  # [longitude, latitude]
-    except Exception as e:
-        logger.error(f"Geocoding error for {location}: {e}")
-    return None
+        result = get_distance_matrix(profile).lookup(int(from_id), int(to_id))
+    except ValueError:
+        return Response({"error": "From and to must be destination IDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if result is None:
+        return Response(
+            {"error": "No precomputed distance for these destinations"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response({"from": int(from_id), "to": int(to_id), "profile": profile, **result}, status=status.HTTP_200_OK)
 
 def generate_map(client, coords, area_km):
     """
@@ -268,6 +426,8 @@ def generate_map(client, coords, area_km):
             "area_km": area_km
         }
 
+    except (RateLimitExceeded, CircuitOpen, openrouteservice.exceptions.ApiError):
+        raise
     except Exception as e:
         logger.error(f"Error generating map: {str(e)}")
         return {"error": str(e)}
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from ai_driven_travel_platform.metrics import collect_snapshots, merge_snapshots, render_prometheus
+from ai_driven_travel_platform.middleware import is_staff_request
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint covering every live worker.
+
+    When `METRICS_TOKEN` is set, the scraper must send it as a bearer token;
+    otherwise only staff users (session or JWT) can read it.
+
+    Returns:
+        Request latency histograms, per-view DB query counts and time, and
+        outbound HTTP time per upstream, in the Prometheus text format.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), expected):
+            return HttpResponse(status=401)
+    elif not is_staff_request(request):
+        return HttpResponse(status=403)
+    counters, histograms = merge_snapshots(collect_snapshots())
+    return HttpResponse(render_prometheus(counters, histograms), content_type=PROMETHEUS_CONTENT_TYPE)
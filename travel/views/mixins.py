@@ -0,0 +1,159 @@
+import hashlib
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from django.utils.translation import get_language_from_request
+from rest_framework import status
+from rest_framework.response import Response
+from ai_driven_travel_platform.caching import get_generation, make_cache_key, record_cache_event
+from ..pagination import CatalogCursorPagination
+
+CATALOG_CACHE_NAMESPACE = 'catalog'
+
+
+class CatalogViewSetMixin:
+    """
+    Shared read path for catalog viewsets.
+
+    Lists use cursor pagination and the compact `card_serializer_class`, and
+    list/detail queries load only the model fields the response will contain
+    (see SparseFieldsetMixin for `fields=`/`expand=`). `?search=` lists
+    only the best SEARCH_FILTER_LIMIT matches, most relevant first.
+
+    List responses are cached per query string, language and renderer under
+    the model's cache generation, which travel/signals.py bumps on every
+    write. List ETags are derived from that generation and detail ETags
+    from the row's update time, and all reads answer conditional GETs with 304.
+    """
+    pagination_class = CatalogCursorPagination
+    ordering = ['-created_at']
+    card_serializer_class = None
+    updated_field = 'updated_at'
+    # Bump when a serializer's output changes so cached representations are revalidated
+    etag_version = 1
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.card_serializer_class is not None:
+            return self.card_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            serializer = self.get_serializer()
+            if hasattr(serializer, 'model_field_names'):
+                # created_at is needed to build pagination cursors
+                queryset = queryset.only(*(serializer.model_field_names() | {'created_at'}))
+        return queryset
+
+    def make_etag(self, request, *parts):
+        serializer_class = self.get_serializer_class()
+        raw = '|'.join(str(part) for part in (
+            self.etag_version, serializer_class.__name__, request.get_full_path(), *parts
+        ))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def list_fingerprint(self, request, generation):
+        """
+        (etag, last_modified) for a list from the model's cache generation.
+
+        Every write bumps the generation, so validating a list costs no query.
+        Lists carry no Last-Modified, since finding it would scan the collection.
+        """
+        return self.make_etag(request, 'generation', generation), None
+
+    def detail_row(self):
+        """(pk, updated time) of the requested object, or None if it does not exist or the lookup is malformed."""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            return queryset.filter(**{self.lookup_field: lookup}).values_list('pk', self.updated_field).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def detail_fingerprint(self, request, row):
+        """(etag, last_modified) for one object from its update time, or None if it does not exist."""
+        if row is None:
+            return None
+        pk, updated = row
+        return self.make_etag(request, pk, updated), updated
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            return if_none_match.strip() == '*' or quote_etag(etag) in parse_etags(if_none_match)
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE') or '')
+        if if_modified_since and last_modified:
+            return int(last_modified.timestamp()) <= if_modified_since
+        return False
+
+    def conditional_response(self, request, fingerprint, render):
+        """
+        Answer 304 without serializing when the client's copy is current,
+        otherwise render and attach validators and CDN cache headers.
+        """
+        if fingerprint is None:
+            return render()
+        etag, last_modified = fingerprint
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = quote_etag(etag)
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.CATALOG_CACHE_MAX_AGE,
+            s_maxage=settings.CATALOG_CDN_MAX_AGE,
+            stale_while_revalidate=settings.CATALOG_STALE_WHILE_REVALIDATE,
+        )
+        return response
+
+    def response_cache_key(self, request, generation):
+        return make_cache_key(
+            f"{CATALOG_CACHE_NAMESPACE}:{self.queryset.model._meta.label_lower}:{generation}",
+            self.etag_version,
+            self.get_serializer_class().__name__,
+            request.path,
+            sorted(request.query_params.lists()),  # Filters, fields/expand and the pagination cursor
+            get_language_from_request(request),
+            request.accepted_media_type,
+        )
+
+    def list(self, request, *args, **kwargs):
+        render = lambda: super(CatalogViewSetMixin, self).list(request, *args, **kwargs)
+        label = self.queryset.model._meta.label_lower
+        generation = get_generation(label)
+        if generation is None:
+            return render()  # Cache unavailable: no response cache and no validators
+
+        stats_namespace = f"{CATALOG_CACHE_NAMESPACE}:{label}"
+        key = self.response_cache_key(request, generation)
+        entry = cache.get(key)
+        if entry is not None:
+            record_cache_event(stats_namespace, 'hit')
+            return self.conditional_response(request, entry['fingerprint'], lambda: Response(entry['data']))
+
+        record_cache_event(stats_namespace, 'miss')
+        fingerprint = self.list_fingerprint(request, generation)
+        response = self.conditional_response(request, fingerprint, render)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, {'data': response.data, 'fingerprint': fingerprint}, settings.CATALOG_RESPONSE_CACHE_TTL)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        row = self.detail_row()
+        if row is not None:
+            self.record_retrieve(request, row[0])
+        return self.conditional_response(
+            request, self.detail_fingerprint(request, row), lambda: super(CatalogViewSetMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    def record_retrieve(self, request, pk):
+        """Hook run for every read of an existing object, including 304 responses."""
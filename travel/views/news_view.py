@@ -1,12 +1,26 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from .mixins import CatalogViewSetMixin
+from travel.search.filters import IndexedSearchFilter
 from ..models.news import News
-from ..serializers import NewsSerializer
+from ..utils.counters import merge_pending_counts
+from ..serializers import NewsSerializer, NewsCardSerializer
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(CatalogViewSetMixin, viewsets.ModelViewSet):
     queryset = News.objects.all()
     serializer_class = NewsSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category']
+    card_serializer_class = NewsCardSerializer
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
+    filterset_fields = ['news_type', 'region']
     search_fields = ['title', 'content']
-    ordering_fields = ['date'] 
\ No newline at end of file
+    ordering_fields = ['created_at', 'valid_from'] 
+
+    def record_retrieve(self, request, pk):
+        News(pk=pk).increment_views()
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action == 'retrieve':
+            # Show views not yet flushed from the counter buffer (never saved back)
+            merge_pending_counts([instance])
+        return instance
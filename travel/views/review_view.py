@@ -20,7 +20,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Review.objects.all()
+        return Review.objects.for_listing()
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -48,7 +48,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def likes(self, request, pk=None):
         review = self.get_object()
-        likes = ReviewLike.objects.filter(review=review)
+        likes = ReviewLike.objects.filter(review=review).select_related(
+            'user', 'review__user', 'review__destination'
+        ).prefetch_related('review__images')
         serializer = ReviewLikeSerializer(likes, many=True)
         return Response(serializer.data)
 
@@ -73,7 +75,10 @@ class ReviewLikeViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        queryset = ReviewLike.objects.select_related(
+            'user', 'review__user', 'review__destination'
+        ).prefetch_related('review__images')
         if self.request.user.is_staff:
-            return ReviewLike.objects.all()
-        return ReviewLike.objects.filter(user=self.request.user)
+            return queryset
+        return queryset.filter(user=self.request.user)
     
\ No newline at end of file
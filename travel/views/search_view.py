@@ -0,0 +1,50 @@
+import time
+import logging
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from travel.search.documents import SEARCH_DOCUMENTS
+from travel.search.index import get_search_index
+
+logger = logging.getLogger(__name__)
+
+MAX_SEARCH_LIMIT = 100
+
+@api_view(['GET'])
+def search(request):
+    """
+    API endpoint for ranked full-text search across the catalog.
+    
+    Query Parameters:
+        - q (str): Search text. Place names match across common transliterations
+          (e.g., "Aksum"/"Axum") and with one typo; the last word matches as a prefix.
+        - types (str, optional): Comma-separated subset of "destination", "business", "guide", "news".
+        - limit (int, optional): Maximum number of results (1-100). Default: 20.
+    
+    Returns:
+        - results (list): Mixed-type results with type, id, title, snippet and score, best first.
+        - took_ms (float): Time spent searching.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({"error": "q parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    types = [t.strip() for t in request.query_params.get('types', '').split(',') if t.strip()]
+    unknown = [t for t in types if t not in SEARCH_DOCUMENTS]
+    if unknown:
+        return Response(
+            {"error": f"Unknown types: {', '.join(unknown)}. Valid types: {', '.join(SEARCH_DOCUMENTS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        limit = min(MAX_SEARCH_LIMIT, max(1, int(request.query_params.get('limit', 20))))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    index = get_search_index()
+    started = time.perf_counter()
+    results = index.search(query, types=types or None, limit=limit)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"Search for {query!r} returned {len(results)} results in {took_ms} ms")
+    return Response({"query": query, "results": results, "took_ms": took_ms}, status=status.HTTP_200_OK)
@@ -1,16 +1,31 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from .mixins import CatalogViewSetMixin
+from travel.search.filters import IndexedSearchFilter
 from ..models.travel_guide import TravelGuide
-from ..serializers import TravelGuideSerializer
+from ..utils.counters import merge_pending_counts
+from ..serializers import TravelGuideSerializer, TravelGuideCardSerializer
 
-class TravelGuideViewSet(viewsets.ModelViewSet):
+class TravelGuideViewSet(CatalogViewSetMixin, viewsets.ModelViewSet):
     queryset = TravelGuide.objects.all()
     serializer_class = TravelGuideSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    card_serializer_class = TravelGuideCardSerializer
+    updated_field = 'last_updated'
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     # Remove 'destination' from filterset_fields if it doesn't exist in the model
     filterset_fields = []
     search_fields = ['title', 'content']
-    ordering_fields = ['published_date']
+    ordering_fields = ['created_at', 'views_count']
+
+    def record_retrieve(self, request, pk):
+        TravelGuide(pk=pk).increment_views()
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action == 'retrieve':
+            # Show views not yet flushed from the counter buffer (never saved back)
+            merge_pending_counts([instance])
+        return instance
 
     def perform_create(self, serializer):
         travel_guide = serializer.save(author=self.request.user)
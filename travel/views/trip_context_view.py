@@ -0,0 +1,36 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from travel.utils.trip_context import get_trip_context, parse_parts
+
+@api_view(['GET'])
+def trip_context(request, pk):
+    """
+    API endpoint returning everything a destination page needs in one call.
+
+    The destination is loaded first; weather, nearby attractions, reviews
+    and travel guides are then fetched in parallel, each from its own cache
+    entry and with its own timeout (TRIP_CONTEXT_TIMEOUTS). Parts that time
+    out or whose upstream is unavailable are left out instead of failing
+    the request.
+
+    Query Parameters:
+        - parts (str, optional): Comma-separated subset of "weather,nearby,reviews,guides". Default: all.
+
+    Returns:
+        - destination (dict): As /destinations/<id>/ returns it.
+        - weather (dict): As /weather/<location>/ returns it for the destination's location.
+        - nearby (dict): attractions and source as /map/nearby/ returns them, without the destination itself.
+        - reviews (list): Most recent reviews, as /reviews/?destination=<id> returns them.
+        - guides (list): Travel guide cards for the destination's region.
+        - missing (dict): Part name -> "timeout", "unavailable" or "error" for each part left out.
+    """
+    try:
+        parts = parse_parts(request.query_params.get('parts'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    context = get_trip_context(pk, parts)
+    if context is None:
+        return Response({"error": "Destination not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(context, status=status.HTTP_200_OK)
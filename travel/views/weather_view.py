@@ -1,20 +1,15 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from travel.utils.weather_utils import get_weather_info
+from travel.utils.weather_utils import WeatherUnavailable, get_weather_info, essential_weather, weather_unavailable_response
 
 @api_view(['GET'])
 def fetch_weather(request, location):
-    weather_data = get_weather_info(location)
+    try:
+        weather_data = get_weather_info(location)
+    except WeatherUnavailable as e:
+        return weather_unavailable_response(e)
     if weather_data:
-        essential_data = {
-            "location": weather_data.get("name"),
-            "temperature": weather_data["main"].get("temp"),
-            "description": weather_data["weather"][0].get("description"),
-            "humidity": weather_data["main"].get("humidity"),
-            "wind_speed": weather_data["wind"].get("speed"),
-            "country": weather_data["sys"].get("country"),
-        }
-        return Response(essential_data, status=status.HTTP_200_OK)
+        return Response(essential_weather(weather_data), status=status.HTTP_200_OK)
     else:
-        return Response({"error": "Failed to fetch weather data"}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response({"error": "Failed to fetch weather data"}, status=status.HTTP_400_BAD_REQUEST)